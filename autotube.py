@@ -0,0 +1,344 @@
+#autotube.py module
+
+"""
+Headless command line entry point, for cron jobs and workers:
+
+    python -m autotube fetch [--count K]
+    python -m autotube script "topic" [--description ...] [--duration 30] [--video N]
+    python -m autotube assets --video N [--only images|audio]
+    python -m autotube render --video N
+    python -m autotube upload --video N [--channel NAME]
+    python -m autotube run ["topic" ...] [--news K] [--jobs N]
+    python -m autotube imports [--budget MS]
+    python -m autotube bench [--stages render,upload] [--save-baseline]
+    python -m autotube load [--jobs 8] [--concurrency 4]
+    python -m autotube --profile render,upload run "topic"
+
+Only the standard library is imported at startup. Each subcommand imports
+the stage modules it needs when it runs (see STAGE_MODULES), so `fetch`
+never loads moviepy and `render` never loads Selenium. `imports` measures
+startup and per-command import time in fresh interpreters and fails when
+the CLI itself goes over AUTOTUBE_IMPORT_BUDGET_MS.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+# What each subcommand imports when it runs
+STAGE_MODULES = {
+    "fetch": ["fetch_trends.trends"],
+    "script": ["scheduler.job_scheduler", "script_gen.script_writer"],
+    "assets": ["scheduler.job_scheduler", "images.image_fetcher", "tts.tts_engine"],
+    "render": ["scheduler.job_scheduler", "video.video_maker"],
+    "upload": ["uploader.upload_queue"],
+    "run": ["scheduler.job_scheduler", "uploader.upload_queue"],
+    "bench": ["benchmarks.run_benchmarks"],
+    "load": ["benchmarks.load_test"],
+}
+
+# Modules that must never be loaded just to start the CLI
+HEAVY_MODULES = ("streamlit", "moviepy", "selenium", "playwright", "psutil", "groq", "edge_tts", "numpy", "PIL")
+
+
+def _env():
+    from dotenv import dotenv_values
+    env_path = BASE_DIR / ".env"
+    return dotenv_values(env_path) if env_path.exists() else {}
+
+
+def _load_scenes(video):
+    script_path = BASE_DIR / "data" / str(video) / "video_script" / "video_script.json"
+    if not script_path.exists():
+        print(f"[error] Script not found at: {script_path}")
+        return None
+    with open(script_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------------------------
+# Subcommands
+# ---------------------------
+def cmd_fetch(args):
+    from fetch_trends.trends import NewsHistoryManager
+
+    api_key = _env().get("NEWS_API_KEY")
+    if not api_key:
+        print("[error] NEWS_API_KEY not found in .env file")
+        return 1
+
+    history_folder = BASE_DIR / "history"
+    history_folder.mkdir(exist_ok=True)
+    manager = NewsHistoryManager(history_file=str(history_folder / "history_manager.txt"), api_key=api_key)
+
+    found = 0
+    for _ in range(args.count):
+        news = manager.get_latest_tech_news()
+        if not news:
+            break
+        found += 1
+        print(json.dumps({"title": news["title"], "description": news["description"]}, ensure_ascii=False))
+    return 0 if found else 1
+
+
+def cmd_script(args):
+    from scheduler.job_scheduler import reserve_video_number, generate_script, script_prompt
+    from script_gen.script_writer import VideoScriptGenerator
+
+    video = args.video or reserve_video_number()
+    generator = VideoScriptGenerator(video_number=video)
+    scenes, title_desc = generate_script(
+        generator, script_prompt(args.topic, args.description or args.topic, args.duration)
+    )
+    if not scenes:
+        print("[error] Failed to generate script")
+        return 1
+    print(f"[success] Video {video}: {len(scenes)} scenes"
+          f"{', title: ' + title_desc['title'] if title_desc else ''}")
+    return 0
+
+
+def cmd_assets(args):
+    from scheduler.job_scheduler import generate_images, generate_audio
+
+    scenes = _load_scenes(args.video)
+    if not scenes:
+        return 1
+    if args.only in (None, "images"):
+        generate_images(args.video, scenes)
+    if args.only in (None, "audio"):
+        generate_audio(args.video, scenes)
+    print(f"[success] Assets generated for video {args.video}")
+    return 0
+
+
+def cmd_render(args):
+    from scheduler.job_scheduler import render_video
+
+    video_path = render_video(args.video, variants=args.variants)
+    if not video_path:
+        return 1
+    print(video_path)
+    return 0
+
+
+def cmd_upload(args):
+    from uploader.upload_queue import UploadQueue
+
+    queue = UploadQueue()
+    try:
+        success = queue.submit_video(args.video, channel=args.channel).result()
+    finally:
+        queue.close()
+    return 0 if success else 1
+
+
+def cmd_run(args):
+    from scheduler.job_scheduler import JobManager
+    from uploader.upload_queue import UploadQueue
+
+    topics = [(topic, topic) for topic in args.topics]
+    if args.news:
+        from fetch_trends.trends import NewsHistoryManager
+        api_key = _env().get("NEWS_API_KEY")
+        if not api_key:
+            print("[error] NEWS_API_KEY not found in .env file")
+            return 1
+        history_folder = BASE_DIR / "history"
+        history_folder.mkdir(exist_ok=True)
+        manager = NewsHistoryManager(history_file=str(history_folder / "history_manager.txt"), api_key=api_key)
+        for _ in range(args.news):
+            news = manager.get_latest_tech_news()
+            if not news:
+                break
+            topics.append((news["title"], news["description"]))
+
+    if not topics:
+        print("[error] Nothing to do: pass topics and/or --news K")
+        return 1
+
+    manager = JobManager(workers=args.jobs)
+    jobs = [manager.submit(topic, description, args.duration) for topic, description in topics]
+    print(f"[info] {len(jobs)} video(s) on {manager.workers} worker(s)")
+    while not all(job.finished for job in jobs):
+        time.sleep(1)
+
+    # Uploads run on the queue's own thread; wait for them before exiting
+    queue = UploadQueue.shared(create=False)
+    if queue is not None:
+        queue.close()
+        failed_uploads = queue.failed
+    else:
+        failed_uploads = 0
+
+    failed = [job for job in jobs if job.status == "failed"]
+    for job in jobs:
+        status = "[success]" if job.status == "done" else "[error]"
+        print(f"{status} video {job.video_number or '-'} ({job.topic[:50]}): "
+              f"{job.error or job.result.get('video_path')}")
+    return 1 if failed or failed_uploads else 0
+
+
+def cmd_imports(args):
+    """Import cost of the CLI and of each subcommand, in fresh interpreters"""
+    import subprocess
+
+    probe = (
+        "import sys, time, json\n"
+        "before = set(sys.modules)\n"
+        "started = time.perf_counter()\n"
+        "import autotube\n"
+        "cli = time.perf_counter() - started\n"
+        "for name in autotube.STAGE_MODULES.get(sys.argv[1], []):\n"
+        "    __import__(name)\n"
+        "total = time.perf_counter() - started\n"
+        "print(json.dumps({'cli': cli, 'total': total, 'modules': sorted(set(sys.modules) - before)}))\n"
+    )
+
+    def measure(command):
+        # Best of a few runs; the first one also pays for cold disk caches
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", probe, command], cwd=BASE_DIR,
+                capture_output=True, text=True, check=True
+            ).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        return min(runs, key=lambda run: run["total"])
+
+    budget_ms = args.budget if args.budget is not None else float(_env().get("AUTOTUBE_IMPORT_BUDGET_MS", "150"))
+    ok = True
+
+    core = measure("")
+    heavy = [name for name in core["modules"] if name.split(".")[0] in HEAVY_MODULES]
+    core_ms = core["cli"] * 1000
+    print(f"{'cli':<8} {core_ms:8.1f} ms  (budget {budget_ms:.0f} ms)")
+    if core_ms > budget_ms:
+        print(f"[error] CLI startup is over budget by {core_ms - budget_ms:.1f} ms")
+        ok = False
+    if heavy:
+        print(f"[error] CLI startup loads heavy modules: {', '.join(sorted(set(n.split('.')[0] for n in heavy)))}")
+        ok = False
+
+    for command in (args.commands or STAGE_MODULES):
+        if command not in STAGE_MODULES:
+            print(f"{command:<8} [error] unknown command")
+            ok = False
+            continue
+        try:
+            result = measure(command)
+        except subprocess.CalledProcessError as e:
+            print(f"{command:<8} [error] import failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            ok = False
+            continue
+        loaded = sorted(set(name.split(".")[0] for name in result["modules"]) & set(HEAVY_MODULES))
+        print(f"{command:<8} {result['total'] * 1000:8.1f} ms  {', '.join(loaded) or '-'}")
+
+    return 0 if ok else 1
+
+
+def cmd_bench(args):
+    from benchmarks.run_benchmarks import main as run_benchmarks
+
+    # Everything after "bench" belongs to the benchmark's own parser
+    return run_benchmarks(args.tool_args)
+
+
+def cmd_load(args):
+    from benchmarks.load_test import main as run_load_test
+
+    return run_load_test(args.tool_args)
+
+
+# ---------------------------
+# Argument parsing
+# ---------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="autotube", description="AutoTube pipeline without the Streamlit UI")
+    parser.add_argument(
+        "--profile", metavar="STAGES",
+        help="cProfile + tracemalloc for these stages (script,render,upload or all); "
+             "output in data/<n>/profiles/"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("fetch", help="fetch unprocessed tech news (one JSON line each)")
+    p.add_argument("--count", type=int, default=1)
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("script", help="generate script, title and description for a topic")
+    p.add_argument("topic")
+    p.add_argument("--description", default="")
+    p.add_argument("--duration", type=int, default=30, help="video length in seconds")
+    p.add_argument("--video", help="video number (default: reserve the next one)")
+    p.set_defaults(func=cmd_script)
+
+    p = sub.add_parser("assets", help="generate images and audio from a saved script")
+    p.add_argument("--video", required=True)
+    p.add_argument("--only", choices=("images", "audio"))
+    p.set_defaults(func=cmd_assets)
+
+    p = sub.add_parser("render", help="compile a video from its assets")
+    p.add_argument("--video", required=True)
+    p.add_argument("--variants", action="store_true",
+                   help="also render the 16:9 upload next to the 9:16 Short in one decode pass")
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser("upload", help="upload a rendered video and wait for the result")
+    p.add_argument("--video", required=True)
+    p.add_argument("--channel")
+    p.set_defaults(func=cmd_upload)
+
+    p = sub.add_parser("run", help="full pipeline for one or more topics")
+    p.add_argument("topics", nargs="*")
+    p.add_argument("--news", type=int, default=0, help="also make videos for K fetched news items")
+    p.add_argument("--jobs", type=int, default=1, help="videos to produce concurrently")
+    p.add_argument("--duration", type=int, default=30, help="video length in seconds")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("imports", help="measure import time against the startup budget")
+    p.add_argument("commands", nargs="*", metavar="command", help=f"any of: {', '.join(STAGE_MODULES)}")
+    p.add_argument("--budget", type=float, help="ms allowed for CLI startup (default AUTOTUBE_IMPORT_BUDGET_MS or 150)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=cmd_imports)
+
+    # add_help=False so --help reaches the tool's own parser in benchmarks/
+    p = sub.add_parser("bench", add_help=False, help="offline per-stage benchmark against stub services")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("load", add_help=False, help="concurrent pipeline load test against stub services")
+    p.set_defaults(func=cmd_load)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command not in ("bench", "load"):
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.tool_args = extra
+    if args.profile:
+        # Read when the stage modules are imported, which happens after this
+        os.environ["PROFILE_STAGES"] = args.profile
+    if args.command in ("imports", "run", "bench", "load"):
+        # run and load trace each job on their own; imports and bench must stay unmeasured
+        return args.func(args)
+
+    from scheduler.tracing import Tracer, span
+    tracer = Tracer(label=f"cli {args.command}")
+    try:
+        with tracer.activate(), span(args.command, video=getattr(args, "video", None)):
+            return args.func(args)
+    finally:
+        tracer.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
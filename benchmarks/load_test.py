@@ -0,0 +1,451 @@
+#benchmarks/load_test.py module
+
+"""
+Load test: N concurrent videos through the headless pipeline (JobManager /
+run_pipeline) against the stub services, to see how many videos per hour
+one box sustains and what limits it:
+
+    python benchmarks/load_test.py --jobs 12 --concurrency 4
+    python benchmarks/load_test.py --jobs 20 --rate 6 --latency-scale 0.25
+    python -m autotube load --jobs 8 --image-concurrency 1
+
+Stub latencies are log-normal ("median,p95" seconds) and the fake Groq and
+Hugging Face servers enforce a concurrency limit, like the real providers.
+The report covers throughput, worker, render slot and upload queue times,
+per-stage durations, p50/p95/p99 job latency, CPU/disk/memory saturation and
+which resource is the bottleneck: render CPU, API limits or disk. Everything
+is saved to data/benchmarks/load-<time>.json (spans in .traces.jsonl).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+import psutil
+
+# Allow running this file directly (python benchmarks/load_test.py)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+from benchmarks.stub_services import FakeGroqServer, FakeImageServer, StubTTSBackend, Latency
+from benchmarks.run_benchmarks import RESULTS_DIR, FIRST_VIDEO_NUMBER, _noop_upload_queue, caption_cache_workspace
+
+# Spans that make up a job, in pipeline order
+STAGES = ("script", "images", "audio", "render", "checkpoint_wait", "upload")
+API_STAGES = ("script", "images", "audio")
+
+CPU_SATURATED = 90.0      # % of all cores
+DISK_SATURATED = 80.0     # % of the sample interval the disks were busy
+IOWAIT_SATURATED = 20.0   # % of CPU time waiting on I/O
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0-100) of a list, None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return round(ordered[int(rank) - 1], 3)
+
+
+def _spread(values):
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95), "p99": percentile(values, 99),
+            "max": round(max(values), 3) if values else None}
+
+
+# ---------------------------
+# Resource sampling
+# ---------------------------
+class ResourceSampler:
+    """
+    Samples host CPU, this process's CPU, RSS (with child processes such as
+    ffmpeg) and disk activity every `interval` seconds on a background thread.
+    Disk busy time and iowait are only reported where psutil exposes them
+    (Linux); elsewhere they are None.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.samples = []
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+
+    def _tree_rss(self):
+        total = 0
+        try:
+            processes = [self._process] + self._process.children(recursive=True)
+        except psutil.Error:
+            processes = [self._process]
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        cores = psutil.cpu_count(logical=True) or 1
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_times_percent(interval=None)
+        disk = psutil.disk_io_counters()
+        own = sum(self._process.cpu_times()[:2])
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed = now - last
+            host = psutil.cpu_times_percent(interval=None)
+            own_now = sum(self._process.cpu_times()[:2])
+            disk_now = psutil.disk_io_counters()
+            sample = {
+                "t": round(time.time(), 2),
+                "cpu": psutil.cpu_percent(interval=None),
+                "process_cpu": round((own_now - own) / elapsed / cores * 100, 1),
+                "iowait": getattr(host, "iowait", None),
+                "rss_mb": round(self._tree_rss() / 1024 / 1024, 1),
+                "disk_read_mb_s": None,
+                "disk_write_mb_s": None,
+                "disk_busy": None,
+            }
+            if disk is not None and disk_now is not None:
+                sample["disk_read_mb_s"] = round((disk_now.read_bytes - disk.read_bytes) / elapsed / 1e6, 2)
+                sample["disk_write_mb_s"] = round((disk_now.write_bytes - disk.write_bytes) / elapsed / 1e6, 2)
+                if hasattr(disk_now, "busy_time"):
+                    sample["disk_busy"] = round(min(100.0, (disk_now.busy_time - disk.busy_time) / (elapsed * 10)), 1)
+            self.samples.append(sample)
+            own, disk, last = own_now, disk_now, now
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self):
+        def column(key):
+            return [s[key] for s in self.samples if s[key] is not None]
+
+        def saturated(key, limit):
+            values = column(key)
+            return round(sum(1 for v in values if v >= limit) / len(values), 3) if values else None
+
+        def mean(key):
+            values = column(key)
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            "samples": len(self.samples),
+            "cpu_mean": mean("cpu"),
+            "cpu_saturated": saturated("cpu", CPU_SATURATED),
+            "iowait_mean": mean("iowait"),
+            "iowait_saturated": saturated("iowait", IOWAIT_SATURATED),
+            "disk_busy_mean": mean("disk_busy"),
+            "disk_saturated": saturated("disk_busy", DISK_SATURATED),
+            "disk_write_mb_s_max": max(column("disk_write_mb_s"), default=None),
+            "peak_rss_mb": max(column("rss_mb"), default=None),
+        }
+
+
+# ---------------------------
+# Stand-ins for the pipeline
+# ---------------------------
+class _VideoNumbers:
+    """Hands out unused data/<n> numbers from FIRST_VIDEO_NUMBER up, instead of advancing video_counter.txt"""
+
+    def __init__(self):
+        self._next = FIRST_VIDEO_NUMBER
+        self._lock = threading.Lock()
+        self.used = []
+
+    def reserve(self) -> str:
+        with self._lock:
+            while (BASE_DIR / "data" / str(self._next)).exists():
+                self._next += 1
+            number = str(self._next)
+            self._next += 1
+            self.used.append(number)
+            return number
+
+
+@contextmanager
+def stub_pipeline(tts_backend, upload_latency, numbers, trace_path):
+    """
+    Point run_pipeline at the stubs for the duration of the block: video
+    numbers from `numbers`, the stub TTS backend, a throwaway speaking-rate
+    model, a no-op upload queue and tracing into `trace_path`. Groq and
+    Hugging Face are redirected by GROQ_BASE_URL / HF_API_URL.
+    """
+    import scheduler.job_scheduler as job_scheduler
+    import scheduler.tracing as tracing
+    import tts.tts_engine as tts_engine
+    from tts.tts_backends import TTSRouter
+    from tts.speech_rate import SpeechRateModel
+    from uploader.upload_queue import UploadQueue
+
+    class StubRouter(TTSRouter):
+        @classmethod
+        def from_env(cls, env, voice, rate, pitch):
+            return cls(tts_backend)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        patches = [
+            (job_scheduler, "reserve_video_number", numbers.reserve),
+            (tts_engine, "TTSRouter", StubRouter),
+            (tts_engine, "SpeechRateModel", lambda base_dir: SpeechRateModel(tmp)),
+            (tracing, "_SETTINGS", {"enabled": True, "jsonl": trace_path,
+                                    "prom": trace_path.with_suffix(".prom")}),
+        ]
+        saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+        for module, name, value in patches:
+            setattr(module, name, value)
+        # run_pipeline uploads through UploadQueue.shared()
+        queue = _noop_upload_queue(upload_latency)
+        UploadQueue._shared = queue
+        try:
+            yield queue
+        finally:
+            queue.close()
+            for module, name, value in saved:
+                setattr(module, name, value)
+
+
+# ---------------------------
+# Analysis
+# ---------------------------
+def job_record(job):
+    """Queue times, stage durations and latency of one finished job, from its trace"""
+    spans = job.trace.timeline()
+    ends = [s["start"] + s["seconds"] for s in spans]
+    first = {}
+    stages = {}
+    render_wait = 0.0
+    for s in spans:
+        first.setdefault(s["name"], s)
+        if s["name"] in STAGES:
+            stages[s["name"]] = round(stages.get(s["name"], 0.0) + s["seconds"], 3)
+        elif s["name"] == "render_queue":
+            render_wait += s["seconds"]
+
+    pipeline, render, upload = first.get("pipeline"), first.get("render"), first.get("upload")
+    upload_ok = upload is not None and upload["ok"]
+    return {
+        "id": job.id,
+        "video": job.video_number,
+        "status": "done" if job.status == "done" and upload_ok else "failed",
+        "error": job.error or (None if upload_ok else "upload failed or missing"),
+        "queue_wait": round(pipeline["start"] - job.created, 3) if pipeline else None,
+        "render_wait": round(render_wait, 3) if "render_queue" in first else None,
+        "upload_wait": (round(upload["start"] - (render["start"] + render["seconds"]), 3)
+                        if upload and render else None),
+        "latency": round(max(ends) - job.created, 3) if ends else None,
+        "finished": max(ends) if ends else job.finished_at,
+        "stages": stages,
+    }
+
+
+def find_bottleneck(records, resources, services):
+    """
+    (verdict, evidence lines). Disk and CPU saturation are checked first,
+    since a saturated resource caps throughput whatever the job breakdown
+    says; otherwise the category jobs spend most worker time in wins.
+    """
+    totals = {stage: sum(r["stages"].get(stage, 0.0) for r in records) for stage in STAGES}
+    api_seconds = sum(totals[stage] for stage in API_STAGES)
+    busy = api_seconds + totals["render"] + totals["checkpoint_wait"] or 1.0
+    queue_wait = sum(r["queue_wait"] or 0.0 for r in records)
+    render_wait = sum(r["render_wait"] or 0.0 for r in records)
+    throttle = sum(service["throttle_seconds"] for service in services.values())
+
+    evidence = [
+        f"worker time: API stages {api_seconds / busy:.0%}, render {totals['render'] / busy:.0%}, "
+        f"checkpoint wait {totals['checkpoint_wait'] / busy:.0%}",
+        f"CPU: mean {resources['cpu_mean']}%, saturated (>= {CPU_SATURATED:.0f}%) "
+        f"{(resources['cpu_saturated'] or 0):.0%} of the time",
+    ]
+    if resources["disk_busy_mean"] is not None:
+        evidence.append(f"disk: busy {resources['disk_busy_mean']}% on average, saturated "
+                        f"{(resources['disk_saturated'] or 0):.0%} of the time; iowait {resources['iowait_mean']}%")
+    for name, service in services.items():
+        if service["throttled"]:
+            evidence.append(f"{name}: {service['throttled']}/{service['requests']} requests waited for the "
+                            f"concurrency limit ({service['throttle_seconds']:.1f}s in total)")
+    evidence.append(f"jobs waited {queue_wait:.1f}s in total for a free pipeline worker")
+    evidence.append(f"renders waited {render_wait:.1f}s in total for a host render slot "
+                    "(not counted as render time)")
+
+    if (resources["disk_saturated"] or 0) >= 0.3 or (resources["iowait_saturated"] or 0) >= 0.3 \
+            or totals["checkpoint_wait"] / busy >= 0.2:
+        return "disk", evidence
+    if (resources["cpu_saturated"] or 0) >= 0.5:
+        return "render CPU", evidence
+    if api_seconds >= totals["render"]:
+        if throttle >= 0.2 * api_seconds:
+            return "API limits (provider concurrency)", evidence
+        return "API latency (more pipeline workers would raise throughput)", evidence
+    return "render CPU", evidence
+
+
+def summarize(records, started, resources, services):
+    done = [r for r in records if r["status"] == "done"]
+    makespan = max((r["finished"] for r in records if r["finished"]), default=started) - started
+    verdict, evidence = find_bottleneck(records, resources, services)
+    return {
+        "jobs": len(records),
+        "completed": len(done),
+        "failed": len(records) - len(done),
+        "makespan_seconds": round(makespan, 2),
+        "videos_per_hour": round(len(done) / makespan * 3600, 1) if makespan > 0 else None,
+        "latency": _spread([r["latency"] for r in done]),
+        "queue_wait": {
+            "worker": _spread([r["queue_wait"] for r in records if r["queue_wait"] is not None]),
+            "render_slot": _spread([r["render_wait"] for r in records if r["render_wait"] is not None]),
+            "upload": _spread([r["upload_wait"] for r in records if r["upload_wait"] is not None]),
+        },
+        "stages": {stage: _spread([r["stages"][stage] for r in records if stage in r["stages"]]) for stage in STAGES},
+        "resources": resources,
+        "services": services,
+        "bottleneck": verdict,
+        "evidence": evidence,
+    }
+
+
+def print_report(summary):
+    print(f"\n{'=' * 60}")
+    print(f"Jobs: {summary['completed']}/{summary['jobs']} completed in {summary['makespan_seconds']:.1f}s "
+          f"-> {summary['videos_per_hour']} videos/hour")
+    latency = summary["latency"]
+    print(f"Job latency: p50 {latency['p50']}s  p95 {latency['p95']}s  p99 {latency['p99']}s  max {latency['max']}s")
+    print(f"\n{'':<16} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8}")
+    rows = [("worker queue", summary["queue_wait"]["worker"]),
+            ("render queue", summary["queue_wait"]["render_slot"]),
+            ("upload queue", summary["queue_wait"]["upload"])]
+    rows += list(summary["stages"].items())
+    for name, spread in rows:
+        if spread["p50"] is None:
+            continue
+        print(f"{name:<16} {spread['p50']:8.2f} {spread['p95']:8.2f} {spread['p99']:8.2f} {spread['max']:8.2f}")
+    resources = summary["resources"]
+    print(f"\nPeak RSS (with ffmpeg): {resources['peak_rss_mb']} MB")
+    print(f"\nBottleneck: {summary['bottleneck']}")
+    for line in summary["evidence"]:
+        print(f"  - {line}")
+    print("=" * 60)
+
+
+# ---------------------------
+# Entry point
+# ---------------------------
+def _latency(value):
+    """'median' or 'median,p95' in seconds"""
+    parts = [float(part) for part in value.split(",")]
+    return parts[0], (parts[1] if len(parts) > 1 else parts[0])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="autotube load", description="Concurrent pipeline load test against stub services")
+    parser.add_argument("--jobs", type=int, default=8, help="videos to produce")
+    parser.add_argument("--concurrency", type=int, help="pipeline workers (default PIPELINE_WORKERS)")
+    parser.add_argument("--rate", type=float, help="submit jobs at this many per minute (Poisson) instead of all at once")
+    parser.add_argument("--duration", type=int, default=15, help="video length in seconds (5 s per scene)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply every stub latency (0.1 for a quick run)")
+    parser.add_argument("--llm-latency", type=_latency, default=(0.8, 2.5), metavar="MEDIAN[,P95]")
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--image-latency", type=_latency, default=(3.0, 8.0), metavar="MEDIAN[,P95]")
+    parser.add_argument("--tts-latency", type=_latency, default=(0.5, 1.5), metavar="MEDIAN[,P95]")
+    parser.add_argument("--upload-latency", type=_latency, default=(3.0, 10.0), metavar="MEDIAN[,P95]")
+    parser.add_argument("--groq-concurrency", type=int, default=4, help="stub Groq concurrency limit (0 = none)")
+    parser.add_argument("--image-concurrency", type=int, default=2, help="stub image API concurrency limit (0 = none)")
+    parser.add_argument("--image-error-rate", type=float, default=0.02)
+    parser.add_argument("--sample-interval", type=float, default=0.5)
+    parser.add_argument("--keep", action="store_true", help="keep the load test videos' data folders")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    def latency(spec, seed):
+        median, p95 = spec
+        return Latency(median * args.latency_scale, p95 * args.latency_scale, seed=args.seed + seed)
+
+    from scheduler.job_scheduler import JobManager
+
+    groq_server = FakeGroqServer(latency=latency(args.llm_latency, 1), token_delay=args.token_delay * args.latency_scale,
+                                 seed=args.seed, max_concurrent=args.groq_concurrency)
+    image_server = FakeImageServer(latency=latency(args.image_latency, 2), error_rate=args.image_error_rate,
+                                   seed=args.seed, max_concurrent=args.image_concurrency)
+    tts_backend = StubTTSBackend(latency=latency(args.tts_latency, 3))
+    os.environ["GROQ_BASE_URL"] = groq_server.url
+    os.environ["HF_API_URL"] = image_server.url
+    os.environ.setdefault("GROQ_API_KEY", "stub")
+    os.environ.setdefault("HuggingFaceAPIKey", "stub")
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    numbers = _VideoNumbers()
+    sampler = ResourceSampler(args.sample_interval)
+    rng = random.Random(args.seed)
+
+    with groq_server, image_server, caption_cache_workspace(), stub_pipeline(
+        tts_backend, latency(args.upload_latency, 4), numbers, out_path.with_suffix(".traces.jsonl")
+    ):
+        manager = JobManager(workers=args.concurrency)
+        print(f"[info] Load test: {args.jobs} job(s) on {manager.workers} worker(s)"
+              f"{f', {args.rate}/min' if args.rate else ', all at once'}")
+        sampler.start()
+        started = time.time()
+        jobs = []
+        for index in range(args.jobs):
+            if args.rate and index:
+                time.sleep(rng.expovariate(args.rate / 60))
+            jobs.append(manager.submit(f"Load test video {index + 1}", "A quiet machine that changes travel",
+                                       args.duration))
+        while not all(job.finished for job in jobs):
+            time.sleep(0.5)
+    # Leaving stub_pipeline waited for the uploads, which end each job's trace
+    sampler.stop()
+
+    services = {
+        name: {"requests": server.requests, "throttled": server.throttled,
+               "throttle_seconds": round(server.throttle_seconds, 2)}
+        for name, server in (("groq", groq_server), ("images", image_server))
+    }
+    services["images"]["failures"] = image_server.failures
+    records = [job_record(job) for job in jobs]
+    summary = summarize(records, started, sampler.summary(), services)
+    print_report(summary)
+
+    settings = {key: value for key, value in vars(args).items() if key != "keep"}
+    out_path.write_text(json.dumps({
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "settings": settings,
+        "workers": manager.workers,
+        "cpus": os.cpu_count(),
+        "summary": summary,
+        "jobs": records,
+        "samples": sampler.samples,
+    }, indent=4, default=str), encoding="utf-8")
+    print(f"[info] Report saved to {out_path}")
+
+    if not args.keep:
+        for number in numbers.used:
+            shutil.rmtree(BASE_DIR / "data" / number, ignore_errors=True)
+
+    for record in records:
+        if record["status"] != "done":
+            print(f"[error] Job {record['id']} (video {record['video']}): {record['error']}")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,429 @@
+#benchmarks/run_benchmarks.py module
+
+"""
+Offline benchmark of every pipeline stage against local stand-ins:
+
+    python benchmarks/run_benchmarks.py [--runs 3] [--stages render,upload]
+    python benchmarks/run_benchmarks.py --save-baseline
+    python -m autotube bench --image-error-rate 0.2
+
+Groq, Hugging Face, TTS and the uploader are replaced by the stubs in
+stub_services.py, so results depend only on this machine and this code.
+Stages that are left out get synthetic inputs (images, audio, scenes), so
+e.g. `--stages render` benchmarks VideoMaker alone.
+
+For every stage and end to end it reports wall time, CPU time (this
+process plus finished child processes such as ffmpeg) and peak RSS
+(process plus live children), as the median over --runs. Results are saved
+under data/benchmarks/ and compared with benchmarks/baseline.json; the
+exit code is 1 when a metric regressed by more than --tolerance.
+
+The committed baseline is a reference run with the default settings on a
+1-CPU Linux x86_64 container (Python 3.11; both are recorded in its
+"machine" and "settings"). Other hardware should re-record it with
+--save-baseline before trusting the regression check.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from contextlib import contextmanager
+
+import psutil
+
+# Allow running this file directly (python benchmarks/run_benchmarks.py)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+from benchmarks.stub_services import (
+    FakeGroqServer, FakeImageServer, StubTTSBackend, fake_scenes, synthetic_image, delay_seconds
+)
+
+STAGES = ("script", "images", "audio", "render", "upload")
+METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_mb")
+
+# Changes smaller than this are noise, whatever the ratio
+NOISE_FLOOR = {"wall_seconds": 0.05, "cpu_seconds": 0.05, "peak_rss_mb": 10.0}
+
+DEFAULT_BASELINE = BASE_DIR / "benchmarks" / "baseline.json"
+RESULTS_DIR = BASE_DIR / "data" / "benchmarks"
+
+# Benchmark videos get numbers far above real ones and are deleted afterwards
+FIRST_VIDEO_NUMBER = 900000
+
+
+@contextmanager
+def caption_cache_workspace():
+    """Point the caption overlay cache at a temp dir for the duration of a run"""
+    previous = os.environ.get("CAPTION_CACHE_DIR")
+    with tempfile.TemporaryDirectory(prefix="autotube-captions-") as workspace:
+        os.environ["CAPTION_CACHE_DIR"] = workspace
+        try:
+            yield Path(workspace)
+        finally:
+            if previous is None:
+                os.environ.pop("CAPTION_CACHE_DIR", None)
+            else:
+                os.environ["CAPTION_CACHE_DIR"] = previous
+
+
+# ---------------------------
+# Measuring
+# ---------------------------
+class ResourceMeter:
+    """
+    Wall time, CPU time and peak RSS of a block.
+
+    CPU time covers every thread of this process plus child processes that
+    have exited (ffmpeg encodes). RSS is sampled every `interval` seconds
+    for the process and its live children together.
+    """
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = None
+        self._excluded = [0.0, 0.0]
+        self.result = None
+        self.peak_rss = 0
+
+    def _cpu(self):
+        times = self._process.cpu_times()
+        return (times.user + times.system
+                + getattr(times, "children_user", 0.0) + getattr(times, "children_system", 0.0))
+
+    def _tree_rss(self):
+        total = 0
+        try:
+            processes = [self._process] + self._process.children(recursive=True)
+        except psutil.Error:
+            processes = [self._process]
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass  # exited between listing and sampling
+        return total
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self._tree_rss())
+
+    def __enter__(self):
+        self.peak_rss = self._tree_rss()
+        self._thread = threading.Thread(target=self._sample, name="bench-rss", daemon=True)
+        self._thread.start()
+        self._wall, self._cpu_start = time.perf_counter(), self._cpu()
+        return self
+
+    def __exit__(self, *exc):
+        wall, cpu = time.perf_counter() - self._wall, self._cpu() - self._cpu_start
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._tree_rss())
+        self.result = {
+            "wall_seconds": round(wall - self._excluded[0], 4),
+            "cpu_seconds": round(cpu - self._excluded[1], 4),
+            "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+        }
+
+    @contextmanager
+    def excluded(self):
+        """Leave the wall and CPU time of a block (e.g. preparing synthetic inputs) out of the result"""
+        wall, cpu = time.perf_counter(), self._cpu()
+        try:
+            yield
+        finally:
+            self._excluded[0] += time.perf_counter() - wall
+            self._excluded[1] += self._cpu() - cpu
+
+
+# ---------------------------
+# Stand-ins
+# ---------------------------
+def _noop_upload_queue(latency):
+    """UploadQueue whose engine reads the file and reports success without a browser or API"""
+    from uploader.upload_queue import UploadQueue
+
+    class NoopUploadQueue(UploadQueue):
+        async def _upload(self, item):
+            with open(item["video_path"], "rb") as f:
+                while await asyncio.to_thread(f.read, 1024 * 1024):
+                    pass
+            await asyncio.sleep(delay_seconds(latency))
+            return True
+
+    return NoopUploadQueue(engine="noop")
+
+
+def _free_video_number() -> str:
+    number = FIRST_VIDEO_NUMBER
+    while (BASE_DIR / "data" / str(number)).exists():
+        number += 1
+    return str(number)
+
+
+def _synthetic_images(number, scenes, size):
+    image_dir = BASE_DIR / "data" / number / "generated_image"
+    image_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for i in range(1, len(scenes) + 1):
+        paths[i] = image_dir / f"{i}.jpg"
+        paths[i].write_bytes(synthetic_image(size, size, seed=i))
+    return paths
+
+
+def _synthetic_audio(number, scenes, tts):
+    """MP3 bytes per scene, with the word timings VideoMaker's captions read"""
+    audio_dir = BASE_DIR / "data" / number / "generated_audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    audio = {}
+    for i, scene in enumerate(scenes, 1):
+        clip, words, _ = asyncio.run(tts.synthesize(scene["dialogue"]))
+        (audio_dir / f"{i}.words.json").write_text(json.dumps(words), encoding="utf-8")
+        audio[i] = clip
+    return audio
+
+
+# ---------------------------
+# One run
+# ---------------------------
+def run_once(args, groq_server, image_server, tts):
+    """All selected stages for one synthetic video; returns {stage: metrics, "end_to_end": metrics}"""
+    from scheduler.handoff import StageHandoff
+    from scheduler.job_scheduler import generate_script, script_prompt, render_video
+
+    number = _free_video_number()
+    handoff = StageHandoff(number)
+    metrics = {}
+
+    try:
+        with ResourceMeter() as total:
+            if "script" in args.stages:
+                from script_gen.script_writer import VideoScriptGenerator
+                with ResourceMeter() as meter:
+                    generator = VideoScriptGenerator(video_number=number)
+                    prompt = script_prompt("A quiet machine", "Engineers test a new machine", args.duration)
+                    scenes, title_desc = generate_script(generator, prompt, handoff)
+                metrics["script"] = meter.result
+                if not scenes:
+                    raise RuntimeError("script stage returned no scenes")
+            else:
+                scenes, title_desc = fake_scenes(max(1, args.duration // 5), seed=args.seed), None
+            handoff.scenes = scenes
+            handoff.metadata = dict(title_desc or {"title": "Benchmark", "description": "Benchmark run"})
+
+            if "images" in args.stages:
+                from images.image_fetcher import ImageGenerator
+                with ResourceMeter() as meter:
+                    image_gen = ImageGenerator(video_number=number)
+                    image_gen.API_URL = image_server.url
+                    for i, scene in enumerate(scenes, 1):
+                        path = image_gen.generate_image(scene.get("visualPrompt", ""), i)
+                        if path:
+                            handoff.image_paths[i] = path
+                metrics["images"] = meter.result
+            else:
+                with total.excluded():
+                    handoff.image_paths = _synthetic_images(number, scenes, args.image_size)
+
+            if "audio" in args.stages:
+                from tts.tts_engine import AudioGenerator
+                from tts.tts_backends import TTSRouter
+                from tts.speech_rate import SpeechRateModel
+                with ResourceMeter() as meter, tempfile.TemporaryDirectory() as tmp:
+                    audio_gen = AudioGenerator(video_number=number)
+                    audio_gen.router = TTSRouter(tts)
+                    # Keep the stub's pace out of the real speaking-rate calibration
+                    audio_gen.speech_rate = SpeechRateModel(tmp)
+
+                    async def generate_all_audio():
+                        for i, scene in enumerate(scenes, 1):
+                            audio = await audio_gen.generate_audio(scene["dialogue"], i, keep_file=args.keep_audio_files)
+                            if audio:
+                                handoff.audio[i] = audio
+
+                    asyncio.run(generate_all_audio())
+                metrics["audio"] = meter.result
+            else:
+                with total.excluded():
+                    handoff.audio = _synthetic_audio(number, scenes, tts)
+
+            if "render" in args.stages:
+                with ResourceMeter() as meter:
+                    handoff.video_path = render_video(number, handoff)
+                metrics["render"] = meter.result
+                if not handoff.video_path:
+                    raise RuntimeError("render stage produced no video")
+
+            if "upload" in args.stages:
+                if not handoff.video_path:
+                    raise RuntimeError("upload needs the render stage")
+                with ResourceMeter() as meter:
+                    queue = _noop_upload_queue(args.upload_latency)
+                    try:
+                        if not queue.submit(handoff.video_path, handoff.metadata).result():
+                            raise RuntimeError("upload stage failed")
+                    finally:
+                        queue.close()
+                metrics["upload"] = meter.result
+
+            handoff.wait_for_checkpoints()
+        metrics["end_to_end"] = total.result
+        return metrics
+    finally:
+        if not args.keep:
+            shutil.rmtree(BASE_DIR / "data" / number, ignore_errors=True)
+
+
+# ---------------------------
+# Baseline comparison
+# ---------------------------
+def summarize(runs):
+    """Median of every metric over the runs"""
+    summary = {}
+    for stage in list(STAGES) + ["end_to_end"]:
+        rows = [run[stage] for run in runs if stage in run]
+        if rows:
+            summary[stage] = {metric: round(statistics.median(row[metric] for row in rows), 4) for metric in METRICS}
+    return summary
+
+
+def compare(current, baseline, tolerance):
+    """[(stage, metric, baseline value, current value, regressed)] for everything in both"""
+    rows = []
+    for stage, values in current.items():
+        for metric in METRICS:
+            before = baseline.get(stage, {}).get(metric)
+            if before is None:
+                continue
+            now = values[metric]
+            regressed = now > before * (1 + tolerance) and now - before > NOISE_FLOOR[metric]
+            rows.append((stage, metric, before, now, regressed))
+    return rows
+
+
+def print_report(summary, comparison):
+    deltas = {(stage, metric): (before, now, regressed) for stage, metric, before, now, regressed in comparison}
+    print(f"\n{'stage':<12} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}   vs baseline (wall / cpu / rss)")
+    for stage, values in summary.items():
+        line = f"{stage:<12} {values['wall_seconds']:9.3f} {values['cpu_seconds']:9.3f} {values['peak_rss_mb']:9.1f}"
+        changes = []
+        for metric in METRICS:
+            if (stage, metric) not in deltas:
+                continue
+            before, now, regressed = deltas[(stage, metric)]
+            change = (now - before) / before * 100 if before else 0.0
+            changes.append(f"{change:+.0f}%{' !' if regressed else ''}")
+        print(line + ("   " + " / ".join(changes) if changes else ""))
+
+
+# ---------------------------
+# Entry point
+# ---------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="autotube bench", description="Offline per-stage pipeline benchmark")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--duration", type=int, default=15, help="video length in seconds (5 s per scene)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="stub Groq time to first token (s)")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="stub Groq delay per streamed chunk (s)")
+    parser.add_argument("--image-latency", type=float, default=0.3)
+    parser.add_argument("--image-error-rate", type=float, default=0.0, help="share of image requests answered 503")
+    parser.add_argument("--image-size", type=int, default=1024)
+    parser.add_argument("--tts-latency", type=float, default=0.1)
+    parser.add_argument("--upload-latency", type=float, default=0.2)
+    parser.add_argument("--keep-audio-files", action="store_true", help="write scene MP3s instead of handing bytes over")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark videos' data folders")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        print(f"[error] Unknown stage(s): {', '.join(unknown)}")
+        return 2
+
+    # Stage modules are imported up front so import time is not billed to the first run
+    # (python -m autotube imports measures that separately)
+    for name in ("scheduler.job_scheduler", "script_gen.script_writer", "images.image_fetcher",
+                 "tts.tts_engine", "video.video_maker", "uploader.upload_queue"):
+        __import__(name)
+
+    settings = {key: value for key, value in vars(args).items()
+                if key not in ("baseline", "save_baseline", "tolerance", "keep", "runs")}
+    groq_server = FakeGroqServer(latency=args.llm_latency, token_delay=args.token_delay, seed=args.seed)
+    image_server = FakeImageServer(latency=args.image_latency, error_rate=args.image_error_rate,
+                                   size=args.image_size, seed=args.seed)
+    tts = StubTTSBackend(latency=args.tts_latency)
+
+    # The clients must reach the stubs even if .env holds real keys
+    os.environ["GROQ_BASE_URL"] = groq_server.url
+    os.environ.setdefault("GROQ_API_KEY", "stub")
+    os.environ.setdefault("HuggingFaceAPIKey", "stub")
+
+    runs = []
+    with groq_server, image_server, caption_cache_workspace():
+        for run in range(1, args.runs + 1):
+            print(f"[info] Benchmark run {run}/{args.runs}: {', '.join(args.stages)}")
+            runs.append(run_once(args, groq_server, image_server, tts))
+
+    summary = summarize(runs)
+    result = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpus": os.cpu_count()},
+        "settings": settings,
+        "image_failures": image_server.failures,
+        "summary": summary,
+        "runs": runs,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    result_path = RESULTS_DIR / f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    result_path.write_text(json.dumps(result, indent=4), encoding="utf-8")
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("settings") != settings:
+            print("[warning] Baseline was recorded with different settings; comparison is only indicative")
+        if baseline.get("machine", {}).get("platform") != result["machine"]["platform"]:
+            print(f"[warning] Baseline is from another machine ({baseline['machine'].get('platform')})")
+    comparison = compare(summary, baseline["summary"], args.tolerance) if baseline else []
+    print_report(summary, comparison)
+    print(f"\n[info] Results saved to {result_path}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=4), encoding="utf-8")
+        print(f"[success] Baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"[info] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = [row for row in comparison if row[4]]
+    for stage, metric, before, now, _ in regressions:
+        print(f"[error] {stage} {metric}: {before} -> {now} (over {args.tolerance:.0%} tolerance)")
+    if not regressions:
+        print(f"[success] No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
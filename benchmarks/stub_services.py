@@ -0,0 +1,342 @@
+#benchmarks/stub_services.py module
+
+import io
+import re
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import threading
+import subprocess
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import imageio_ffmpeg
+from PIL import Image, ImageDraw
+
+# Allow running this file directly (python benchmarks/stub_services.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts.tts_backends import TTSBackend, LocalTTSBackend
+
+WORDS = (
+    "the city wakes under a pale sky while engineers test a quiet machine that "
+    "could change how people travel work and talk across the world tonight"
+).split()
+
+
+class Latency:
+    """
+    Log-normal delay described by its median and 95th percentile in seconds,
+    the usual shape of API response times (most calls near the median, a
+    long tail of slow ones). Stubs accept a Latency or a plain number.
+    """
+
+    def __init__(self, median, p95=None, seed=None):
+        self.median = median
+        self.p95 = p95 if p95 is not None else median
+        self.sigma = math.log(self.p95 / self.median) / 1.645 if 0 < self.median < self.p95 else 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            return self.median * math.exp(self._rng.gauss(0.0, self.sigma)) if self.sigma else self.median
+
+    def __repr__(self):
+        return f"Latency(median={self.median}, p95={self.p95})"
+
+
+def delay_seconds(latency) -> float:
+    return latency.sample() if isinstance(latency, Latency) else float(latency)
+
+
+def fake_scenes(scene_count, min_words=10, max_words=14, seed=0):
+    """Scenes shaped like the LLM's output, with dialogue inside the word budget"""
+    rng = random.Random(seed)
+    scenes = []
+    for index in range(scene_count):
+        length = rng.randint(min_words, max_words)
+        dialogue = " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+        scenes.append({
+            "dialogue": dialogue,
+            "visualPrompt": f"Cinematic wide shot number {index + 1}, soft morning light, city skyline, 35mm",
+            "voiceTone": rng.choice(("calm", "hopeful", "excited", "mysterious")),
+        })
+    return scenes
+
+
+def synthetic_image(width=1024, height=1024, seed=0, quality=90) -> bytes:
+    """JPEG with a gradient and shapes, so the encoder has real detail to compress"""
+    rng = random.Random(seed)
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    tint = Image.new("RGB", (width, height), tuple(rng.randint(40, 200) for _ in range(3)))
+    image = Image.blend(image, tint, 0.5)
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(10, width // 6)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius),
+                     fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class _StubServer:
+    """
+    Threaded local HTTP server; subclasses implement handle(handler, body).
+
+    max_concurrent > 0 models a provider's concurrency limit: extra requests
+    wait for a free slot, and the waits are counted in `throttled` and
+    `throttle_seconds`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, max_concurrent=0):
+        self.requests = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+        self.lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, handler, body):
+        raise NotImplementedError
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, payload, content_type="application/json"):
+                if not isinstance(payload, bytes):
+                    payload = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with server.lock:
+                    server.requests += 1
+                if server._slots is None:
+                    return server.handle(self, body)
+
+                started = time.perf_counter()
+                if not server._slots.acquire(blocking=False):
+                    server._slots.acquire()
+                    with server.lock:
+                        server.throttled += 1
+                        server.throttle_seconds += time.perf_counter() - started
+                try:
+                    server.handle(self, body)
+                finally:
+                    server._slots.release()
+
+        return Handler
+
+
+# ---------------------------
+# Groq (OpenAI-compatible chat completions)
+# ---------------------------
+class FakeGroqServer(_StubServer):
+    """
+    Local stand-in for Groq's /openai/v1/chat/completions, reached by setting
+    GROQ_BASE_URL to `url` before the client is created.
+
+    JSON-mode requests get one complete response; everything else is streamed
+    as server-sent events, one word per chunk. The answer follows the prompt:
+    scene count from "A <n>-second video", dialogue length from the
+    "<min>-<max>" word range in the system prompt.
+
+    Args:
+        latency: seconds (or a Latency) before the first byte (time to first token)
+        token_delay: seconds between streamed chunks
+    """
+
+    def __init__(self, latency=0.2, token_delay=0.002, scene_seconds=5, seed=0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.scene_seconds = scene_seconds
+        self.seed = seed
+
+    def answer(self, system_prompt, user_input, json_mode):
+        duration = re.search(r"(\d+)-second", user_input)
+        scene_count = max(1, int(duration.group(1)) // self.scene_seconds) if duration else 3
+        word_range = re.search(r"(\d+)-(\d+)\s+(?:spoken\s+)?words", system_prompt)
+        min_words, max_words = (int(word_range.group(1)), int(word_range.group(2))) if word_range else (10, 14)
+        scenes = fake_scenes(scene_count, min_words, max_words, self.seed)
+        metadata = {
+            "title": "The Quiet Machine That Could Change Everything",
+            "description": "A short look at the engineers behind a new machine. #tech #future #ai",
+        }
+        if json_mode:
+            return json.dumps({"scenes": scenes, **metadata, "tags": ["tech", "future", "ai"]})
+        if '"title"' in system_prompt and "dialogue" not in system_prompt:
+            return json.dumps(metadata)
+        if '"index"' in system_prompt:
+            return "[]"
+        return json.dumps(scenes)
+
+    def handle(self, handler, body):
+        request = json.loads(body or b"{}")
+        messages = request.get("messages") or []
+        system_prompt = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        user_input = next((m["content"] for m in messages if m.get("role") == "user"), "")
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        content = self.answer(system_prompt, user_input, json_mode)
+        created = int(time.time())
+        model = request.get("model", "stub")
+        usage = {"prompt_tokens": len(system_prompt) // 4, "completion_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        time.sleep(delay_seconds(self.latency))
+        if not request.get("stream"):
+            return handler.reply(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def send(data):
+            event = f"data: {data}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+            handler.wfile.flush()
+
+        for piece in re.findall(r"\S+\s*", content):
+            send(json.dumps({
+                "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }))
+            time.sleep(self.token_delay)
+        send("[DONE]")
+        handler.wfile.write(b"0\r\n\r\n")
+
+
+# ---------------------------
+# Hugging Face inference (images)
+# ---------------------------
+class FakeImageServer(_StubServer):
+    """
+    Local stand-in for the Hugging Face text-to-image endpoint; point
+    ImageGenerator.API_URL at `url`.
+
+    Responses are pre-rendered JPEGs (rendering them per request would be
+    counted as the client's CPU time). With error_rate > 0 that share of
+    requests fails the way the real API does while a model loads: 503 with a
+    JSON error body, which the client retries.
+    """
+
+    def __init__(self, latency=0.3, error_rate=0.0, size=1024, variants=4, seed=0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._images = [synthetic_image(size, size, seed + i) for i in range(variants)]
+
+    def handle(self, handler, body):
+        time.sleep(delay_seconds(self.latency))
+        with self.lock:
+            fail = self._rng.random() < self.error_rate
+            self.failures += 1 if fail else 0
+            image = self._images[self.requests % len(self._images)]
+        if fail:
+            return handler.reply(503, {"error": "Model is currently loading", "estimated_time": 20.0})
+        handler.reply(200, image, content_type="image/jpeg")
+
+
+# ---------------------------
+# TTS
+# ---------------------------
+class StubTTSBackend(TTSBackend):
+    """
+    TTS backend that returns a tone as long as the text would take to speak
+    at `words_per_second`, in the same MP3 format as edge-tts. Clips are
+    encoded once per duration and cached, so repeated runs measure the
+    pipeline rather than ffmpeg start-up.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=0.1, words_per_second=2.6):
+        self.latency = latency
+        self.words_per_second = words_per_second
+        self._ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+        self._clips = {}
+
+    def clip(self, duration) -> bytes:
+        duration = round(duration, 1)
+        if duration not in self._clips:
+            self._clips[duration] = subprocess.run(
+                [self._ffmpeg, "-v", "error", "-f", "lavfi", "-i", f"sine=frequency=220:duration={duration}",
+                 "-ac", "1", "-ar", "24000", "-b:a", "48k", "-f", "mp3", "-"],
+                check=True, capture_output=True
+            ).stdout
+        return self._clips[duration]
+
+    async def synthesize(self, text: str):
+        await asyncio.sleep(delay_seconds(self.latency))
+        duration = max(0.5, len(text.split()) / self.words_per_second)
+        audio = await asyncio.to_thread(self.clip, duration)
+        return audio, LocalTTSBackend.estimate_words(text, round(duration, 1)), round(duration, 1)
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    from groq import Groq
+    import requests
+
+    with FakeGroqServer(latency=0.05) as groq_server, FakeImageServer(latency=0.05, error_rate=0.5) as images:
+        client = Groq(api_key="stub", base_url=groq_server.url)
+        stream = client.chat.completions.create(
+            model="stub", stream=True,
+            messages=[{"role": "system", "content": "around 10-14 spoken words"},
+                      {"role": "user", "content": "A 15-second video about robots"}],
+        )
+        print("".join(chunk.choices[0].delta.content or "" for chunk in stream)[:200])
+        for _ in range(4):
+            response = requests.post(images.url, json={"inputs": "test"})
+            print(response.status_code, len(response.content))
+
+    audio, words, duration = asyncio.run(StubTTSBackend().synthesize("A short line of narration for testing."))
+    print(f"{len(audio)} bytes, {duration}s, {len(words)} words")
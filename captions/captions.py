@@ -0,0 +1,240 @@
+#captions/captions.py module
+
+import os
+import sys
+import json
+import math
+import hashlib
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+
+# Allow running this file directly (python captions/captions.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scheduler.tracing import count
+
+
+class CaptionGenerator:
+    """
+    Builds captions from the word timings edge-tts reports during synthesis
+    (saved by AudioGenerator as generated_audio/{n}.words.json), so no speech
+    recognition pass is needed.
+
+    Writes per-scene and whole-video SRT/VTT files and rasterizes each caption
+    line to a transparent PNG once, cached across renders, for VideoMaker to
+    burn in during its normal encode.
+    """
+
+    # Cue grouping
+    MAX_CHARS = 32
+    MAX_WORDS = 6
+    MAX_CUE_SECONDS = 2.5
+
+    # Overlay style
+    FONT_CANDIDATES = ["DejaVuSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf", "arial.ttf"]
+    FONT_SCALE = 0.055         # font size relative to frame height
+    TEXT_COLOR = (255, 255, 255, 255)
+    STROKE_COLOR = (0, 0, 0, 255)
+    STYLE_VERSION = "1"        # bump to invalidate cached overlays
+
+    def __init__(self, audio_dir: Path, captions_dir: Path, cache_dir=None):
+        self.audio_dir = Path(audio_dir)
+        self.captions_dir = Path(captions_dir)
+        self.captions_dir.mkdir(parents=True, exist_ok=True)
+
+        # Overlays are keyed by text + frame size, so they are shared between videos
+        # (data/.caption_cache unless CAPTION_CACHE_DIR points elsewhere, e.g. a benchmark workspace)
+        cache_dir = cache_dir or os.environ.get("CAPTION_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else self.captions_dir.parent.parent / ".caption_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------------------------
+    # Timings -> cues
+    # ---------------------------
+    def load_words(self, scene: int):
+        """Word timings for a scene, or [] if TTS did not record any"""
+        words_path = self.audio_dir / f"{scene}.words.json"
+        if not words_path.exists():
+            return []
+        try:
+            with open(words_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[warning] Could not read word timings {words_path}: {e}")
+            return []
+
+    def scene_cues(self, scene: int):
+        """
+        Group a scene's words into short caption cues.
+        Returns a list of {"start", "end", "text"} with scene-local times.
+        """
+        cues = []
+        current = []
+
+        def flush():
+            if current:
+                cues.append({
+                    "start": current[0]["start"],
+                    "end": current[-1]["end"],
+                    "text": " ".join(w["text"] for w in current)
+                })
+                current.clear()
+
+        for word in self.load_words(scene):
+            if current:
+                text = " ".join(w["text"] for w in current + [word])
+                too_long = (
+                    len(text) > self.MAX_CHARS
+                    or len(current) >= self.MAX_WORDS
+                    or word["end"] - current[0]["start"] > self.MAX_CUE_SECONDS
+                )
+                if too_long:
+                    flush()
+            current.append(word)
+            if word["text"][-1:] in ".!?,;:":
+                flush()
+        flush()
+
+        # Hold each cue until the next one starts so captions don't flicker
+        for cue, nxt in zip(cues, cues[1:]):
+            cue["end"] = max(cue["end"], nxt["start"])
+        return cues
+
+    # ---------------------------
+    # Subtitle files
+    # ---------------------------
+    @staticmethod
+    def _timestamp(seconds: float, separator: str) -> str:
+        millis = int(round(seconds * 1000))
+        hours, millis = divmod(millis, 3_600_000)
+        minutes, millis = divmod(millis, 60_000)
+        secs, millis = divmod(millis, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+    def write_srt(self, cues, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for index, cue in enumerate(cues, start=1):
+                f.write(f"{index}\n")
+                f.write(f"{self._timestamp(cue['start'], ',')} --> {self._timestamp(cue['end'], ',')}\n")
+                f.write(f"{cue['text']}\n\n")
+        return path
+
+    def write_vtt(self, cues, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("WEBVTT\n\n")
+            for cue in cues:
+                f.write(f"{self._timestamp(cue['start'], '.')} --> {self._timestamp(cue['end'], '.')}\n")
+                f.write(f"{cue['text']}\n\n")
+        return path
+
+    def write_scene_captions(self, scene: int):
+        """Write {scene}.srt and {scene}.vtt; returns the cues"""
+        cues = self.scene_cues(scene)
+        if cues:
+            self.write_srt(cues, self.captions_dir / f"{scene}.srt")
+            self.write_vtt(cues, self.captions_dir / f"{scene}.vtt")
+        return cues
+
+    def write_video_captions(self, scene_starts, name: str):
+        """
+        Write whole-video {name}.srt / {name}.vtt.
+
+        Args:
+            scene_starts: {scene number: start time in the final video (seconds)}
+            name: base file name, e.g. "final_video_3"
+        """
+        cues = []
+        for scene, start in sorted(scene_starts.items(), key=lambda item: item[1]):
+            for cue in self.write_scene_captions(scene):
+                cues.append({
+                    "start": cue["start"] + start,
+                    "end": cue["end"] + start,
+                    "text": cue["text"]
+                })
+
+        if not cues:
+            print("[warning] No word timings found, captions not written")
+            return None
+
+        srt_path = self.write_srt(cues, self.captions_dir / f"{name}.srt")
+        self.write_vtt(cues, self.captions_dir / f"{name}.vtt")
+        print(f"[info] Captions saved at: {srt_path} (+ .vtt)")
+        return srt_path
+
+    # ---------------------------
+    # Overlays
+    # ---------------------------
+    def _load_font(self, size: int):
+        for name in self.FONT_CANDIDATES:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+        return ImageFont.load_default(size=size)
+
+    def _wrap(self, draw, text, font, max_width):
+        lines = []
+        line = ""
+        for word in text.split():
+            candidate = f"{line} {word}".strip()
+            if line and draw.textlength(candidate, font=font) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        if line:
+            lines.append(line)
+        return "\n".join(lines)
+
+    def render_overlay(self, text: str, frame_width: int, frame_height: int) -> Path:
+        """
+        Rasterize a caption to a transparent PNG sized for the frame and return
+        its path. Results are cached on disk, so each distinct line is drawn once.
+        """
+        key = hashlib.sha1(
+            f"{self.STYLE_VERSION}|{frame_width}x{frame_height}|{text}".encode("utf-8")
+        ).hexdigest()
+        path = self.cache_dir / f"{key}.png"
+        if path.exists():
+            count("cache_hits")
+            return path
+        count("cache_misses")
+
+        font_size = max(12, int(frame_height * self.FONT_SCALE))
+        font = self._load_font(font_size)
+        stroke = max(1, font_size // 12)
+
+        # Keep text inside the centre 9:16 area so it survives a vertical crop
+        max_width = int(min(frame_width, frame_height * 9 / 16) * 0.9)
+
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        wrapped = self._wrap(measure, text, font, max_width)
+        left, top, right, bottom = measure.multiline_textbbox(
+            (0, 0), wrapped, font=font, stroke_width=stroke, align="center"
+        )
+        # Pillow's default font measures in fractional pixels
+        width, height = math.ceil(right - left + 2 * stroke), math.ceil(bottom - top + 2 * stroke)
+
+        overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(overlay).multiline_text(
+            (stroke - left, stroke - top), wrapped, font=font, fill=self.TEXT_COLOR,
+            stroke_width=stroke, stroke_fill=self.STROKE_COLOR, align="center"
+        )
+
+        tmp_path = path.with_suffix(".part")
+        overlay.save(tmp_path, format="PNG")
+        tmp_path.replace(path)
+        return path
+
+
+# ---------------------------
+# Example usage
+# ---------------------------
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    counter_path = base_dir / "video_counter.txt"
+    video_number = counter_path.read_text().strip() if counter_path.exists() else "1"
+    video_dir = base_dir / "data" / video_number
+
+    generator = CaptionGenerator(video_dir / "generated_audio", video_dir / "captions")
+    for cue in generator.write_scene_captions(1):
+        print(cue)
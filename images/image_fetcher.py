@@ -1,10 +1,35 @@
 import os
+import sys
+import time
+import random
+import tempfile
 import requests
 from pathlib import Path
 from dotenv import dotenv_values
+from PIL import Image
+
+# Allow running this file directly (python images/image_fetcher.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scheduler.tracing import span
+
+# Leading bytes of the formats the inference API can return
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",        # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"RIFF",                # WEBP (checked further below)
+)
+
 
 class ImageGenerator:
-    def __init__(self):
+    # Download settings
+    CHUNK_SIZE = 64 * 1024
+    MAX_IMAGE_BYTES = 20 * 1024 * 1024  # 20 MB is far above a real SDXL output
+    REQUEST_TIMEOUT = 120
+    MAX_RETRIES = 2
+    BACKOFF_SECONDS = 1     # first retry delay, doubled per attempt
+    MAX_BACKOFF_SECONDS = 30
+
+    def __init__(self, video_number=None):
         # ---------------------------
         # Locate the main folder's .env and VideoCounter.txt
         # ---------------------------
@@ -24,14 +49,19 @@ class ImageGenerator:
         if not self.HF_API_KEY:
             raise ValueError("❌ No HuggingFaceAPIKey found in main folder .env or environment variables.")
 
-        # Hugging Face API setup
-        self.API_URL = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
+        # Hugging Face API setup (HF_API_URL points it at another endpoint, e.g. a benchmark stub)
+        self.API_URL = (
+            self.env.get("HF_API_URL") or os.environ.get("HF_API_URL")
+            or "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
+        )
         self.headers = {"Authorization": f"Bearer {self.HF_API_KEY}"}
 
         # ---------------------------
-        # Fetch current video number
+        # Fetch current video number (or use the one a pipeline job reserved)
         # ---------------------------
-        if counter_path.exists():
+        if video_number is not None:
+            self.video_number = str(video_number)
+        elif counter_path.exists():
             with open(counter_path, "r") as f:
                 counter_value = f.read().strip()
                 self.video_number = counter_value if counter_value.isdigit() else "1"
@@ -49,27 +79,116 @@ class ImageGenerator:
         print(f"[info] Current video: {self.video_number}")
         print(f"[info] Images will be saved to: {self.output_dir}")
 
+    @staticmethod
+    def _has_image_signature(header: bytes) -> bool:
+        """Check the first bytes of a download against known image formats."""
+        if header.startswith(b"RIFF"):
+            return header[8:12] == b"WEBP"
+        return any(header.startswith(sig) for sig in IMAGE_SIGNATURES)
+
+    @classmethod
+    def _retry_delay(cls, attempt: int, response=None) -> float:
+        """
+        Seconds to wait before the next attempt: the server's Retry-After on
+        429/503, otherwise exponential backoff with jitter
+        """
+        if response is not None and response.status_code in (429, 503):
+            retry_after = (response.headers.get("Retry-After") or "").strip()
+            if retry_after.isdigit():
+                return min(cls.MAX_BACKOFF_SECONDS, int(retry_after))
+        delay = cls.BACKOFF_SECONDS * 2 ** (attempt - 1) * (1 + random.random() * 0.5)
+        return min(cls.MAX_BACKOFF_SECONDS, delay)
+
+    def _stream_to_file(self, response, image_path: Path) -> bool:
+        """
+        Stream a response body into a temp file next to image_path, validate it
+        and atomically move it into place. Returns True if the image was saved.
+        PNG and WEBP responses are re-encoded so image_path always holds a JPEG.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.output_dir, prefix=f".{image_path.stem}-", suffix=".part")
+        tmp_path = Path(tmp_name)
+        try:
+            written = 0
+            header = b""
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    if len(header) < 12:
+                        header += chunk[:12 - len(header)]
+                    written += len(chunk)
+                    if written > self.MAX_IMAGE_BYTES:
+                        print(f"[ERR] Image exceeds {self.MAX_IMAGE_BYTES} bytes, aborting download")
+                        return False
+                    f.write(chunk)
+
+            if not self._has_image_signature(header):
+                print(f"[ERR] Response is not an image (starts with {header[:12]!r})")
+                return False
+
+            # verify() catches truncated or corrupt files without decoding pixels
+            try:
+                with Image.open(tmp_path) as img:
+                    img.verify()
+            except Exception as e:
+                print(f"[ERR] Pillow could not verify image: {e}")
+                return False
+
+            if not header.startswith(IMAGE_SIGNATURES[0]):
+                with Image.open(tmp_path) as img:
+                    rgb = img.convert("RGB")
+                rgb.save(tmp_path, "JPEG", quality=95)
+            os.replace(tmp_path, image_path)
+            return True
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
     def generate_image(self, prompt: str, number: int):
         """
         Generate a single image for a given prompt and save it as {number}.jpg
         inside the folder corresponding to the current VideoCounter.txt value.
+
+        The response is streamed to a temp file, checked for size, magic bytes
+        and decodability, then renamed into place. Invalid responses are retried.
+        Returns the saved path, or None if every attempt failed.
         """
         payload = {
             "inputs": f"{prompt}, ultra high resolution, cinematic lighting, 8k, news photography"
         }
+        image_path = self.output_dir / f"{number}.jpg"
 
-        try:
-            response = requests.post(self.API_URL, headers=self.headers, json=payload)
-            if response.status_code == 200:
-                image_path = self.output_dir / f"{number}.jpg"
-                with open(image_path, "wb") as f:
-                    f.write(response.content)
-                print(f"[OK] Saved {image_path} for prompt: {prompt}")
-            else:
-                print(f"[ERR] Error {response.status_code}: {response.text}")
-
-        except Exception as e:
-            print(f"[ERR] Failed to generate image for prompt '{prompt}': {e}")
+        with span("image", scene=number) as trace:
+            for attempt in range(1, self.MAX_RETRIES + 2):
+                trace.set(retries=attempt - 1)
+                failed_response = None
+                try:
+                    with requests.post(
+                        self.API_URL,
+                        headers=self.headers,
+                        json=payload,
+                        stream=True,
+                        timeout=self.REQUEST_TIMEOUT
+                    ) as response:
+                        if response.status_code == 200:
+                            if self._stream_to_file(response, image_path):
+                                print(f"[OK] Saved {image_path} for prompt: {prompt}")
+                                trace.set(bytes=image_path.stat().st_size)
+                                return image_path
+                        else:
+                            failed_response = response
+                            print(f"[ERR] Error {response.status_code}: {response.text[:500]}")
+
+                except Exception as e:
+                    print(f"[ERR] Failed to generate image for prompt '{prompt}': {e}")
+
+                if attempt <= self.MAX_RETRIES:
+                    delay = self._retry_delay(attempt, failed_response)
+                    print(f"[info] Retrying image {number} in {delay:.1f}s ({attempt}/{self.MAX_RETRIES})...")
+                    time.sleep(delay)
+
+            trace.fail("no valid image")
+            return None
 
 
 # ---------------------------
@@ -9,13 +9,10 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent
 sys.path.insert(0, str(BASE_DIR))
 
-# Import all modules
-from fetch_trends.trends import NewsHistoryManager
-from script_gen.script_writer import VideoScriptGenerator
-from images.image_fetcher import ImageGenerator
-from tts.tts_engine import AudioGenerator
-from video.video_maker import VideoMaker
-from uploader.youtube_upload import YoutubeUploader
+# Lightweight modules only; stage modules (Groq, edge-tts, moviepy, psutil,
+# Selenium) are imported by the cached factories below when a stage first runs
+from uploader.upload_queue import UploadQueue
+from scheduler.job_scheduler import JobManager, generate_script
 from dotenv import dotenv_values
 
 # Page config
@@ -127,6 +124,70 @@ if 'topic_source' not in st.session_state:
     st.session_state.topic_source = None
 if 'custom_topic' not in st.session_state:
     st.session_state.custom_topic = None
+if 'job_id' not in st.session_state:
+    # The job id is mirrored in the URL so a refreshed page finds its job again
+    st.session_state.job_id = st.query_params.get("job")
+    if st.session_state.job_id is not None:
+        st.session_state.mode = 'automated'
+        st.session_state.processing = True
+
+
+# ---------------------------
+# Cached resources (shared across reruns and sessions)
+# ---------------------------
+def _mtime(path):
+    """Cache key that changes whenever the file is rewritten"""
+    return path.stat().st_mtime_ns if path.exists() else 0
+
+
+@st.cache_resource(show_spinner=False)
+def _load_env(mtime):
+    env_path = BASE_DIR / ".env"
+    return dotenv_values(env_path) if env_path.exists() else {}
+
+
+def get_env():
+    """Parsed .env, re-read only when the file changes"""
+    return _load_env(_mtime(BASE_DIR / ".env"))
+
+
+@st.cache_data(show_spinner=False)
+def _read_video_counter(mtime):
+    with open(BASE_DIR / "video_counter.txt", "r") as f:
+        num = f.read().strip()
+    return num if num.isdigit() else "1"
+
+
+# Stage objects are keyed by video number (they bind their data folder on
+# construction) and by the .env mtime (they read settings on construction)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_script_generator(video_num, env_mtime):
+    from script_gen.script_writer import VideoScriptGenerator
+    return VideoScriptGenerator(video_number=video_num)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_image_generator(video_num, env_mtime):
+    from images.image_fetcher import ImageGenerator
+    return ImageGenerator(video_number=video_num)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_audio_generator(video_num, env_mtime):
+    # The TTS router (and any local engine's warm process pool) is shared per process
+    from tts.tts_engine import AudioGenerator
+    return AudioGenerator(video_number=video_num)
+
+
+@st.cache_resource(show_spinner=False)
+def get_news_manager(api_key):
+    from fetch_trends.trends import NewsHistoryManager
+    history_folder = BASE_DIR / "history"
+    history_folder.mkdir(exist_ok=True)
+    return NewsHistoryManager(
+        history_file=str(history_folder / "history_manager.txt"),
+        api_key=api_key
+    )
 
 
 def get_video_counter():
@@ -136,9 +197,7 @@ def get_video_counter():
         with open(counter_file, "w") as f:
             f.write("1")
         return "1"
-    with open(counter_file, "r") as f:
-        num = f.read().strip()
-    return num if num.isdigit() else "1"
+    return _read_video_counter(_mtime(counter_file))
 
 
 def increment_video_counter():
@@ -149,104 +208,67 @@ def increment_video_counter():
         f.write(str(current + 1))
 
 
-def run_full_pipeline(topic, description, video_duration):
-    """Run all steps automatically from script generation to upload"""
-    
-    status_placeholder = st.empty()
-    progress_bar = st.progress(0)
-    
-    try:
-        # STEP 1: Generate Script
-        status_placeholder.info("📝 Step 1/5: Generating video script...")
-        progress_bar.progress(0.1)
-        
-        generator = VideoScriptGenerator()
-        user_prompt = f"A {video_duration}-second video about {topic}. Context: {description}"
-        
-        scenes = generator.generate_video_script(user_prompt)
-        
-        if not scenes:
-            status_placeholder.error("❌ Failed to generate script!")
-            return False
-        
-        generator.save_script(scenes)
-        title_desc = generator.generate_title_and_description(user_prompt)
-        if title_desc:
-            generator.save_title_and_description(title_desc)
-        
-        st.session_state.script_data = {
-            'scenes': scenes,
-            'title': title_desc.get('title') if title_desc else topic,
-            'description': title_desc.get('description') if title_desc else description
-        }
-        
-        status_placeholder.success(f"✅ Script generated with {len(scenes)} scenes!")
-        progress_bar.progress(0.25)
-        time.sleep(1)
-        
-        # STEP 2: Generate Images
-        status_placeholder.info("🖼️ Step 2/5: Generating images...")
-        image_gen = ImageGenerator()
-        for i, scene in enumerate(scenes, 1):
-            visual_prompt = scene.get("visualPrompt", "")
-            if visual_prompt:
-                image_gen.generate_image(visual_prompt, i)
-                progress_bar.progress(0.25 + (0.15 * i / len(scenes)))
-        
-        status_placeholder.success(f"✅ Generated {len(scenes)} images!")
-        progress_bar.progress(0.4)
-        time.sleep(1)
-        
-        # STEP 3: Generate Audio
-        status_placeholder.info("🎙️ Step 3/5: Generating audio...")
-        audio_gen = AudioGenerator()
-        
-        async def generate_all_audio():
-            for i, scene in enumerate(scenes, 1):
-                dialogue = scene.get("dialogue", "")
-                if dialogue:
-                    await audio_gen.generate_audio(dialogue, i)
-                    progress_bar.progress(0.4 + (0.15 * i / len(scenes)))
-        
-        asyncio.run(generate_all_audio())
-        status_placeholder.success(f"✅ Generated {len(scenes)} audio files!")
-        progress_bar.progress(0.55)
-        time.sleep(1)
-        
-        # STEP 4: Create Video
-        status_placeholder.info("🎬 Step 4/5: Compiling video... This may take a few minutes...")
-        progress_bar.progress(0.6)
-        
-        maker = VideoMaker()
-        success = maker.create_video()
-        
-        if not success:
-            status_placeholder.error("❌ Failed to create video!")
-            return False
-        
-        status_placeholder.success("✅ Video created successfully!")
-        progress_bar.progress(0.8)
-        time.sleep(1)
-        
-        # STEP 5: Upload to YouTube
-        status_placeholder.info("📤 Step 5/5: Uploading to YouTube... Please wait...")
-        progress_bar.progress(0.85)
-        
-        upload_success = YoutubeUploader.upload_latest_video()
-        
-        if upload_success:
-            status_placeholder.success("🎉 Video uploaded to YouTube successfully!")
-            progress_bar.progress(1.0)
-            st.balloons()
-            increment_video_counter()
-            return True
-        else:
-            status_placeholder.error("❌ Upload failed!")
-            return False
-    
-    except Exception as e:
-        status_placeholder.error(f"❌ Error: {e}")
-        return False
+def show_job_timeline(job):
+    """Gantt chart of the job's trace spans: where the minutes of this video went"""
+    spans = job.trace.timeline()
+    if not spans:
+        st.caption("No finished steps yet.")
+        return
+
+    import altair as alt
+    origin = spans[0]["start"]
+    rows = []
+    for entry in spans:
+        scene = entry["attrs"].get("scene")
+        rows.append({
+            "step": f"{entry['name']} {scene}" if scene is not None else entry["name"],
+            "stage": entry["name"],
+            "start": round(entry["start"] - origin, 2),
+            "end": round(entry["start"] - origin + entry["seconds"], 2),
+            "seconds": entry["seconds"],
+            "ok": entry["ok"],
+            "details": ", ".join(f"{k}={v}" for k, v in entry["attrs"].items() if v is not None),
+        })
+
+    chart = alt.Chart(alt.Data(values=rows)).mark_bar().encode(
+        x=alt.X("start:Q", title="seconds since start"),
+        x2="end:Q",
+        y=alt.Y("step:N", sort=None, title=None),
+        color=alt.Color("stage:N", legend=None),
+        opacity=alt.condition("datum.ok", alt.value(1.0), alt.value(0.4)),
+        tooltip=["step:N", "seconds:Q", "details:N"],
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    # Top-level stages only, so nested spans are not counted twice
+    totals = {}
+    for entry in spans:
+        if entry["name"] in ("script", "images", "audio", "render", "upload"):
+            totals[entry["name"]] = totals.get(entry["name"], 0.0) + entry["seconds"]
+    if totals:
+        st.caption(" · ".join(f"{name} {seconds:.1f}s" for name, seconds in totals.items()))
+
+
+def show_job_progress(job_id):
+    """Progress of a background pipeline job; re-polled every second while it runs"""
+    job = JobManager.shared().get(job_id)
+    if job is None:
+        st.warning("⚠️ Job not found - the app may have been restarted.")
+        return
+    if job.finished:
+        st.rerun()  # let the full page show the result
+
+    st.markdown(f"#### ⚙️ Job `{job.id}`: {job.topic}")
+    st.progress(job.progress, text=job.message)
+    with st.expander("📜 Log"):
+        st.code("\n".join(job.log[-50:]) or "Waiting for a free worker...")
+    with st.expander("⏱️ Timeline"):
+        show_job_timeline(job)
+
+
+# Poll with a fragment rerun where Streamlit supports it, so only this panel refreshes
+if hasattr(st, "fragment"):
+    show_job_progress = st.fragment(run_every=1.0)(show_job_progress)
 
 
 def main():
@@ -259,6 +281,10 @@ def main():
         st.header("📊 System Status")
         video_num = get_video_counter()
         st.metric("Current Video #", video_num)
+        st.metric("Pipeline jobs running", JobManager.shared().active)
+        upload_queue = UploadQueue.shared(create=False)
+        if upload_queue is not None:
+            st.metric("Uploads in queue", upload_queue.pending)
         
         st.divider()
         
@@ -275,6 +301,8 @@ def main():
             st.session_state.processing = False
             st.session_state.topic_source = None
             st.session_state.custom_topic = None
+            st.session_state.job_id = None
+            st.query_params.clear()
             st.rerun()
         
         if st.button("🗑️ Clear History", type="secondary", use_container_width=True):
@@ -363,16 +391,10 @@ def main():
                 if st.button("🔍 Fetch Latest News", use_container_width=True, key="auto_news"):
                     with st.spinner("Fetching news..."):
                         try:
-                            env = dotenv_values(BASE_DIR / ".env")
-                            api_key = env.get('NEWS_API_KEY')
+                            api_key = get_env().get('NEWS_API_KEY')
                             
                             if api_key:
-                                history_folder = BASE_DIR / "history"
-                                history_folder.mkdir(exist_ok=True)
-                                manager = NewsHistoryManager(
-                                    history_file=str(history_folder / "history_manager.txt"),
-                                    api_key=api_key
-                                )
+                                manager = get_news_manager(api_key)
                                 news = manager.get_latest_tech_news()
                                 
                                 if news:
@@ -442,21 +464,46 @@ def main():
         if st.session_state.processing:
             st.markdown("---")
             
-            # Determine topic and description BEFORE calling pipeline
-            if st.session_state.topic_source == 'news':
-                topic = st.session_state.news_data['title']
-                description = st.session_state.news_data['description']
-            else:
-                topic = st.session_state.custom_topic
-                description = f"Create an engaging video about {topic}"
-            
-            # Run the full pipeline with determined values
-            success = run_full_pipeline(topic, description, video_duration)
-            
-            st.session_state.processing = False
+            if st.session_state.job_id is None:
+                # Determine topic and description BEFORE submitting the job
+                if st.session_state.topic_source == 'news':
+                    topic = st.session_state.news_data['title']
+                    description = st.session_state.news_data['description']
+                else:
+                    topic = st.session_state.custom_topic
+                    description = f"Create an engaging video about {topic}"
+                
+                # The pipeline runs on a background worker; this page only polls it
+                job = JobManager.shared().submit(topic, description, video_duration)
+                st.session_state.job_id = job.id
+                st.query_params["job"] = job.id
             
-            if success:
-                show_video_result()
+            job = JobManager.shared().get(st.session_state.job_id)
+            if job is not None and job.finished:
+                if job.status == "done":
+                    st.success(job.message)
+                    st.session_state.script_data = {
+                        'scenes': job.result.get('scenes'),
+                        'title': job.result.get('title'),
+                        'description': job.result.get('description')
+                    }
+                    show_video_result(job.video_number)
+                    with st.expander("⏱️ Where the time went"):
+                        show_job_timeline(job)
+                else:
+                    st.error(f"❌ Error: {job.error}")
+                    with st.expander("⏱️ Timeline"):
+                        show_job_timeline(job)
+                    if st.button("🔄 Try Again", type="primary"):
+                        st.session_state.job_id = None
+                        st.session_state.processing = False
+                        st.query_params.clear()
+                        st.rerun()
+            else:
+                show_job_progress(st.session_state.job_id)
+                if not hasattr(st, "fragment") and job is not None:
+                    time.sleep(1)
+                    st.rerun()
     
     # ==================== MANUAL MODE ====================
     elif st.session_state.mode == 'manual':
@@ -488,16 +535,10 @@ def main():
                 if st.button("🔍 Fetch News", use_container_width=True, key="manual_news"):
                     with st.spinner("Fetching news..."):
                         try:
-                            env = dotenv_values(BASE_DIR / ".env")
-                            api_key = env.get('NEWS_API_KEY')
+                            api_key = get_env().get('NEWS_API_KEY')
                             
                             if api_key:
-                                history_folder = BASE_DIR / "history"
-                                history_folder.mkdir(exist_ok=True)
-                                manager = NewsHistoryManager(
-                                    history_file=str(history_folder / "history_manager.txt"),
-                                    api_key=api_key
-                                )
+                                manager = get_news_manager(api_key)
                                 news = manager.get_latest_tech_news()
                                 
                                 if news:
@@ -574,16 +615,11 @@ def show_manual_steps(video_duration):
         st.markdown("### 📝 Generate Video Script")
         if st.button("Generate Script", type="primary", key="gen_script"):
             with st.spinner("Generating script..."):
-                generator = VideoScriptGenerator()
+                generator = get_script_generator(get_video_counter(), _mtime(BASE_DIR / ".env"))
                 user_prompt = f"A {video_duration}-second video about {topic}. Context: {description}"
-                scenes = generator.generate_video_script(user_prompt)
+                scenes, title_desc = generate_script(generator, user_prompt)
                 
                 if scenes:
-                    generator.save_script(scenes)
-                    title_desc = generator.generate_title_and_description(user_prompt)
-                    if title_desc:
-                        generator.save_title_and_description(title_desc)
-                    
                     st.session_state.script_data = {
                         'scenes': scenes,
                         'title': title_desc.get('title') if title_desc else topic,
@@ -604,7 +640,7 @@ def show_manual_steps(video_duration):
         if st.session_state.script_data:
             if st.button("Generate Images", type="primary", key="gen_images"):
                 with st.spinner("Generating images..."):
-                    image_gen = ImageGenerator()
+                    image_gen = get_image_generator(get_video_counter(), _mtime(BASE_DIR / ".env"))
                     for i, scene in enumerate(st.session_state.script_data['scenes'], 1):
                         image_gen.generate_image(scene['visualPrompt'], i)
                     st.success("✅ Images generated!")
@@ -617,7 +653,7 @@ def show_manual_steps(video_duration):
         if st.session_state.script_data:
             if st.button("Generate Audio", type="primary", key="gen_audio"):
                 with st.spinner("Generating audio..."):
-                    audio_gen = AudioGenerator()
+                    audio_gen = get_audio_generator(get_video_counter(), _mtime(BASE_DIR / ".env"))
                     async def gen_audio():
                         for i, scene in enumerate(st.session_state.script_data['scenes'], 1):
                             await audio_gen.generate_audio(scene['dialogue'], i)
@@ -631,6 +667,7 @@ def show_manual_steps(video_duration):
         st.markdown("### 🎬 Create Final Video")
         if st.button("Compile Video", type="primary", key="create_video"):
             with st.spinner("Creating video..."):
+                from video.video_maker import VideoMaker
                 maker = VideoMaker()
                 if maker.create_video():
                     st.success("✅ Video created!")
@@ -644,18 +681,20 @@ def show_manual_steps(video_duration):
         st.markdown("### 📤 Upload to YouTube")
         if st.button("Upload Video", type="primary", key="upload_video"):
             with st.spinner("Uploading..."):
+                from uploader.youtube_upload import YoutubeUploader
                 if YoutubeUploader.upload_latest_video():
                     st.success("🎉 Uploaded!")
                     increment_video_counter()
                     st.balloons()
 
 
-def show_video_result():
+def show_video_result(video_num=None):
     """Show the final video result"""
     st.markdown("---")
     st.markdown("### 🎉 Video Complete!")
     
-    video_num = str(int(get_video_counter()) - 1)
+    if video_num is None:
+        video_num = str(int(get_video_counter()) - 1)
     video_path = BASE_DIR / "data" / video_num / "generated_video" / f"final_video_{video_num}.mp4"
     
     if video_path.exists():
@@ -670,6 +709,8 @@ def show_video_result():
         st.session_state.processing = False
         st.session_state.topic_source = None
         st.session_state.custom_topic = None
+        st.session_state.job_id = None
+        st.query_params.clear()
         st.rerun()
 
 
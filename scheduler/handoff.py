@@ -0,0 +1,84 @@
+#scheduler/handoff.py module
+
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import dotenv_values
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+class Checkpointer:
+    """
+    Writes stage outputs to disk on a background thread.
+
+    The files under data/<n>/ (video_script.json, title.txt, ...) are only
+    needed to resume or inspect a run, so in automated mode they are written
+    off the critical path. One writer thread per process keeps writes for the
+    same video in submission order. PIPELINE_CHECKPOINT_ASYNC=false writes
+    inline instead.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, background=None):
+        if background is None:
+            env_path = BASE_DIR / ".env"
+            env = dotenv_values(env_path) if env_path.exists() else {}
+            background = str(env.get("PIPELINE_CHECKPOINT_ASYNC", "true")).lower() in ("1", "true", "yes")
+        self.background = background
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint") if background else None
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _write(label, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+            return True
+        except Exception as e:
+            print(f"[warning] Checkpoint '{label}' failed: {e}")
+            return False
+
+    def submit(self, label, fn, *args, **kwargs):
+        """Run fn(*args) now or in the background; returns a Future[bool] or the bool"""
+        if self._executor is None:
+            return self._write(label, fn, args, kwargs)
+        return self._executor.submit(self._write, label, fn, args, kwargs)
+
+
+class StageHandoff:
+    """
+    What the pipeline stages of one video pass to each other in memory:
+    the scene list, upload metadata, per-scene image paths (ffmpeg reads
+    them from disk) and per-scene audio as paths or MP3 bytes. Persisting the
+    JSON/text outputs goes through checkpoint(), so no stage re-reads what
+    the previous one just wrote.
+    """
+
+    def __init__(self, video_number, checkpointer=None):
+        self.video_number = str(video_number)
+        self.scenes = None
+        self.metadata = None        # {"title", "description", "tags"}
+        self.image_paths = {}       # scene number -> Path
+        self.audio = {}             # scene number -> Path, or MP3 bytes if kept in memory
+        self.video_path = None
+        self._checkpointer = checkpointer or Checkpointer.shared()
+        self._pending = []
+
+    def checkpoint(self, label, fn, *args, **kwargs):
+        result = self._checkpointer.submit(label, fn, *args, **kwargs)
+        if hasattr(result, "result"):
+            self._pending.append(result)
+
+    def wait_for_checkpoints(self, timeout=None) -> bool:
+        """Block until everything submitted for this video is on disk"""
+        ok = all(future.result(timeout=timeout) for future in self._pending)
+        self._pending = []
+        return ok
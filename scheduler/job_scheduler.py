@@ -0,0 +1,312 @@
+#scheduler/job_scheduler.py module
+
+import sys
+import time
+import uuid
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import dotenv_values
+
+# Allow running this file directly (python scheduler/job_scheduler.py)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+from scheduler.handoff import StageHandoff
+from scheduler.tracing import Tracer, span
+
+_counter_lock = threading.Lock()
+
+
+def reserve_video_number() -> str:
+    """
+    Claim the current video number for one pipeline run and advance
+    video_counter.txt, so concurrent jobs never share a data/<n> folder.
+    """
+    counter_file = BASE_DIR / "video_counter.txt"
+    with _counter_lock:
+        current = counter_file.read_text().strip() if counter_file.exists() else "1"
+        current = current if current.isdigit() else "1"
+        counter_file.write_text(str(int(current) + 1))
+    return current
+
+
+def script_prompt(topic, description, video_duration):
+    return f"A {video_duration}-second video about {topic}. Context: {description}"
+
+
+def generate_script(generator, user_prompt, handoff=None):
+    """
+    Generate and save scenes plus title/description in one structured call,
+    falling back to the two separate calls if the combined one fails.
+    Returns (scenes, title_desc); either may be None, title_desc also when
+    the title or description could not be generated. With a handoff the
+    files are written as background checkpoints.
+    """
+    result = generator.generate_script_and_metadata(user_prompt)
+    if result:
+        scenes = result["scenes"]
+        title_desc = (
+            {key: result[key] for key in ("title", "description", "tags")}
+            if result["title"] and result["description"] else None
+        )
+    else:
+        scenes = generator.generate_video_script(user_prompt)
+        title_desc = generator.generate_title_and_description(user_prompt) if scenes else None
+
+    save = handoff.checkpoint if handoff else (lambda label, fn, *args: fn(*args))
+    if scenes:
+        save("script", generator.save_script, scenes)
+    if title_desc:
+        save("title_description", generator.save_title_and_description, title_desc)
+    return scenes, title_desc
+
+
+def generate_images(number, scenes, on_scene=None):
+    """
+    Image for every scene with a visual prompt; on_scene(i, total) after each.
+    Returns {scene number: saved path}.
+    """
+    from images.image_fetcher import ImageGenerator
+
+    image_gen = ImageGenerator(video_number=number)
+    paths = {}
+    for i, scene in enumerate(scenes, 1):
+        visual_prompt = scene.get("visualPrompt", "")
+        if visual_prompt:
+            path = image_gen.generate_image(visual_prompt, i)
+            if path:
+                paths[i] = path
+            if on_scene:
+                on_scene(i, len(scenes))
+    return paths
+
+
+def generate_audio(number, scenes, on_scene=None, keep_files=True):
+    """
+    Narration clip for every scene with dialogue; on_scene(i, total) after each.
+    Returns {scene number: saved path}, or {scene number: MP3 bytes} with
+    keep_files=False.
+    """
+    from tts.tts_engine import AudioGenerator
+
+    audio_gen = AudioGenerator(video_number=number)
+    paths = {}
+
+    async def generate_all_audio():
+        for i, scene in enumerate(scenes, 1):
+            dialogue = scene.get("dialogue", "")
+            if dialogue:
+                audio = await audio_gen.generate_audio(dialogue, i, keep_file=keep_files)
+                if audio:
+                    paths[i] = audio
+                if on_scene:
+                    on_scene(i, len(scenes))
+
+    asyncio.run(generate_all_audio())
+    return paths
+
+
+def render_video(number, handoff=None, variants=False):
+    """
+    Compile data/<number> into the final video; returns its path or None.
+    With a handoff, scenes and asset paths come from memory instead of the
+    saved script. With variants, every VideoMaker.RENDER_TARGETS output is
+    rendered in one pass and the first (the Short, at the usual
+    final_video_<n>.mp4 path) is returned.
+    """
+    from video.video_maker import VideoMaker
+
+    maker = VideoMaker(video_number=number)
+    inputs = () if handoff is None else (handoff.scenes, handoff.image_paths, handoff.audio)
+    if variants:
+        return maker.output_path if maker.create_video_variants(*inputs) else None
+    created = maker.create_video(*inputs)
+    return maker.output_path if created else None
+
+
+class PipelineJob:
+    """State of one automated run, shared between the worker and any UI polling it"""
+
+    def __init__(self, topic, description, video_duration):
+        self.id = uuid.uuid4().hex[:12]
+        self.topic = topic
+        self.description = description
+        self.video_duration = video_duration
+
+        self.status = "queued"     # queued | running | done | failed
+        self.progress = 0.0
+        self.message = "⏳ Waiting for a free worker..."
+        self.log = []
+        self.error = None
+        self.video_number = None
+        self.result = {}           # scenes, title, description, video_path
+        self.created = time.time()
+        self.finished_at = None
+        self.trace = Tracer(trace_id=self.id, label=topic)   # spans for the UI timeline
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def update(self, progress, message):
+        self.progress = max(0.0, min(1.0, progress))
+        self.message = message
+        self.log.append(f"{time.strftime('%H:%M:%S')} {message}")
+        print(f"[job {self.id}] {message}")
+
+
+def run_pipeline(job: PipelineJob):
+    """All steps from script generation to upload, reporting progress on `job`"""
+    # Stage modules are imported here so the UI process starts without them
+    from script_gen.script_writer import VideoScriptGenerator
+    from uploader.upload_queue import UploadQueue
+
+    job.video_number = number = reserve_video_number()
+    # Stages hand their outputs over in memory; JSON/text files are checkpoints
+    handoff = StageHandoff(number)
+
+    # STEP 1: Generate Script
+    job.update(0.05, f"📝 Step 1/5: Generating video script (video #{number})...")
+    with span("script") as trace:
+        generator = VideoScriptGenerator(video_number=number)
+        user_prompt = script_prompt(job.topic, job.description, job.video_duration)
+        scenes, title_desc = generate_script(generator, user_prompt, handoff)
+        trace.set(scenes=len(scenes or []))
+    if not scenes:
+        raise RuntimeError("Failed to generate script!")
+    handoff.scenes = scenes
+    handoff.metadata = dict(title_desc or {"title": job.topic, "description": job.description})
+    job.result.update(
+        scenes=scenes,
+        title=handoff.metadata.get("title"),
+        description=handoff.metadata.get("description")
+    )
+    job.update(0.25, f"✅ Script generated with {len(scenes)} scenes!")
+
+    # STEP 2: Generate Images
+    job.update(0.25, "🖼️ Step 2/5: Generating images...")
+    with span("images", scenes=len(scenes)):
+        handoff.image_paths = generate_images(
+            number, scenes, lambda i, total: setattr(job, "progress", 0.25 + 0.15 * i / total)
+        )
+    job.update(0.4, f"✅ Generated {len(scenes)} images!")
+
+    # STEP 3: Generate Audio
+    job.update(0.4, "🎙️ Step 3/5: Generating audio...")
+    # Scene MP3s go straight from TTS to the narration mix unless files are wanted
+    env_path = BASE_DIR / ".env"
+    env = dotenv_values(env_path) if env_path.exists() else {}
+    keep_audio = str(env.get("PIPELINE_KEEP_AUDIO_FILES", "false")).lower() in ("1", "true", "yes")
+    variants = str(env.get("PIPELINE_RENDER_VARIANTS", "false")).lower() in ("1", "true", "yes")
+    with span("audio", scenes=len(scenes), in_memory=not keep_audio):
+        handoff.audio = generate_audio(
+            number, scenes, lambda i, total: setattr(job, "progress", 0.4 + 0.15 * i / total),
+            keep_files=keep_audio
+        )
+    job.update(0.55, f"✅ Generated {len(scenes)} audio files!")
+
+    # STEP 4: Create Video
+    job.update(0.6, "🎬 Step 4/5: Compiling video... This may take a few minutes...")
+    handoff.video_path = render_video(number, handoff, variants)
+    if not handoff.video_path:
+        raise RuntimeError("Failed to create video!")
+    job.result["video_path"] = str(handoff.video_path)
+    job.update(0.8, "✅ Video created successfully!")
+
+    # STEP 5: Upload to YouTube
+    # The queue takes the exact file and metadata of this video, so the next
+    # job can start rendering while this one uploads
+    queue = UploadQueue.shared()
+    future = queue.submit(handoff.video_path, handoff.metadata)
+    # The files are only for resuming; make sure they exist before the job ends
+    with span("checkpoint_wait"):
+        handoff.wait_for_checkpoints()
+    if str(env.get("UPLOAD_BACKGROUND", "true")).lower() in ("1", "true", "yes"):
+        job.update(1.0, f"📤 Video queued for upload ({queue.pending} in queue)")
+        return
+
+    job.update(0.85, "📤 Step 5/5: Uploading to YouTube... Please wait...")
+    if not future.result():
+        raise RuntimeError("Upload failed!")
+    job.update(1.0, "🎉 Video uploaded to YouTube successfully!")
+
+
+class JobManager:
+    """
+    Runs pipeline jobs on background worker threads so the Streamlit script
+    thread only submits and polls. One manager per process (see shared()),
+    so every browser tab and user sees the same jobs, and a job keeps running
+    if the page that started it is refreshed or closed.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+    MAX_FINISHED = 50   # finished jobs kept for polling
+
+    def __init__(self, workers=None):
+        env_path = BASE_DIR / ".env"
+        env = dotenv_values(env_path) if env_path.exists() else {}
+        self.workers = workers or int(env.get("PIPELINE_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pipeline")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def submit(self, topic, description, video_duration) -> PipelineJob:
+        job = PipelineJob(topic, description, video_duration)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        """All known jobs, newest first"""
+        return sorted(self._jobs.values(), key=lambda job: job.created, reverse=True)
+
+    @property
+    def active(self) -> int:
+        return sum(1 for job in list(self._jobs.values()) if not job.finished)
+
+    def _prune(self):
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.created)
+        for job in finished[:-self.MAX_FINISHED]:
+            del self._jobs[job.id]
+
+    def _run(self, job: PipelineJob):
+        job.status = "running"
+        try:
+            with job.trace.activate(), span("pipeline", topic=job.topic[:80]) as trace:
+                try:
+                    run_pipeline(job)
+                finally:
+                    trace.set(video_number=job.video_number)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.update(job.progress, f"❌ {e}")
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            job.trace.flush()
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    manager = JobManager.shared()
+    job = manager.submit("Iron Man", "Create an engaging video about Iron Man", 15)
+    while not job.finished:
+        time.sleep(1)
+    print(job.status, job.error or job.result.get("video_path"))
@@ -0,0 +1,182 @@
+#scheduler/profiling.py module
+
+import io
+import os
+import re
+import time
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+from pathlib import Path
+from dotenv import dotenv_values
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def _enabled_stages():
+    """
+    PROFILE_STAGES from the process environment (set by `python -m autotube
+    --profile ...`) or .env: comma-separated stage names, or "all".
+    """
+    value = os.environ.get("PROFILE_STAGES")
+    if value is None:
+        env_path = BASE_DIR / ".env"
+        env = dotenv_values(env_path) if env_path.exists() else {}
+        value = env.get("PROFILE_STAGES", "")
+    return {stage.strip().lower() for stage in value.split(",") if stage.strip()}
+
+
+_ENABLED = _enabled_stages()
+_TOP = int(os.environ.get("PROFILE_TOP", "25"))
+
+_local = threading.local()
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def profiled(stage):
+    """
+    Decorator: run the wrapped call under cProfile and tracemalloc when
+    `stage` is listed in PROFILE_STAGES.
+
+    The check happens once, when the module defining the function is
+    imported; for disabled stages the original function is returned
+    unchanged, so there is no overhead at all. Results go to
+    data/<video number>/profiles/ (see _workspace):
+
+        <stage>-<time>.prof      cProfile stats (snakeviz / pstats)
+        <stage>-<time>.snapshot  tracemalloc snapshot at the end of the call
+        <stage>-<time>.txt       top functions, peak and top allocations
+    """
+    def decorate(fn):
+        if stage not in _ENABLED and "all" not in _ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # One profiler per thread; nested profiled calls run inside the outer one
+            if getattr(_local, "active", False):
+                return fn(*args, **kwargs)
+            _local.active = True
+            try:
+                return _run_profiled(stage, fn, args, kwargs)
+            finally:
+                _local.active = False
+
+        return wrapper
+
+    return decorate
+
+
+def _workspace(args, kwargs):
+    """data/<n> for the call: from a `video_number` attribute or a data/<n>/... path argument (else data/)"""
+    for value in list(args) + list(kwargs.values()):
+        number = getattr(value, "video_number", None)
+        if number is not None:
+            return BASE_DIR / "data" / str(number)
+        if isinstance(value, (str, Path)):
+            parts = Path(value).parts
+            for index, part in enumerate(parts[:-1]):
+                if part.lower() == "data" and parts[index + 1].isdigit():
+                    return Path(*parts[:index + 2])
+    return BASE_DIR / "data"
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+def _run_profiled(stage, fn, args, kwargs):
+    _start_tracemalloc()
+    concurrent = _tracemalloc_users > 1
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one cProfile at a time per process
+        _stop_tracemalloc()
+        print(f"[warning] Another stage is being profiled, running {stage} without profiling")
+        return fn(*args, **kwargs)
+
+    started = time.perf_counter()
+    failed = None
+    try:
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+    except BaseException as e:
+        failed = e
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        try:
+            _current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            _stop_tracemalloc()
+        try:
+            _save(stage, fn, args, kwargs, profiler, snapshot, peak, elapsed, failed, concurrent)
+        except OSError as e:
+            print(f"[warning] Could not save profile for {stage}: {e}")
+
+
+def _save(stage, fn, args, kwargs, profiler, snapshot, peak, elapsed, failed, concurrent):
+    out_dir = _workspace(args, kwargs) / "profiles"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    base = out_dir / f"{stage}-{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident() % 10000}"
+
+    profiler.dump_stats(str(base.with_suffix(".prof")))
+    snapshot.dump(str(base.with_suffix(".snapshot")))
+
+    stats_text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stats_text)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(_TOP)
+    # Drop pstats' header noise down to the table
+    table = re.split(r"\n(?=\s+ncalls)", stats_text.getvalue(), maxsplit=1)[-1]
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")]
+    top_allocations = snapshot.filter_traces(filters).statistics("lineno")[:15]
+
+    lines = [
+        f"Stage: {stage} ({fn.__module__}.{fn.__qualname__})",
+        f"Wall time: {elapsed:.2f}s" + (f" - raised {type(failed).__name__}: {failed}" if failed else ""),
+        f"Peak traced memory: {peak / 1024 / 1024:.1f} MB",
+    ]
+    if concurrent:
+        lines.append("Note: other profiled calls ran at the same time; memory figures include them.")
+    lines += ["", f"Top {_TOP} functions by cumulative time:", table.rstrip(), "", "Top allocations still held at the end:"]
+    lines += [f"  {stat.size / 1024:10.1f} KiB  {stat.count:7d} blocks  {stat.traceback[0]}" for stat in top_allocations]
+
+    summary_path = base.with_suffix(".txt")
+    summary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"[info] Profile for {stage}: {summary_path} ({elapsed:.1f}s, peak {peak / 1024 / 1024:.1f} MB)")
+    return summary_path
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    # PROFILE_STAGES=demo python scheduler/profiling.py
+    @profiled("demo")
+    def build_table(rows):
+        return [{"row": i, "text": str(i) * 50} for i in range(rows)]
+
+    print(f"Enabled stages: {sorted(_ENABLED) or 'none'}")
+    build_table(200_000)
@@ -0,0 +1,288 @@
+#scheduler/tracing.py module
+
+import os
+import json
+import time
+import uuid
+import tempfile
+import threading
+import contextvars
+from pathlib import Path
+from contextlib import contextmanager
+from dotenv import dotenv_values
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Set while a job runs; stage code calls span() / count() without being handed a tracer
+_current_tracer = contextvars.ContextVar("autotube_tracer", default=None)
+_current_span = contextvars.ContextVar("autotube_span", default=None)
+
+
+class Span:
+    """One timed step. Attributes are free-form (bytes, retries, cache hits, ...)."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "ok", "attrs")
+
+    def __init__(self, trace_id, name, parent_id, attrs):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end = None
+        self.ok = True
+        self.attrs = dict(attrs)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def add(self, key, amount=1):
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def fail(self, reason):
+        """Mark the step failed without raising (e.g. a stage that returns None)"""
+        self.ok = False
+        self.attrs["error"] = str(reason)
+
+    @property
+    def seconds(self) -> float:
+        return round((self.end or time.time()) - self.start, 4)
+
+    def to_dict(self):
+        return {
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 4),
+            "seconds": self.seconds,
+            "ok": self.ok,
+            "attrs": self.attrs,
+        }
+
+
+class _NullSpan:
+    """Stand-in when nothing is being traced"""
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, key, amount=1):
+        pass
+
+    def fail(self, reason):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects the spans of one pipeline run (one trace per video).
+
+    Spans go to data/traces/traces.jsonl (one JSON object per span) when
+    flush() is called, and every finished span also updates the process-wide
+    Prometheus textfile (data/traces/autotube.prom by default, see
+    TRACE_PROM_FILE) for node_exporter's textfile collector. TRACING=false
+    turns everything into no-ops.
+
+    Example:
+        tracer = Tracer(label="Iron Man")
+        with tracer.activate():
+            with span("script"):
+                with span("llm", model="llama") as s:
+                    s.set(ttft_seconds=0.4)
+        tracer.flush()
+    """
+
+    def __init__(self, trace_id=None, label=""):
+        self.trace_id = trace_id or uuid.uuid4().hex[:12]
+        self.label = label
+        self.spans = []          # finished spans, in end order
+        self._unsaved = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Make this the tracer for span() calls in the current thread / task"""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        parent = _current_span.get()
+        current = Span(self.trace_id, name, parent.span_id if parent else None, attrs)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException:
+            current.ok = False
+            raise
+        finally:
+            _current_span.reset(token)
+            current.end = time.time()
+            with self._lock:
+                self.spans.append(current)
+                self._unsaved.append(current)
+            METRICS.observe(current)
+
+    def timeline(self):
+        """Finished spans as dicts sorted by start time, for the UI"""
+        with self._lock:
+            return [s.to_dict() for s in sorted(self.spans, key=lambda s: s.start)]
+
+    def flush(self):
+        """Append spans finished since the last flush to the JSONL file and refresh the textfile"""
+        with self._lock:
+            pending, self._unsaved = self._unsaved, []
+        if pending and _settings()["enabled"]:
+            path = _settings()["jsonl"]
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    for s in pending:
+                        record = s.to_dict()
+                        record["label"] = self.label
+                        f.write(json.dumps(record, default=str) + "\n")
+            except OSError as e:
+                print(f"[warning] Could not save trace: {e}")
+        METRICS.write()
+
+
+# ---------------------------
+# Module-level helpers used by stage code
+# ---------------------------
+def current_tracer():
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name, **attrs):
+    """Child span of whatever is running, or a no-op outside a traced job"""
+    tracer = _current_tracer.get()
+    if tracer is None or not _settings()["enabled"]:
+        yield NULL_SPAN
+        return
+    with tracer.span(name, **attrs) as current:
+        yield current
+
+
+def count(key, amount=1):
+    """Add to a counter attribute (e.g. cache_hits) on the innermost open span"""
+    current = _current_span.get()
+    if current is not None:
+        current.add(key, amount)
+
+
+_SETTINGS = None
+
+
+def _settings():
+    global _SETTINGS
+    if _SETTINGS is None:
+        env_path = BASE_DIR / ".env"
+        env = dotenv_values(env_path) if env_path.exists() else {}
+        trace_dir = BASE_DIR / "data" / "traces"
+        _SETTINGS = {
+            "enabled": str(env.get("TRACING", "true")).lower() in ("1", "true", "yes"),
+            "jsonl": Path(env.get("TRACE_JSONL_FILE") or trace_dir / "traces.jsonl"),
+            "prom": Path(env.get("TRACE_PROM_FILE") or trace_dir / "autotube.prom"),
+        }
+    return _SETTINGS
+
+
+# ---------------------------
+# Prometheus textfile
+# ---------------------------
+class _Metrics:
+    """Per-span-name histograms and counters, cumulative for the process"""
+
+    BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}   # span name -> {"count", "sum", "failures", "bytes", "retries", "cache_hits", "buckets"}
+
+    def observe(self, s: Span):
+        with self._lock:
+            series = self._series.setdefault(s.name, {
+                "count": 0, "sum": 0.0, "failures": 0, "bytes": 0, "retries": 0, "cache_hits": 0,
+                "buckets": [0] * len(self.BUCKETS),
+            })
+            series["count"] += 1
+            series["sum"] += s.seconds
+            series["failures"] += 0 if s.ok else 1
+            for key in ("bytes", "retries", "cache_hits"):
+                value = s.attrs.get(key)
+                if isinstance(value, (int, float)):
+                    series[key] += value
+            for index, bound in enumerate(self.BUCKETS):
+                if s.seconds <= bound:
+                    series["buckets"][index] += 1
+
+    def render(self) -> str:
+        lines = [
+            "# HELP autotube_span_seconds Duration of pipeline stages and sub-steps.",
+            "# TYPE autotube_span_seconds histogram",
+        ]
+        with self._lock:
+            series = {name: dict(values, buckets=list(values["buckets"])) for name, values in self._series.items()}
+        for name, values in sorted(series.items()):
+            for bound, hits in zip(self.BUCKETS, values["buckets"]):
+                lines.append(f'autotube_span_seconds_bucket{{span="{name}",le="{bound}"}} {hits}')
+            lines.append(f'autotube_span_seconds_bucket{{span="{name}",le="+Inf"}} {values["count"]}')
+            lines.append(f'autotube_span_seconds_sum{{span="{name}"}} {values["sum"]:.4f}')
+            lines.append(f'autotube_span_seconds_count{{span="{name}"}} {values["count"]}')
+        for metric, key, help_text in (
+            ("autotube_span_failures_total", "failures", "Spans that ended with an exception."),
+            ("autotube_span_bytes_total", "bytes", "Bytes produced or transferred by spans."),
+            ("autotube_span_retries_total", "retries", "Retries reported by spans."),
+            ("autotube_span_cache_hits_total", "cache_hits", "Cache hits reported by spans."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, values in sorted(series.items()):
+                lines.append(f'{metric}{{span="{name}"}} {values[key]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Atomically replace the textfile (the collector must never see a partial file)"""
+        if not self._series or not _settings()["enabled"]:
+            return
+        path = _settings()["prom"]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"[warning] Could not write metrics textfile: {e}")
+
+
+METRICS = _Metrics()
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    tracer = Tracer(label="demo")
+    with tracer.activate():
+        with span("script"):
+            with span("llm", model="demo") as s:
+                time.sleep(0.2)
+                s.set(ttft_seconds=0.05, chars=1200)
+        with span("images"):
+            for scene in (1, 2):
+                with span("image", scene=scene) as s:
+                    time.sleep(0.1)
+                    s.set(bytes=150_000, retries=0)
+    tracer.flush()
+    for row in tracer.timeline():
+        print(f"{row['name']:<8} {row['seconds']:6.2f}s {row['attrs']}")
+    print(METRICS.render())
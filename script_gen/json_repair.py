@@ -0,0 +1,207 @@
+#script_gen/json_repair.py module
+"""
+Tolerant JSON parsing and schema checks for LLM output.
+
+The model's JSON is usually almost right: a trailing comma, a quote inside
+a dialogue line that was not escaped, a raw newline, or an array cut off by
+max_tokens. These are fixed locally so a single defect does not cost a
+second full completion.
+"""
+
+import re
+import json
+
+SCENE_FIELDS = ("dialogue", "visualPrompt", "voiceTone")
+DEFAULT_VOICE_TONE = "neutral"
+
+
+def strip_code_fences(raw_content: str) -> str:
+    """Remove ```json fences and any prose around them"""
+    raw_content = raw_content.strip()
+    match = re.search(r'```(?:json)?\s*(.*?)(?:```|$)', raw_content, re.DOTALL)
+    if match and "```" in raw_content:
+        raw_content = match.group(1).strip()
+    return raw_content
+
+
+def _next_significant(text: str, start: int):
+    for ch in text[start:]:
+        if not ch.isspace():
+            return ch
+    return None
+
+
+def _drop_trailing_separator(out: list):
+    """Remove whitespace and a dangling ',' or ':' from the end of the output"""
+    while out and (out[-1].isspace() or out[-1] in ",:"):
+        out.pop()
+
+
+def repair_json(text: str, opener: str) -> str:
+    """
+    Rewrite almost-JSON into parseable JSON.
+
+    Starts at the first `opener` ('[' or '{') and stops when that value closes.
+    Fixes trailing commas, unescaped inner quotes (a quote is only treated as
+    closing if it is followed by , } ] : or the end), raw newlines in strings,
+    and truncation: the innermost open array is cut back to its last complete
+    element (so a half-written scene is dropped, not kept with a partial
+    dialogue), and only values outside any array are closed as they stand.
+    """
+    start = text.find(opener)
+    if start == -1:
+        return text
+
+    out = []
+    stack = []
+    last_complete = []  # per open value: output length after its last complete element ('[' only)
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+
+        if in_string:
+            if escaped:
+                out.append(ch)
+                escaped = False
+            elif ch == "\\":
+                out.append(ch)
+                escaped = True
+            elif ch == '"':
+                if _next_significant(text, i + 1) in (",", "}", "]", ":", None):
+                    in_string = False
+                    out.append(ch)
+                else:
+                    out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\r":
+                continue
+            else:
+                out.append(ch)
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "[{":
+            stack.append(ch)
+            out.append(ch)
+            last_complete.append(len(out) if ch == "[" else None)
+        elif ch in "]}":
+            _drop_trailing_separator(out)
+            if stack:
+                stack.pop()
+                last_complete.pop()
+            out.append(ch)
+            if not stack:
+                return "".join(out)
+            if stack[-1] == "[":
+                last_complete[-1] = len(out)
+        elif ch == "," and stack and stack[-1] == "[":
+            _drop_trailing_separator(out)
+            last_complete[-1] = len(out)
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    # Input ended before the value closed
+    arrays = [depth for depth, opened in enumerate(stack) if opened == "["]
+    if arrays:
+        depth = arrays[-1]
+        out = out[:last_complete[depth]]
+        stack = stack[:depth + 1]
+        _drop_trailing_separator(out)
+    else:
+        if in_string:
+            if escaped:
+                out.pop()
+            out.append('"')
+        _drop_trailing_separator(out)
+        # An object cut off right after a key has nothing to pair it with
+        if stack and stack[-1] == "{" and out and out[-1] == '"':
+            tail = "".join(out)
+            key_start = tail.rfind('"', 0, len(tail) - 1)
+            if key_start != -1 and tail[:key_start].rstrip().endswith(("{", ",")):
+                out = list(tail[:key_start])
+                _drop_trailing_separator(out)
+
+    for opened in reversed(stack):
+        out.append("]" if opened == "[" else "}")
+    return "".join(out)
+
+
+def parse_lenient(raw_content: str, opener: str):
+    """
+    Parse LLM output as JSON, repairing it if the strict parse fails.
+    Returns (value, was_repaired); raises json.JSONDecodeError if unrecoverable.
+    """
+    cleaned = strip_code_fences(raw_content)
+    closer = "]" if opener == "[" else "}"
+    first, last = cleaned.find(opener), cleaned.rfind(closer)
+    if first != -1 and last > first:
+        try:
+            return json.loads(cleaned[first:last + 1]), False
+        except json.JSONDecodeError:
+            pass
+    return json.loads(repair_json(cleaned, opener)), True
+
+
+# ---------------------------
+# Schemas
+# ---------------------------
+def validate_scene(scene):
+    """
+    Check one scene, filling in what can be derived locally.
+    Returns the fixed scene, or None if it needs to be regenerated.
+    """
+    if not isinstance(scene, dict):
+        return None
+
+    fixed = {key: value for key, value in scene.items()}
+    for field in SCENE_FIELDS:
+        value = fixed.get(field)
+        fixed[field] = value.strip() if isinstance(value, str) else ""
+
+    if not fixed["dialogue"]:
+        return None
+    if not fixed["voiceTone"]:
+        fixed["voiceTone"] = DEFAULT_VOICE_TONE
+    if not fixed["visualPrompt"]:
+        fixed["visualPrompt"] = f"Cinematic, richly lit scene illustrating: {fixed['dialogue']}"
+    return fixed
+
+
+def validate_scenes(scenes, expected_count=None):
+    """
+    Validate a scene list.
+    Returns (scenes with None for invalid entries, 0-based indexes to regenerate).
+    """
+    if not isinstance(scenes, list):
+        scenes = []
+    checked = [validate_scene(scene) for scene in scenes]
+    if expected_count and len(checked) > expected_count:
+        checked = checked[:expected_count]
+    if expected_count and len(checked) < expected_count:
+        checked += [None] * (expected_count - len(checked))
+    missing = [index for index, scene in enumerate(checked) if scene is None]
+    return checked, missing
+
+
+def missing_title_fields(result):
+    """Fields of a title/description result that are absent or empty"""
+    if not isinstance(result, dict):
+        return ["title", "description"]
+    return [
+        field for field in ("title", "description")
+        if not isinstance(result.get(field), str) or not result[field].strip()
+    ]
+
+
+def expected_scene_count(user_input: str, scene_seconds=5):
+    """Scene count implied by 'A 30-second video ...' prompts, or None"""
+    match = re.search(r'(\d+)\s*-?\s*second', user_input)
+    if not match:
+        return None
+    return max(1, int(match.group(1)) // scene_seconds)
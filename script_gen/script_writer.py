@@ -1,14 +1,26 @@
 #script_writer.py module
 
 import os
-from groq import Groq
+import sys
+import time
+import asyncio
+from groq import Groq, AsyncGroq
 from dotenv import dotenv_values
 import json
-import re
 from pathlib import Path
 
+# Allow running this file directly (python script_gen/script_writer.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts.speech_rate import SpeechRateModel
+from script_gen.json_repair import (
+    parse_lenient, validate_scene, validate_scenes, missing_title_fields, expected_scene_count
+)
+from script_gen.token_budget import TokenBudget
+from scheduler.tracing import span
+from scheduler.profiling import profiled
+
 class VideoScriptGenerator:
-    def __init__(self):
+    def __init__(self, video_number=None):
         # ---------------------------
         # Locate main folder and .env
         # ---------------------------
@@ -32,10 +44,16 @@ class VideoScriptGenerator:
         self.client = Groq(api_key=self.GROQ_API_KEY)
         print("[info] Groq client initialized successfully")
 
+        # Batch limits for generate_scripts()
+        self.max_concurrent_requests = int(self.env.get("GROQ_MAX_CONCURRENT", "4"))
+        self.tokens_per_minute = int(self.env.get("GROQ_TOKENS_PER_MINUTE", "12000"))
+
         # ---------------------------
-        # Fetch current video number
+        # Fetch current video number (or use the one a pipeline job reserved)
         # ---------------------------
-        if counter_path.exists():
+        if video_number is not None:
+            self.video_number = str(video_number)
+        elif counter_path.exists():
             with open(counter_path, "r") as f:
                 counter_value = f.read().strip()
                 self.video_number = counter_value if counter_value.isdigit() else "1"
@@ -58,6 +76,19 @@ class VideoScriptGenerator:
         print(f"[info] Video scripts will be saved to: {self.script_output_dir}")
         print(f"[info] Title & description will be saved to: {self.title_desc_dir}")
 
+        # ---------------------------
+        # Duration planning
+        # ---------------------------
+        # Same voice/rate/backend settings AudioGenerator uses, so dialogue can
+        # be checked against the calibrated speaking pace before any TTS runs
+        self.model = "llama-3.3-70b-versatile"
+        self.tts_backend = self.env.get("TTS_BACKEND", "edge")
+        self.tts_voice = self.env.get("STORY_VOICE", "en-GB-RyanNeural")
+        self.tts_rate = self.env.get("STORY_RATE", "-5%")
+        self.scene_seconds = 5
+        self.duration_tolerance = 0.2  # accept scenes within ±20% of scene_seconds
+        self.speech_rate = SpeechRateModel(self.main_folder)
+
         # System prompt for structured video script
         self.system_prompt = """
         You are a professional screenwriter and visual director. Generate a structured short video script in strict JSON format.
@@ -68,7 +99,7 @@ class VideoScriptGenerator:
         - Return EXACTLY the number of segments equal to (total_duration / 5) — no more, no less.
 
         Each segment must contain:
-        1. dialogue: A spoken line of around **15-20 words**, crafted to fit approximately 5 seconds of natural speech. The dialogue should sound smooth, cinematic, and contextually meaningful.
+        1. dialogue: A spoken line of around **{word_range} words**, crafted to fit approximately 5 seconds of natural speech. The dialogue should sound smooth, cinematic, and contextually meaningful.
         2. visualPrompt: A **richly descriptive** scene description matching the dialogue. Include atmosphere, lighting, setting details, emotions, environment, and visual elements that can guide an AI image generator (e.g., "cinematic sunset over a quiet city skyline with soft warm lighting and clouds drifting").
         3. voiceTone: The emotional tone or delivery style (e.g., "calm", "excited", "mysterious", "inspirational", "sad", etc.).
 
@@ -125,79 +156,459 @@ class VideoScriptGenerator:
         }
         """
 
-    def _extract_json_from_response(self, raw_content: str) -> str:
-        """Extract JSON from response, handling markdown code blocks and extra text."""
-        raw_content = raw_content.strip()
-        
-        # Remove markdown code blocks if present
-        if "```json" in raw_content:
-            # Extract content between ```json and ```
-            match = re.search(r'```json\s*(.*?)\s*```', raw_content, re.DOTALL)
-            if match:
-                raw_content = match.group(1).strip()
-        elif "```" in raw_content:
-            # Extract content between ``` and ```
-            match = re.search(r'```\s*(.*?)\s*```', raw_content, re.DOTALL)
-            if match:
-                raw_content = match.group(1).strip()
-        
-        # Find the first [ and last ] to extract just the JSON array
-        first_bracket = raw_content.find('[')
-        last_bracket = raw_content.rfind(']')
-        
-        if first_bracket != -1 and last_bracket != -1:
-            raw_content = raw_content[first_bracket:last_bracket + 1]
-        
-        return raw_content
+        # Follow-up prompt used to fix only the scenes whose dialogue misses the time budget
+        self.duration_fix_prompt = """
+        You rewrite narration lines for a short video so they fit a time budget.
+        For every item you receive, rewrite "dialogue" to contain between "min_words" and "max_words" words.
+        Keep the meaning, tone and flow with the surrounding story. Do not add new facts.
 
-    def generate_video_script(self, user_input: str):
-        """Generate structured video script using Groq API."""
-        if not user_input.strip():
-            return []
+        Return ONLY a valid JSON array of objects with the fields "index" and "dialogue".
+        No markdown, no code blocks, no explanations.
+        """
 
-        try:
+        # Compact prompt for generate_script_and_metadata(): scenes + metadata in one call
+        self.combined_prompt = """
+        You write short narrated videos and their YouTube metadata. The user gives the duration in seconds.
+        Return ONLY a JSON object:
+        {"scenes": [{"dialogue": str, "visualPrompt": str, "voiceTone": str}], "title": str, "description": str, "tags": [str]}
+
+        scenes: exactly (duration / 5) items, one per 5 seconds.
+        - dialogue: around {word_range} spoken words, smooth and cinematic.
+        - visualPrompt: rich image prompt (setting, lighting, mood, composition).
+        - voiceTone: one word such as calm, excited, mysterious, hopeful.
+        title: 50-70 characters, high-CTR, power words or curiosity gap, at most 2 emojis.
+        description: 150-200 words, hook first line, overview, call-to-action, 3-5 hashtags at the end.
+        tags: 5-10 short search tags without '#'.
+        """
+
+        # Follow-up prompt used to regenerate only scenes that were missing or invalid
+        self.scene_fix_prompt = """
+        You are completing a structured short video script. You receive the original request,
+        the scenes that already exist (by index) and the indexes of the scenes that are missing.
+        Write ONLY the missing scenes so they continue the story between their neighbours.
+
+        Each scene must contain:
+        - dialogue: a spoken line of around {word_range} words
+        - visualPrompt: a richly descriptive image prompt matching the dialogue
+        - voiceTone: the emotional delivery (e.g. "calm", "excited")
+
+        Return ONLY a valid JSON array of objects with the fields "index", "dialogue", "visualPrompt" and "voiceTone".
+        No markdown, no code blocks, no explanations.
+        """
+
+        # Follow-up prompt used when only some title/description fields are missing
+        self.title_fix_prompt = """
+        Write YouTube metadata for the video described by the user.
+        title: eye-catching, 50-70 characters, power words, at most 2 emojis.
+        description: 150-200 words with a strong hook, overview, call-to-action and 3-5 hashtags at the end.
+
+        Return ONLY a valid JSON object containing exactly these fields: {fields}
+        No markdown, no code blocks, no explanations.
+        """
+
+    def _complete(self, system_prompt: str, user_input: str, max_tokens: int, json_mode=False) -> str:
+        """
+        Run one chat completion and return the collected text.
+        json_mode asks for a JSON object response; Groq does not stream in that mode.
+        """
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        with span("llm", model=self.model, max_tokens=max_tokens, json_mode=json_mode) as trace:
+            started = time.perf_counter()
             completion = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
+                model=self.model,
                 messages=[
-                    {"role": "system", "content": self.system_prompt},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_input}
                 ],
                 temperature=0.7,
-                max_tokens=2048,
-                stream=True
+                max_tokens=max_tokens,
+                stream=not json_mode,
+                **extra
             )
+            if json_mode:
+                # Not streamed, so the first token arrives with the whole answer
+                raw_content = completion.choices[0].message.content or ""
+                usage = getattr(completion, "usage", None)
+                trace.set(ttft_seconds=round(time.perf_counter() - started, 3), chars=len(raw_content),
+                          tokens=getattr(usage, "total_tokens", None))
+                return raw_content
 
-            # Stream and collect content
             raw_content = ""
             for chunk in completion:
                 if chunk.choices[0].delta.content:
+                    if not raw_content:
+                        trace.set(ttft_seconds=round(time.perf_counter() - started, 3))
                     raw_content += chunk.choices[0].delta.content
+            trace.set(chars=len(raw_content))
+            return raw_content
+
+    @profiled("script")
+    def generate_video_script(self, user_input: str):
+        """Generate structured video script using Groq API."""
+        if not user_input.strip():
+            return []
+
+        raw_content = ""
+        try:
+            # Ask for the word count the calibrated voice actually speaks in 5 seconds
+            min_words, max_words = self._word_budget()
+            system_prompt = self.system_prompt.replace("{word_range}", f"{min_words}-{max_words}")
+            raw_content = self._complete(system_prompt, user_input, max_tokens=2048)
 
-            # Extract clean JSON
-            clean_json = self._extract_json_from_response(raw_content)
-            
             # Debug: Print what we're trying to parse
-            print(f"[debug] Attempting to parse JSON (first 200 chars): {clean_json[:200]}...")
+            print(f"[debug] Attempting to parse JSON (first 200 chars): {raw_content.strip()[:200]}...")
 
-            # Parse JSON
-            scenes = json.loads(clean_json)
-            
-            # Validate it's a list
-            if not isinstance(scenes, list):
-                print("[error] Response is not a JSON array")
+            scenes = self._parse_scenes(raw_content, user_input)
+            if not scenes:
+                print(f"[error] Raw content received:\n{raw_content}")
                 return []
-            
+
             print(f"[success] Parsed {len(scenes)} scenes successfully")
-            return scenes
+            return self.plan_scene_durations(scenes)
 
-        except json.JSONDecodeError as e:
-            print(f"[error] JSON parsing failed: {e}")
-            print(f"[error] Raw content received:\n{raw_content}")
-            return []
         except Exception as e:
             print(f"[error] Failed to generate video script: {e}")
             return []
 
+    def _parse_scenes(self, raw_content: str, user_input: str):
+        """
+        Parse and validate the scene array, repairing malformed JSON locally
+        and regenerating only the scenes that are missing or unusable.
+        """
+        try:
+            parsed, repaired = parse_lenient(raw_content, "[")
+            if repaired:
+                print("[info] Repaired malformed script JSON locally")
+        except json.JSONDecodeError as e:
+            print(f"[error] JSON parsing failed: {e}")
+            parsed = []
+
+        scenes, missing = validate_scenes(parsed, expected_scene_count(user_input, self.scene_seconds))
+        if missing:
+            scenes = self._regenerate_scenes(user_input, scenes, missing)
+        return [scene for scene in scenes if scene]
+
+    def _scene_fix_request(self, user_input: str, scenes, missing):
+        """(system prompt, user input, max tokens) asking for only the scenes at the `missing` indexes"""
+        print(f"[info] Requesting {len(missing)} missing/invalid scene(s): {[i + 1 for i in missing]}")
+
+        min_words, max_words = self._word_budget()
+        prompt = self.scene_fix_prompt.replace("{word_range}", f"{min_words}-{max_words}")
+        request = {
+            "request": user_input,
+            "existing": [
+                {"index": index, "dialogue": scene["dialogue"]}
+                for index, scene in enumerate(scenes) if scene
+            ],
+            "missing": missing
+        }
+        return prompt, json.dumps(request, ensure_ascii=False), 256 * len(missing)
+
+    @staticmethod
+    def _apply_scene_fix(scenes, missing, raw_content):
+        items, _ = parse_lenient(raw_content, "[")
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or item.get("index") not in missing:
+                continue
+            scene = validate_scene({field: item.get(field) for field in ("dialogue", "visualPrompt", "voiceTone")})
+            if scene:
+                scenes[item["index"]] = scene
+
+    @staticmethod
+    def _report_missing(scenes):
+        still_missing = [index + 1 for index, scene in enumerate(scenes) if scene is None]
+        if still_missing:
+            print(f"[warning] Scenes still missing after repair: {still_missing}")
+        return scenes
+
+    def _regenerate_scenes(self, user_input: str, scenes, missing):
+        """Ask for only the scenes at the `missing` indexes and slot them in"""
+        try:
+            raw_content = self._complete(*self._scene_fix_request(user_input, scenes, missing))
+            self._apply_scene_fix(scenes, missing, raw_content)
+        except Exception as e:
+            print(f"[warning] Could not regenerate missing scenes: {e}")
+        return self._report_missing(scenes)
+
+    async def _aregenerate_scenes(self, user_input: str, scenes, missing, complete):
+        """_regenerate_scenes() through an async `complete` (see generate_scripts)"""
+        try:
+            raw_content = await complete(*self._scene_fix_request(user_input, scenes, missing))
+            self._apply_scene_fix(scenes, missing, raw_content)
+        except Exception as e:
+            print(f"[warning] Could not regenerate missing scenes: {e}")
+        return self._report_missing(scenes)
+
+    @profiled("script")
+    def generate_script_and_metadata(self, user_input: str):
+        """
+        Generate scenes, title, description and tags in one structured call.
+
+        Returns {"scenes": [...], "title": str, "description": str, "tags": [...]}
+        or None if no usable scenes came back. Missing pieces are repaired or
+        requested individually, exactly as in the two separate methods; a
+        title or description that still could not be generated is None.
+        """
+        if not user_input.strip():
+            return None
+
+        try:
+            raw_content = self._complete(self._combined_prompt(), user_input, max_tokens=3072, json_mode=True)
+        except Exception as e:
+            print(f"[error] Failed to generate script and metadata: {e}")
+            return None
+        return self._finish_combined(user_input, raw_content)
+
+    def _combined_prompt(self):
+        min_words, max_words = self._word_budget()
+        return self.combined_prompt.replace("{word_range}", f"{min_words}-{max_words}")
+
+    def _parse_combined(self, user_input: str, raw_content: str):
+        """(parsed object, scenes with None for unusable ones, missing indexes) of a combined response"""
+        try:
+            result, repaired = parse_lenient(raw_content, "{")
+            if repaired:
+                print("[info] Repaired malformed combined JSON locally")
+        except json.JSONDecodeError as e:
+            print(f"[error] JSON parsing failed for combined response: {e}")
+            result = {}
+        result = result if isinstance(result, dict) else {}
+
+        scenes, missing = validate_scenes(
+            result.get("scenes"), expected_scene_count(user_input, self.scene_seconds)
+        )
+        return result, scenes, missing
+
+    @staticmethod
+    def _combined_result(result, scenes, metadata):
+        tags = result.get("tags")
+        tags = [str(tag).strip().lstrip("#") for tag in tags if str(tag).strip()] if isinstance(tags, list) else []
+
+        print(f"[success] Generated {len(scenes)} scenes, title and description in one call")
+        # Fields still missing after _fill_title_fields stay None so callers fall back to the topic
+        return {
+            "scenes": scenes,
+            "title": metadata.get("title") or None,
+            "description": metadata.get("description") or None,
+            "tags": tags
+        }
+
+    def _finish_combined(self, user_input: str, raw_content: str):
+        """Parse and complete a combined response (see generate_script_and_metadata)"""
+        try:
+            result, scenes, missing = self._parse_combined(user_input, raw_content)
+            if missing:
+                scenes = self._regenerate_scenes(user_input, scenes, missing)
+            scenes = [scene for scene in scenes if scene]
+            if not scenes:
+                print(f"[error] Raw content received:\n{raw_content}")
+                return None
+
+            metadata = self._fill_title_fields(user_input, {
+                "title": result.get("title"),
+                "description": result.get("description")
+            })
+            return self._combined_result(result, self.plan_scene_durations(scenes), metadata)
+
+        except Exception as e:
+            print(f"[error] Failed to generate script and metadata: {e}")
+            return None
+
+    async def _afinish_combined(self, user_input: str, raw_content: str, complete):
+        """_finish_combined() with every follow-up request sent through an async `complete`"""
+        try:
+            result, scenes, missing = self._parse_combined(user_input, raw_content)
+            if missing:
+                scenes = await self._aregenerate_scenes(user_input, scenes, missing, complete)
+            scenes = [scene for scene in scenes if scene]
+            if not scenes:
+                print(f"[error] Raw content received:\n{raw_content}")
+                return None
+
+            metadata = await self._afill_title_fields(user_input, {
+                "title": result.get("title"),
+                "description": result.get("description")
+            }, complete)
+            return self._combined_result(result, await self._aplan_scene_durations(scenes, complete), metadata)
+
+        except Exception as e:
+            print(f"[error] Failed to generate script and metadata: {e}")
+            return None
+
+    # ---------------------------
+    # Batch generation
+    # ---------------------------
+    async def _acomplete(self, system_prompt: str, user_input: str, max_tokens: int, budget: TokenBudget,
+                         client, json_mode=True):
+        """Async completion on the batch's AsyncGroq `client`, within `budget`"""
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        reservation = await budget.acquire(TokenBudget.estimate(system_prompt, user_input, max_tokens=max_tokens))
+        with span("llm", model=self.model, max_tokens=max_tokens, json_mode=json_mode) as trace:
+            started = time.perf_counter()
+            completion = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_input}
+                ],
+                temperature=0.7,
+                max_tokens=max_tokens,
+                **extra
+            )
+            usage = getattr(completion, "usage", None)
+            TokenBudget.settle(reservation, getattr(usage, "total_tokens", None))
+            raw_content = completion.choices[0].message.content or ""
+            trace.set(ttft_seconds=round(time.perf_counter() - started, 3), chars=len(raw_content),
+                      tokens=getattr(usage, "total_tokens", None))
+            return raw_content
+
+    async def generate_scripts(self, topics, max_concurrent=None, tokens_per_minute=None):
+        """
+        Generate scripts and metadata for many prompts concurrently.
+
+        Async generator yielding (user_input, result) as each request finishes,
+        not in input order; result is the generate_script_and_metadata() dict
+        or None. Every request of the batch, including the follow-ups that
+        repair scenes, fill metadata or fix durations, goes through one
+        AsyncGroq client and is limited to max_concurrent in flight and
+        tokens_per_minute overall (defaults from GROQ_MAX_CONCURRENT /
+        GROQ_TOKENS_PER_MINUTE). Nothing is saved; the caller decides which
+        video folder each result belongs to.
+
+        Example:
+            async for topic, result in generator.generate_scripts(prompts):
+                ...
+        """
+        semaphore = asyncio.Semaphore(max_concurrent or self.max_concurrent_requests)
+        budget = TokenBudget(tokens_per_minute or self.tokens_per_minute)
+        system_prompt = self._combined_prompt()
+        # A client per batch: its connection pool belongs to this event loop
+        client = AsyncGroq(api_key=self.GROQ_API_KEY)
+
+        async def complete(prompt, user_input, max_tokens, json_mode=False):
+            async with semaphore:
+                return await self._acomplete(prompt, user_input, max_tokens, budget, client, json_mode)
+
+        async def run(user_input):
+            if not user_input.strip():
+                return user_input, None
+            try:
+                raw_content = await complete(system_prompt, user_input, 3072, json_mode=True)
+            except Exception as e:
+                print(f"[error] Script request failed for '{user_input[:60]}': {e}")
+                return user_input, None
+            return user_input, await self._afinish_combined(user_input, raw_content, complete)
+
+        tasks = [asyncio.create_task(run(user_input)) for user_input in topics]
+        print(f"[info] Generating {len(tasks)} scripts concurrently...")
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave requests running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+
+    # ---------------------------
+    # Duration planning
+    # ---------------------------
+    def _word_budget(self):
+        """(min words, max words) a scene's dialogue may have at the calibrated pace"""
+        low = self.scene_seconds * (1 - self.duration_tolerance)
+        high = self.scene_seconds * (1 + self.duration_tolerance)
+        args = (self.tts_backend, self.tts_voice, self.tts_rate)
+        return self.speech_rate.target_words(low, *args), self.speech_rate.target_words(high, *args)
+
+    def find_off_budget_scenes(self, scenes):
+        """Indexes (0-based) of scenes whose dialogue misses the word budget"""
+        min_words, max_words = self._word_budget()
+        off_budget = []
+        for index, scene in enumerate(scenes):
+            words = self.speech_rate.count_words(scene.get("dialogue", ""))
+            if not min_words <= words <= max_words:
+                off_budget.append(index)
+        return off_budget
+
+    @staticmethod
+    def _trim_to_words(text: str, max_words: int) -> str:
+        """Cut text to max_words, preferring to end on a sentence or clause boundary"""
+        words = text.split()
+        if len(words) <= max_words:
+            return text
+        trimmed = words[:max_words]
+        for end in range(len(trimmed), max(0, len(trimmed) // 2), -1):
+            if trimmed[end - 1][-1:] in ".!?,;:":
+                trimmed = trimmed[:end]
+                break
+        return " ".join(trimmed).rstrip(",;:") + ("" if trimmed[-1][-1:] in ".!?" else ".")
+
+    def _duration_fix_request(self, scenes, off_budget):
+        """(system prompt, user input, max tokens) asking to rewrite the off-budget scenes"""
+        min_words, max_words = self._word_budget()
+        print(f"[info] {len(off_budget)} scene(s) outside {min_words}-{max_words} words, requesting rewrites...")
+
+        request = [
+            {
+                "index": index,
+                "dialogue": scenes[index].get("dialogue", ""),
+                "min_words": min_words,
+                "max_words": max_words
+            }
+            for index in off_budget
+        ]
+        return self.duration_fix_prompt, json.dumps(request, ensure_ascii=False), 1024
+
+    @staticmethod
+    def _apply_duration_fix(scenes, off_budget, raw_content):
+        items, _ = parse_lenient(raw_content, "[")
+        for item in items if isinstance(items, list) else []:
+            index = item.get("index") if isinstance(item, dict) else None
+            if index in off_budget and isinstance(item.get("dialogue"), str) and item["dialogue"].strip():
+                scenes[index]["dialogue"] = item["dialogue"].strip()
+
+    def _trim_off_budget(self, scenes):
+        """Trim dialogue that is still too long after the rewrite"""
+        _, max_words = self._word_budget()
+        for index in self.find_off_budget_scenes(scenes):
+            dialogue = scenes[index].get("dialogue", "")
+            if self.speech_rate.count_words(dialogue) > max_words:
+                scenes[index]["dialogue"] = self._trim_to_words(dialogue, max_words)
+            else:
+                print(f"[warning] Scene {index + 1} is still short ({self.speech_rate.count_words(dialogue)} words)")
+        return scenes
+
+    def plan_scene_durations(self, scenes):
+        """
+        Check every scene's dialogue against the words-per-second model and
+        rewrite only the off-budget scenes with one small follow-up request.
+        Anything still too long afterwards is trimmed locally.
+        """
+        off_budget = self.find_off_budget_scenes(scenes)
+        if not off_budget:
+            return scenes
+
+        try:
+            raw_content = self._complete(*self._duration_fix_request(scenes, off_budget))
+            self._apply_duration_fix(scenes, off_budget, raw_content)
+        except Exception as e:
+            print(f"[warning] Duration rewrite failed, trimming locally: {e}")
+        return self._trim_off_budget(scenes)
+
+    async def _aplan_scene_durations(self, scenes, complete):
+        """plan_scene_durations() through an async `complete` (see generate_scripts)"""
+        off_budget = self.find_off_budget_scenes(scenes)
+        if not off_budget:
+            return scenes
+
+        try:
+            raw_content = await complete(*self._duration_fix_request(scenes, off_budget))
+            self._apply_duration_fix(scenes, off_budget, raw_content)
+        except Exception as e:
+            print(f"[warning] Duration rewrite failed, trimming locally: {e}")
+        return self._trim_off_budget(scenes)
+
     def save_script(self, scenes, filename="video_script.json"):
         """Save generated scenes to JSON inside the folder for the current video."""
         filepath = self.script_output_dir / filename
@@ -212,66 +623,76 @@ class VideoScriptGenerator:
         if not user_input.strip():
             return None
 
+        raw_content = ""
         try:
-            completion = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": self.title_desc_prompt},
-                    {"role": "user", "content": user_input}
-                ],
-                temperature=0.7,
-                max_tokens=1024,
-                stream=True
-            )
+            raw_content = self._complete(self.title_desc_prompt, user_input, max_tokens=1024)
 
-            # Stream and collect content
-            raw_content = ""
-            for chunk in completion:
-                if chunk.choices[0].delta.content:
-                    raw_content += chunk.choices[0].delta.content
+            try:
+                result, repaired = parse_lenient(raw_content, "{")
+                if repaired:
+                    print("[info] Repaired malformed title/description JSON locally")
+            except json.JSONDecodeError as e:
+                print(f"[error] JSON parsing failed for title/description: {e}")
+                print(f"[error] Raw content received:\n{raw_content}")
+                result = {}
 
-            # Clean the response
-            raw_content = raw_content.strip()
-            
-            # Remove markdown code blocks if present
-            if "```json" in raw_content:
-                match = re.search(r'```json\s*(.*?)\s*```', raw_content, re.DOTALL)
-                if match:
-                    raw_content = match.group(1).strip()
-            elif "```" in raw_content:
-                match = re.search(r'```\s*(.*?)\s*```', raw_content, re.DOTALL)
-                if match:
-                    raw_content = match.group(1).strip()
-            
-            # Find JSON object
-            first_brace = raw_content.find('{')
-            last_brace = raw_content.rfind('}')
-            
-            if first_brace != -1 and last_brace != -1:
-                raw_content = raw_content[first_brace:last_brace + 1]
-            
-            # Parse JSON
-            result = json.loads(raw_content)
+            result = self._fill_title_fields(user_input, result)
             
             # Validate structure
-            if not isinstance(result, dict) or "title" not in result or "description" not in result:
+            if missing_title_fields(result):
                 print("[error] Response missing title or description")
                 return None
             
             print(f"[success] Generated title and description")
             return result
 
-        except json.JSONDecodeError as e:
-            print(f"[error] JSON parsing failed for title/description: {e}")
-            print(f"[error] Raw content received:\n{raw_content}")
-            return None
         except Exception as e:
             print(f"[error] Failed to generate title and description: {e}")
             return None
 
+    def _title_fix_request(self, user_input: str, missing):
+        """(system prompt, user input, max tokens) asking for only the `missing` metadata fields"""
+        print(f"[info] Requesting missing metadata field(s): {missing}")
+        return self.title_fix_prompt.replace("{fields}", ", ".join(missing)), user_input, 512
+
+    @staticmethod
+    def _apply_title_fix(result, missing, raw_content):
+        extra, _ = parse_lenient(raw_content, "{")
+        for field in missing:
+            if isinstance(extra, dict) and isinstance(extra.get(field), str) and extra[field].strip():
+                result[field] = extra[field].strip()
+
+    def _fill_title_fields(self, user_input: str, result):
+        """Request only the title/description fields that are missing or empty"""
+        result = result if isinstance(result, dict) else {}
+        missing = missing_title_fields(result)
+        if not missing:
+            return result
+
+        try:
+            raw_content = self._complete(*self._title_fix_request(user_input, missing))
+            self._apply_title_fix(result, missing, raw_content)
+        except Exception as e:
+            print(f"[warning] Could not fill missing metadata: {e}")
+        return result
+
+    async def _afill_title_fields(self, user_input: str, result, complete):
+        """_fill_title_fields() through an async `complete` (see generate_scripts)"""
+        result = result if isinstance(result, dict) else {}
+        missing = missing_title_fields(result)
+        if not missing:
+            return result
+
+        try:
+            raw_content = await complete(*self._title_fix_request(user_input, missing))
+            self._apply_title_fix(result, missing, raw_content)
+        except Exception as e:
+            print(f"[warning] Could not fill missing metadata: {e}")
+        return result
+
     # NEW METHOD: Save title and description
     def save_title_and_description(self, title_desc_data):
-        """Save title and description to separate text files."""
+        """Save title and description (and tags, if present) to separate text files."""
         if not title_desc_data:
             print("[warning] No title/description data to save")
             return None
@@ -288,8 +709,18 @@ class VideoScriptGenerator:
             with open(desc_path, "w", encoding="utf-8") as f:
                 f.write(title_desc_data["description"])
             print(f"[info] Description saved at: {desc_path}")
+
+            paths = {"title_path": title_path, "description_path": desc_path}
+
+            # Save tags, one per line
+            if title_desc_data.get("tags"):
+                tags_path = self.title_desc_dir / "tags.txt"
+                with open(tags_path, "w", encoding="utf-8") as f:
+                    f.write("\n".join(title_desc_data["tags"]))
+                print(f"[info] Tags saved at: {tags_path}")
+                paths["tags_path"] = tags_path
             
-            return {"title_path": title_path, "description_path": desc_path}
+            return paths
         
         except Exception as e:
             print(f"[error] Failed to save title/description: {e}")
@@ -0,0 +1,56 @@
+#script_gen/token_budget.py module
+
+import time
+import asyncio
+from collections import deque
+
+
+class TokenBudget:
+    """
+    Sliding one-minute token budget for concurrent LLM requests.
+
+    Each request reserves its estimated cost (prompt + max_tokens) before it
+    is sent and waits while the last 60 seconds of reservations would exceed
+    tokens_per_minute. Once the response reports real usage the reservation
+    is corrected, so the conservative estimate only holds capacity while the
+    request is in flight.
+    """
+
+    WINDOW = 60.0
+    POLL = 1.0
+
+    def __init__(self, tokens_per_minute: int):
+        self.tokens_per_minute = max(1, int(tokens_per_minute))
+        self._spent = deque()   # [timestamp, tokens] entries inside the window
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def estimate(*texts, max_tokens=0) -> int:
+        """Rough token count: ~4 characters per token, plus the completion cap"""
+        return sum(len(text) for text in texts) // 4 + max_tokens
+
+    def _used(self, now: float) -> int:
+        while self._spent and now - self._spent[0][0] >= self.WINDOW:
+            self._spent.popleft()
+        return sum(tokens for _, tokens in self._spent)
+
+    async def acquire(self, tokens: int):
+        """Wait until `tokens` fit in the window; returns the reservation entry"""
+        # A request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._used(now) + tokens <= self.tokens_per_minute:
+                    entry = [now, tokens]
+                    self._spent.append(entry)
+                    return entry
+                # Re-check at least every POLL seconds: settle() may free capacity
+                # before the oldest reservation leaves the window
+                await asyncio.sleep(min(self.POLL, max(0.05, self.WINDOW - (now - self._spent[0][0]))))
+
+    @staticmethod
+    def settle(entry, actual_tokens):
+        """Replace a reservation's estimate with the tokens actually used"""
+        if entry is not None and actual_tokens:
+            entry[1] = actual_tokens
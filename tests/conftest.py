@@ -0,0 +1,7 @@
+#tests/conftest.py module
+
+import sys
+from pathlib import Path
+
+# The top-level packages are plain directories; make them importable from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
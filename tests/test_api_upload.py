@@ -0,0 +1,86 @@
+#tests/test_api_upload.py module
+
+import os
+import hashlib
+
+import pytest
+
+from uploader import api_upload
+from uploader.api_upload import ResumableUploader
+from uploader.fake_upload_server import FakeUploadServer
+
+CHUNK = 256 * 1024
+
+
+@pytest.fixture
+def sample(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(os.urandom(6 * CHUNK + 123))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(api_upload.time, "sleep", lambda seconds: None)
+
+
+def make_uploader(server, tmp_path, **kwargs):
+    uploader = ResumableUploader(chunk_size=CHUNK, upload_url=server.url, token_url=f"{server.url}/token",
+                                 credentials={"refresh_token": "x"}, **kwargs)
+    # Keep session files and step timings out of the repo's data/
+    uploader.base_dir = tmp_path
+    uploader.session_dir = tmp_path / ".upload_sessions"
+    uploader.session_dir.mkdir(exist_ok=True)
+    return uploader
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_resumes_after_injected_failures(sample, tmp_path):
+    with FakeUploadServer(fail_every=3) as server:
+        video_id = make_uploader(server, tmp_path).upload(sample, {"title": "Test"})
+
+    assert video_id in server.videos
+    assert sha256(server.videos[video_id]["data"]) == sha256(sample.read_bytes())
+    assert len(server.sessions) == 1
+    # Every 3rd chunk failed half-way, so some chunks were sent more than once
+    assert server.chunk_requests > 7
+    assert not list((tmp_path / ".upload_sessions").glob("*.json"))
+
+
+def test_resumes_saved_session_after_restart(sample, tmp_path, capsys):
+    with FakeUploadServer(fail_every=3) as server:
+        # First process gives up at the first failure and keeps its session file
+        assert make_uploader(server, tmp_path, max_retries=0).upload(sample, {"title": "Test"}) is None
+        assert len(list((tmp_path / ".upload_sessions").glob("*.json"))) == 1
+        (session,) = server.sessions.values()
+        received = len(session["data"])
+        assert 0 < received < sample.stat().st_size
+
+        # A fresh uploader (new process) picks the same session up from disk
+        server.fail_every = 0
+        video_id = make_uploader(server, tmp_path).upload(sample, {"title": "Test"})
+
+    assert "Resuming upload" in capsys.readouterr().out
+    assert len(server.sessions) == 1
+    assert sha256(server.videos[video_id]["data"]) == sha256(sample.read_bytes())
+    assert not list((tmp_path / ".upload_sessions").glob("*.json"))
+
+
+def test_failed_status_query_counts_as_retry(sample, tmp_path):
+    # Chunk 3 fails, then the first two status queries fail too: three failures in a row
+    with FakeUploadServer(fail_every=3, fail_status_queries=2) as server:
+        video_id = make_uploader(server, tmp_path, max_retries=3).upload(sample, {"title": "Test"})
+
+    assert server.failed_status_queries == 2
+    assert sha256(server.videos[video_id]["data"]) == sha256(sample.read_bytes())
+
+
+def test_failed_status_queries_respect_max_retries(sample, tmp_path):
+    with FakeUploadServer(fail_every=3, fail_status_queries=5) as server:
+        assert make_uploader(server, tmp_path, max_retries=2).upload(sample, {"title": "Test"}) is None
+
+    assert server.failed_status_queries == 2
+    assert not server.videos
@@ -0,0 +1,118 @@
+#tests/test_image_fetcher.py module
+
+import io
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+from PIL import Image
+
+from images import image_fetcher
+from images.image_fetcher import ImageGenerator
+
+
+def encode(format_name) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA" if format_name == "PNG" else "RGB", (64, 64), (200, 40, 40)).save(buffer, format_name)
+    return buffer.getvalue()
+
+
+class ScriptedImageServer:
+    """
+    Local HTTP server answering each request with the next (status, headers,
+    body) from `responses`; the last one repeats.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                server.requests += 1
+                status, headers, payload = server.responses.pop(0) if len(server.responses) > 1 else server.responses[0]
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(image_fetcher.time, "sleep", recorded.append)
+    return recorded
+
+
+@pytest.fixture
+def make_generator(monkeypatch, tmp_path):
+    monkeypatch.setenv("HuggingFaceAPIKey", "x")
+    # ImageGenerator finds .env and data/ from the module's location; moving
+    # that into tmp_path keeps the repo's data/ and .env out of the tests
+    monkeypatch.setattr(image_fetcher, "__file__", str(tmp_path / "images" / "image_fetcher.py"))
+
+    def make(server):
+        monkeypatch.setenv("HF_API_URL", server.url)
+        return ImageGenerator(video_number="1")
+
+    return make
+
+
+@pytest.mark.parametrize("format_name", ["PNG", "WEBP"])
+def test_non_jpeg_response_is_saved_as_jpeg(make_generator, delays, format_name, tmp_path):
+    with ScriptedImageServer([(200, {"Content-Type": f"image/{format_name.lower()}"}, encode(format_name))]) as server:
+        path = make_generator(server).generate_image("a red square", 1)
+
+    assert path == tmp_path / "data" / "1" / "generated_image" / "1.jpg"
+    with Image.open(path) as img:
+        assert img.format == "JPEG"
+        assert img.mode == "RGB"
+
+
+def test_retry_honours_retry_after(make_generator, delays):
+    responses = [
+        (503, {"Retry-After": "7"}, b'{"error": "Model is currently loading"}'),
+        (429, {}, b'{"error": "rate limited"}'),
+        (200, {"Content-Type": "image/jpeg"}, encode("JPEG")),
+    ]
+    with ScriptedImageServer(responses) as server:
+        path = make_generator(server).generate_image("a red square", 2)
+
+    assert path is not None and server.requests == 3
+    assert delays[0] == 7
+    # No Retry-After on the second failure: exponential backoff with jitter
+    assert 2 <= delays[1] <= 3
+
+
+def test_gives_up_after_max_retries(make_generator, delays):
+    with ScriptedImageServer([(500, {}, b"{}")]) as server:
+        assert make_generator(server).generate_image("a red square", 3) is None
+
+    assert server.requests == ImageGenerator.MAX_RETRIES + 1
+    assert len(delays) == ImageGenerator.MAX_RETRIES
@@ -0,0 +1,38 @@
+#tests/test_job_scheduler.py module
+
+from script_gen.script_writer import VideoScriptGenerator
+from scheduler.job_scheduler import generate_script
+
+SCENES = [{"dialogue": "A quiet machine wakes up.", "visualPrompt": "Lab at dawn", "voiceTone": "calm"}]
+
+
+class FakeGenerator:
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.saved = {}
+
+    def generate_script_and_metadata(self, user_prompt):
+        return VideoScriptGenerator._combined_result({"tags": ["tech"]}, SCENES, self.metadata)
+
+    def save_script(self, scenes):
+        self.saved["script"] = scenes
+
+    def save_title_and_description(self, title_desc):
+        self.saved["title_description"] = title_desc
+
+
+def test_missing_title_falls_back_instead_of_saving_empty_fields():
+    generator = FakeGenerator({"title": "", "description": "A short look at a new machine."})
+    scenes, title_desc = generate_script(generator, "A 5-second video about machines")
+
+    assert scenes == SCENES
+    assert title_desc is None
+    assert "title_description" not in generator.saved
+
+
+def test_complete_metadata_is_saved():
+    generator = FakeGenerator({"title": "The Quiet Machine", "description": "A short look."})
+    _, title_desc = generate_script(generator, "A 5-second video about machines")
+
+    assert title_desc == {"title": "The Quiet Machine", "description": "A short look.", "tags": ["tech"]}
+    assert generator.saved["title_description"] == title_desc
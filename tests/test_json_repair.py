@@ -0,0 +1,38 @@
+#tests/test_json_repair.py module
+
+import json
+
+from script_gen.json_repair import repair_json, parse_lenient, validate_scenes
+
+
+def test_truncated_nested_scene_is_dropped():
+    text = '{"scenes": [{"dialogue": "a"}, {"dialogue": "tru'
+    assert json.loads(repair_json(text, "{")) == {"scenes": [{"dialogue": "a"}]}
+
+
+def test_truncated_top_level_array_keeps_complete_elements():
+    text = '[{"dialogue": "a"}, {"dialogue": "b"}, {"dialogue": "tru'
+    assert json.loads(repair_json(text, "[")) == [{"dialogue": "a"}, {"dialogue": "b"}]
+
+
+def test_truncated_first_element_leaves_empty_array():
+    assert json.loads(repair_json('{"scenes": [{"dialogue": "tru', "{")) == {"scenes": []}
+
+
+def test_truncated_object_outside_arrays_is_closed():
+    assert json.loads(repair_json('{"title": "x", "description": "cut', "{")) == {
+        "title": "x", "description": "cut",
+    }
+
+
+def test_truncated_scene_is_regenerated_not_kept():
+    value, repaired = parse_lenient('```json\n{"scenes": [{"dialogue": "a"}, {"dialogue": "tru', "{")
+    scenes, missing = validate_scenes(value["scenes"], expected_count=2)
+    assert repaired
+    assert scenes[0]["dialogue"] == "a"
+    assert missing == [1]
+
+
+def test_trailing_commas_and_inner_quotes():
+    text = '[{"dialogue": "he said "hi" twice", "tags": [1, 2,],},]'
+    assert json.loads(repair_json(text, "[")) == [{"dialogue": 'he said "hi" twice', "tags": [1, 2]}]
@@ -0,0 +1,34 @@
+#tests/test_tts_backends.py module
+
+import pytest
+
+from tts.tts_backends import LocalTTSBackend, TTSRouter
+
+
+@pytest.mark.parametrize("rate, speed", [
+    ("-5%", 0.95), ("+20%", 1.2), ("0%", 1.0), ("+12.5%", 1.125), ("-100%", LocalTTSBackend.MIN_SPEED),
+    ("fast", 1.0), (None, 1.0),
+])
+def test_speed_from_rate(rate, speed):
+    assert LocalTTSBackend.speed_from_rate(rate) == pytest.approx(speed)
+
+
+def test_router_passes_story_rate_to_local_backend(monkeypatch):
+    monkeypatch.setattr(LocalTTSBackend, "is_available", classmethod(lambda cls, engine, model=None: True))
+    router = TTSRouter.from_env({"TTS_BACKEND": "local"}, "en-US-GuyNeural", "-10%", "+0Hz")
+    assert isinstance(router.primary, LocalTTSBackend)
+    assert router.primary.speed == pytest.approx(0.9)
+    assert router.fallback.rate == "-10%"
+
+
+def test_shared_router_is_reused_per_settings(monkeypatch):
+    monkeypatch.setattr(TTSRouter, "_shared", {})
+    env = {"TTS_BACKEND": "edge", "TTS_FALLBACK": "none"}
+    router = TTSRouter.shared(env, "en-GB-RyanNeural", "-5%", "-2Hz")
+    assert TTSRouter.shared(dict(env), "en-GB-RyanNeural", "-5%", "-2Hz") is router
+    assert TTSRouter.shared(env, "en-GB-RyanNeural", "+10%", "-2Hz") is not router
+
+    closed = []
+    monkeypatch.setattr(TTSRouter, "close", lambda self: closed.append(self))
+    TTSRouter.close_shared()
+    assert len(closed) == 2 and not TTSRouter._shared
@@ -0,0 +1,40 @@
+#tests/test_tts_engine.py module
+
+import numpy as np
+import pytest
+
+from tts.narration import NarrationBuilder
+from tts.tts_engine import AudioGenerator
+
+RATE = 24000
+
+
+def sentence_clip(builder, speech_seconds, silence_seconds=0.4):
+    """MP3 with silence on both sides of a tone, like a TTS response with padding"""
+    t = np.arange(int(speech_seconds * RATE)) / RATE
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    silence = np.zeros(int(silence_seconds * RATE), dtype=np.float32)
+    return builder.encode_mp3(np.concatenate([silence, tone, silence]))
+
+
+def test_split_sentences_merges_short_pieces():
+    assert AudioGenerator.split_sentences("Dr. Smith arrived late. The lab was quiet tonight.") == [
+        "Dr. Smith arrived late.", "The lab was quiet tonight.",
+    ]
+
+
+def test_splice_trims_sentence_edges_and_shifts_words():
+    builder = NarrationBuilder(sample_rate=RATE)
+    results = [
+        (sentence_clip(builder, 1.0), [{"text": "one", "start": 0.4, "end": 1.4}], 1.8, "edge"),
+        (sentence_clip(builder, 0.5), [{"text": "two", "start": 0.4, "end": 0.9}], 1.3, "edge"),
+    ]
+    audio, words, duration = AudioGenerator._splice(results)
+
+    keep = 2 * NarrationBuilder.KEEP_SILENCE
+    # Only KEEP_SILENCE of each clip's padding survives, not 0.8s per sentence
+    assert duration == pytest.approx(1.0 + 0.5 + 2 * keep, abs=0.05)
+    assert words[0]["start"] == pytest.approx(NarrationBuilder.KEEP_SILENCE, abs=0.05)
+    assert words[1]["start"] == pytest.approx(1.0 + keep + NarrationBuilder.KEEP_SILENCE, abs=0.05)
+    # One MP3 stream: its decoded length matches the reported duration
+    assert len(builder.decode(audio)) / RATE == pytest.approx(duration, abs=0.08)
@@ -0,0 +1,21 @@
+#tests/test_upload_queue.py module
+
+from uploader.upload_queue import UploadQueue
+
+
+def test_finished_uploads_do_not_accumulate(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadQueue, "MAX_RESULTS", 3)
+    queue = UploadQueue(engine="selenium")
+    try:
+        for i in range(5):
+            # Missing files fail straight away, without starting a browser
+            queue.submit(tmp_path / f"missing_{i}.mp4", {"title": "t"}).result(timeout=10)
+        queue.submit(tmp_path / "missing_last.mp4", {"title": "t"})
+
+        assert len(queue._futures) <= 1
+        results = queue.join(timeout=10)
+    finally:
+        queue.close()
+
+    assert [path.rsplit("missing_", 1)[1] for path, _ in results] == ["3.mp4", "4.mp4", "last.mp4"]
+    assert queue.failed == 6
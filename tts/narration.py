@@ -0,0 +1,237 @@
+#tts/narration.py module
+
+import json
+import wave
+import subprocess
+import numpy as np
+import imageio_ffmpeg
+from pathlib import Path
+
+
+class NarrationBuilder:
+    """
+    Turns the per-scene TTS files into one narration track.
+
+    Every scene MP3 (a file, or bytes piped to ffmpeg) is decoded once into a
+    NumPy buffer, loudness-normalized to a common target, joined with short
+    equal-power crossfades and written as a single WAV. A JSON table of scene
+    boundaries is written next to it so the video stage can time each image
+    against the joined track. mix() does the same without touching disk.
+    """
+
+    SAMPLE_RATE = 44100
+    TARGET_DBFS = -18.0       # gated RMS target for every scene
+    PEAK_CEILING = 0.97       # ~ -0.3 dBFS, gain is capped so peaks stay below
+    CROSSFADE = 0.06          # seconds of overlap between consecutive scenes
+    BLOCK = 0.4               # gating block length in seconds (as in BS.1770)
+    ABSOLUTE_GATE_DBFS = -70.0
+    RELATIVE_GATE_DB = -10.0
+    SILENCE_DBFS = -50.0      # edges quieter than this are trimmed by trim_silence()
+    KEEP_SILENCE = 0.08       # seconds of edge silence kept, so joined sentences still breathe
+
+    def __init__(self, sample_rate=None, target_dbfs=None, crossfade=None):
+        self.sample_rate = sample_rate or self.SAMPLE_RATE
+        self.target_dbfs = self.TARGET_DBFS if target_dbfs is None else target_dbfs
+        self.crossfade = self.CROSSFADE if crossfade is None else crossfade
+        self.ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+
+    # ---------------------------
+    # Decoding
+    # ---------------------------
+    def decode(self, source) -> np.ndarray:
+        """Decode an audio file (or encoded bytes) to mono float32 PCM at self.sample_rate"""
+        in_memory = isinstance(source, (bytes, bytearray))
+        cmd = [
+            self.ffmpeg, "-v", "error", "-i", "pipe:0" if in_memory else str(source),
+            "-f", "f32le", "-ac", "1", "-ar", str(self.sample_rate), "-"
+        ]
+        result = subprocess.run(cmd, input=bytes(source) if in_memory else None, capture_output=True)
+        if result.returncode != 0:
+            name = f"{len(source)} in-memory bytes" if in_memory else source
+            raise RuntimeError(f"ffmpeg could not decode {name}: {result.stderr.decode(errors='ignore').strip()}")
+        return np.frombuffer(result.stdout, dtype=np.float32).copy()
+
+    def encode_mp3(self, samples: np.ndarray) -> bytes:
+        """Mono float PCM as one MP3 in the edge-tts format (24 kHz, 48 kbps mono)"""
+        cmd = [
+            self.ffmpeg, "-v", "error", "-f", "s16le", "-ar", str(self.sample_rate), "-ac", "1", "-i", "pipe:0",
+            "-ac", "1", "-ar", "24000", "-b:a", "48k", "-f", "mp3", "-"
+        ]
+        result = subprocess.run(cmd, input=self.to_pcm16(samples), capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg could not encode MP3: {result.stderr.decode(errors='ignore').strip()}")
+        return result.stdout
+
+    def trim_silence(self, samples: np.ndarray):
+        """
+        Cut leading and trailing silence (including encoder padding), keeping
+        KEEP_SILENCE seconds on each side. Returns (samples, seconds removed
+        from the start).
+        """
+        loud = np.flatnonzero(np.abs(samples) > 10 ** (self.SILENCE_DBFS / 20))
+        if loud.size == 0:
+            return samples[:0], 0.0
+        keep = int(self.KEEP_SILENCE * self.sample_rate)
+        start = max(0, int(loud[0]) - keep)
+        end = min(len(samples), int(loud[-1]) + 1 + keep)
+        return samples[start:end], start / self.sample_rate
+
+    # ---------------------------
+    # Loudness
+    # ---------------------------
+    def gated_rms_dbfs(self, samples: np.ndarray) -> float:
+        """
+        Loudness of a buffer as gated RMS in dBFS: the signal is cut into
+        blocks, near-silent blocks are dropped (absolute gate) and so are blocks
+        well below the remaining average (relative gate).
+        """
+        block = int(self.BLOCK * self.sample_rate)
+        n_blocks = len(samples) // block
+        if n_blocks == 0:
+            power = np.array([np.mean(samples ** 2)]) if len(samples) else np.array([0.0])
+        else:
+            power = np.mean(samples[:n_blocks * block].reshape(n_blocks, block) ** 2, axis=1)
+
+        with np.errstate(divide="ignore"):
+            levels = 10 * np.log10(power)
+        kept = power[levels > self.ABSOLUTE_GATE_DBFS]
+        if kept.size == 0:
+            return float("-inf")
+
+        relative_gate = 10 * np.log10(np.mean(kept)) + self.RELATIVE_GATE_DB
+        kept = kept[10 * np.log10(kept) > relative_gate]
+        return float(10 * np.log10(np.mean(kept)))
+
+    def normalize(self, samples: np.ndarray) -> np.ndarray:
+        """Scale a buffer to target_dbfs, limited so the peak stays under PEAK_CEILING"""
+        level = self.gated_rms_dbfs(samples)
+        if not np.isfinite(level):
+            return samples
+        gain = 10 ** ((self.target_dbfs - level) / 20)
+        peak = float(np.max(np.abs(samples))) if len(samples) else 0.0
+        if peak > 0:
+            gain = min(gain, self.PEAK_CEILING / peak)
+        return samples * np.float32(gain)
+
+    # ---------------------------
+    # Joining
+    # ---------------------------
+    def join(self, buffers):
+        """
+        Join buffers with equal-power crossfades.
+        Returns (track, offsets) where offsets[i] is buffer i's start sample.
+        """
+        fade = int(self.crossfade * self.sample_rate)
+        if buffers:
+            fade = min([fade] + [len(b) // 2 for b in buffers])
+
+        total = sum(len(b) for b in buffers) - fade * max(0, len(buffers) - 1)
+        track = np.zeros(max(0, total), dtype=np.float32)
+
+        t = np.linspace(0, np.pi / 2, fade, dtype=np.float32)
+        fade_in, fade_out = np.sin(t), np.cos(t)
+
+        offsets = []
+        cursor = 0
+        for index, buf in enumerate(buffers):
+            buf = buf.copy()
+            if fade and index > 0:
+                buf[:fade] *= fade_in
+            if fade and index < len(buffers) - 1:
+                buf[-fade:] *= fade_out
+            track[cursor:cursor + len(buf)] += buf
+            offsets.append(cursor)
+            cursor += len(buf) - fade
+        return track, offsets
+
+    @staticmethod
+    def to_pcm16(track: np.ndarray) -> bytes:
+        """Mono float PCM as raw 16-bit little-endian samples (ffmpeg -f s16le)"""
+        return (np.clip(track, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+    def write_wav(self, track: np.ndarray, path: Path):
+        """Write mono float PCM as 16-bit WAV"""
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(self.to_pcm16(track))
+
+    # ---------------------------
+    # Main entry point
+    # ---------------------------
+    def mix(self, scene_audio):
+        """
+        Decode, normalize and join without writing anything.
+
+        Args:
+            scene_audio: list of (scene number, audio path or MP3 bytes) in playback order
+
+        Returns:
+            (track, boundaries) - mono float32 PCM and the table build() returns
+        """
+        buffers = [self.normalize(self.decode(source)) for _, source in scene_audio]
+        track, offsets = self.join(buffers)
+
+        sr = float(self.sample_rate)
+        boundaries = [
+            {
+                "scene": number,
+                "start": round(offset / sr, 4),
+                "end": round((offset + len(buf)) / sr, 4),
+                "duration": round(len(buf) / sr, 4),
+            }
+            for (number, _), offset, buf in zip(scene_audio, offsets, buffers)
+        ]
+        return track, boundaries
+
+    def build(self, scene_audio, output_path: Path):
+        """
+        Build the narration track.
+
+        Args:
+            scene_audio: list of (scene number, audio path or MP3 bytes) in playback order
+            output_path: where to write the WAV; the boundary table is written
+                         next to it with a .json suffix
+
+        Returns:
+            List of {"scene", "start", "end", "duration"} dicts in seconds.
+            "end" is where the scene's own audio stops; the next scene starts
+            CROSSFADE seconds earlier.
+        """
+        output_path = Path(output_path)
+        print(f"[info] Building narration track from {len(scene_audio)} scenes...")
+
+        track, boundaries = self.mix(scene_audio)
+        self.write_wav(track, output_path)
+        sr = float(self.sample_rate)
+
+        table_path = output_path.with_suffix(".json")
+        with open(table_path, "w", encoding="utf-8") as f:
+            json.dump(boundaries, f, indent=4)
+
+        print(f"[success] Narration saved at: {output_path} ({len(track) / sr:.2f}s)")
+        return boundaries
+
+    @staticmethod
+    def display_durations(boundaries):
+        """How long each scene's image should stay on screen for the joined track"""
+        durations = {}
+        for index, entry in enumerate(boundaries):
+            if index + 1 < len(boundaries):
+                durations[entry["scene"]] = boundaries[index + 1]["start"] - entry["start"]
+            else:
+                durations[entry["scene"]] = entry["end"] - entry["start"]
+        return durations
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    audio_dir = Path(__file__).parent.parent / "data" / "1" / "generated_audio"
+    files = sorted(audio_dir.glob("*.mp3"), key=lambda p: int(p.stem))
+    builder = NarrationBuilder()
+    table = builder.build([(int(p.stem), p) for p in files], audio_dir / "narration.wav")
+    for row in table:
+        print(row)
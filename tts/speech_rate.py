@@ -0,0 +1,88 @@
+#tts/speech_rate.py module
+
+import os
+import json
+import tempfile
+from pathlib import Path
+
+
+class SpeechRateModel:
+    """
+    Words-per-second model for each TTS backend/voice/rate combination.
+
+    VideoScriptGenerator uses it to check dialogue length before any TTS or
+    image work is done; AudioGenerator feeds it the measured duration of every
+    clip it produces so the estimate tracks the real voice.
+    """
+
+    DEFAULT_WPS = 2.6     # typical neural narration at +0%
+    SMOOTHING = 0.2       # weight of each new measurement
+    MIN_WORDS = 3         # shorter clips are mostly silence padding, ignore them
+
+    def __init__(self, base_dir: Path):
+        self.path = Path(base_dir) / "data" / "speech_rate_model.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.model = self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                print(f"[warning] {self.path} is corrupted, starting a fresh speech rate model")
+        return {}
+
+    def _save(self):
+        # Several workers may calibrate at once; replace the file atomically
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.model, f, indent=4)
+        os.replace(tmp_name, self.path)
+
+    @staticmethod
+    def key(backend, voice, rate):
+        return f"{backend}|{voice}|{rate}"
+
+    @staticmethod
+    def count_words(text: str) -> int:
+        return len(text.split())
+
+    def words_per_second(self, backend, voice, rate) -> float:
+        entry = self.model.get(self.key(backend, voice, rate))
+        if entry:
+            return entry["wps"]
+        # Uncalibrated: scale the default by the edge-tts style rate ("-5%")
+        try:
+            factor = 1 + float(str(rate).strip().rstrip("%")) / 100
+        except ValueError:
+            factor = 1.0
+        return self.DEFAULT_WPS * factor
+
+    def estimate_seconds(self, text, backend, voice, rate) -> float:
+        return self.count_words(text) / self.words_per_second(backend, voice, rate)
+
+    def target_words(self, seconds, backend, voice, rate) -> int:
+        return max(1, round(seconds * self.words_per_second(backend, voice, rate)))
+
+    def observe(self, text, duration, backend, voice, rate):
+        """Fold one measured clip duration into the model"""
+        words = self.count_words(text)
+        if words < self.MIN_WORDS or duration <= 0:
+            return
+
+        # Re-read first so measurements from other processes are not lost
+        self.model = self._load()
+        key = self.key(backend, voice, rate)
+        measured = words / duration
+        entry = self.model.get(key)
+        if entry:
+            entry["wps"] = round((1 - self.SMOOTHING) * entry["wps"] + self.SMOOTHING * measured, 4)
+            entry["samples"] += 1
+        else:
+            self.model[key] = {"wps": round(measured, 4), "samples": 1}
+
+        try:
+            self._save()
+        except OSError as e:
+            print(f"[warning] Could not save speech rate model: {e}")
@@ -0,0 +1,356 @@
+#tts/tts_backends.py module
+
+import re
+import time
+import wave
+import atexit
+import shutil
+import asyncio
+import threading
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import edge_tts
+import imageio_ffmpeg
+
+# edge-tts always returns audio-24khz-48kbitrate-mono-mp3 (constant bitrate),
+# so a chunk's duration follows directly from its size
+MP3_BYTES_PER_SECOND = 48_000 // 8
+
+
+class TTSBackend:
+    """
+    Interface every TTS engine implements.
+
+    synthesize() returns (mp3 bytes, word timings, duration in seconds), where
+    word timings are [{"text", "start", "end"}] relative to the audio start.
+    """
+
+    name = "base"
+
+    async def synthesize(self, text: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# ---------------------------
+# Microsoft edge-tts (network)
+# ---------------------------
+class EdgeTTSBackend(TTSBackend):
+    name = "edge"
+
+    def __init__(self, voice, rate, pitch):
+        self.voice = voice
+        self.rate = rate
+        self.pitch = pitch
+
+    async def synthesize(self, text: str):
+        communicate = edge_tts.Communicate(
+            text,
+            self.voice,
+            rate=self.rate,
+            pitch=self.pitch,
+            boundary="WordBoundary"
+        )
+
+        audio = bytearray()
+        words = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+            elif chunk["type"] == "WordBoundary":
+                # offset/duration are in 100ns ticks
+                start = chunk["offset"] / 10_000_000
+                words.append({
+                    "text": chunk["text"],
+                    "start": round(start, 3),
+                    "end": round(start + chunk["duration"] / 10_000_000, 3)
+                })
+        return bytes(audio), words, len(audio) / MP3_BYTES_PER_SECOND
+
+
+# ---------------------------
+# Local offline engines (process pool)
+# ---------------------------
+# Per-worker state, filled by _init_local_worker in each pool process
+_worker = {}
+
+
+def _init_local_worker(engine, voice, model, speed):
+    """Runs once per pool process: resolve binaries and load the Piper model"""
+    _worker.update(engine=engine, voice=voice, model=model, speed=speed,
+                   ffmpeg=imageio_ffmpeg.get_ffmpeg_exe(), piper_voice=None)
+    if engine == "piper":
+        try:
+            from piper import PiperVoice
+            _worker["piper_voice"] = PiperVoice.load(model)
+        except ImportError:
+            pass  # fall back to the piper CLI per request
+
+
+def _warm_up():
+    return True
+
+
+def _local_synthesize(text):
+    """Synthesize text in a pool worker; returns (mp3 bytes, duration seconds)"""
+    engine = _worker["engine"]
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "speech.wav"
+
+        if engine == "piper" and _worker["piper_voice"] is not None:
+            piper_voice = _worker["piper_voice"]
+            with wave.open(str(wav_path), "wb") as wav_file:
+                if hasattr(piper_voice, "synthesize_wav"):
+                    # piper-tts >= 1.3 takes the speed through a SynthesisConfig
+                    from piper import SynthesisConfig
+                    piper_voice.synthesize_wav(
+                        text, wav_file, syn_config=SynthesisConfig(length_scale=1 / _worker["speed"])
+                    )
+                else:
+                    piper_voice.synthesize(text, wav_file, length_scale=1 / _worker["speed"])
+        elif engine == "piper":
+            subprocess.run(
+                ["piper", "--model", _worker["model"], "--output_file", str(wav_path),
+                 "--length_scale", str(1 / _worker["speed"])],
+                input=text.encode("utf-8"), check=True, capture_output=True
+            )
+        else:
+            words_per_minute = str(int(175 * _worker["speed"]))
+            subprocess.run(
+                ["espeak-ng", "-v", _worker["voice"], "-s", words_per_minute, "-w", str(wav_path), text],
+                check=True, capture_output=True
+            )
+
+        with wave.open(str(wav_path), "rb") as wav_file:
+            duration = wav_file.getnframes() / float(wav_file.getframerate())
+
+        # Same container as edge-tts so the rest of the pipeline is unchanged
+        result = subprocess.run(
+            [_worker["ffmpeg"], "-v", "error", "-i", str(wav_path),
+             "-ac", "1", "-ar", "24000", "-b:a", "48k", "-f", "mp3", "-"],
+            check=True, capture_output=True
+        )
+        return result.stdout, duration
+
+
+class LocalTTSBackend(TTSBackend):
+    """
+    Offline synthesis with espeak-ng or Piper, run in a warm process pool so
+    CPU-bound synthesis does not block the event loop and Piper's model is
+    loaded once per worker instead of once per request.
+
+    Neither engine reports word boundaries through its CLI, so word timings
+    are estimated by spreading the audio duration over the words by length.
+
+    speed is a multiplier on the engine's normal rate (espeak-ng -s, Piper
+    length_scale); speed_from_rate() derives it from an edge-tts rate.
+    """
+
+    name = "local"
+    MIN_SPEED = 0.25
+
+    def __init__(self, engine="espeak-ng", voice="en-gb", model=None, workers=2, speed=1.0):
+        self.engine = engine
+        self.voice = voice
+        self.model = model
+        self.workers = workers
+        self.speed = speed
+        self._pool = None
+        self._pool_lock = threading.Lock()   # jobs on several threads may share one backend
+
+    @classmethod
+    def speed_from_rate(cls, rate) -> float:
+        """Speed multiplier for an edge-tts rate such as "-5%" or "+20%" (1.0 if unparseable)"""
+        match = re.fullmatch(r"\s*([+-]?\d+(?:\.\d+)?)\s*%\s*", str(rate or ""))
+        if not match:
+            return 1.0
+        return max(cls.MIN_SPEED, 1 + float(match.group(1)) / 100)
+
+    @classmethod
+    def is_available(cls, engine, model=None):
+        if engine == "piper":
+            return bool(model) and Path(model).exists()
+        return shutil.which(engine) is not None
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_local_worker,
+                    initargs=(self.engine, self.voice, self.model, self.speed)
+                )
+                # Start every worker now so the first real request is not paying for it
+                for future in [self._pool.submit(_warm_up) for _ in range(self.workers)]:
+                    future.result()
+            return self._pool
+
+    @staticmethod
+    def estimate_words(text, duration):
+        words = text.split()
+        total_chars = sum(len(w) for w in words) or 1
+        timings = []
+        cursor = 0.0
+        for word in words:
+            length = duration * len(word) / total_chars
+            timings.append({"text": word, "start": round(cursor, 3), "end": round(cursor + length, 3)})
+            cursor += length
+        return timings
+
+    async def synthesize(self, text: str):
+        loop = asyncio.get_running_loop()
+        audio, duration = await loop.run_in_executor(self._get_pool(), _local_synthesize, text)
+        return audio, self.estimate_words(text, duration), duration
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ---------------------------
+# Selection policy
+# ---------------------------
+class TTSRouter:
+    """
+    Chooses a backend per request.
+
+    Policies:
+        primary  - use the primary backend; on error or timeout use the fallback
+        fallback - always use the fallback backend (offline runs, tests)
+        fastest  - use whichever backend has the lower measured latency per
+                   character (moving average), re-probing the slower one every
+                   PROBE_EVERY requests; failures still fall through
+    """
+
+    SMOOTHING = 0.3
+    PROBE_EVERY = 10
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, primary: TTSBackend, fallback: TTSBackend = None, policy="primary", timeout=30.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.policy = policy
+        self.timeout = timeout
+        self.latency = {}   # backend name -> seconds per character
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls, env, voice, rate, pitch):
+        """Build the router from TTS_* settings in .env"""
+        edge = EdgeTTSBackend(voice, rate, pitch)
+
+        engine = env.get("TTS_LOCAL_ENGINE", "espeak-ng")
+        model = env.get("PIPER_MODEL")
+        local = None
+        if LocalTTSBackend.is_available(engine, model):
+            local = LocalTTSBackend(
+                engine=engine,
+                voice=env.get("TTS_LOCAL_VOICE", "en-gb"),
+                model=model,
+                workers=int(env.get("TTS_LOCAL_WORKERS", "2")),
+                # Same pace as the edge voice, so swapping backends keeps scene timing
+                speed=LocalTTSBackend.speed_from_rate(rate),
+            )
+
+        if env.get("TTS_BACKEND", "edge") == "local" and local:
+            primary, fallback = local, edge
+        else:
+            primary, fallback = edge, local
+
+        if env.get("TTS_FALLBACK", "local") == "none":
+            fallback = None
+
+        policy = env.get("TTS_POLICY", "primary")
+        if policy == "fallback" and fallback is None:
+            print("[warning] TTS_POLICY=fallback but no fallback backend is available, using primary")
+            policy = "primary"
+
+        return cls(primary, fallback, policy=policy, timeout=float(env.get("TTS_TIMEOUT", "30")))
+
+    @classmethod
+    def shared(cls, env, voice, rate, pitch):
+        """
+        One router per process and settings, so every job reuses the same warm
+        local worker pool (and latency stats) instead of starting its own.
+        Shared routers are closed when the process exits.
+        """
+        key = (voice, rate, pitch, tuple(sorted(
+            (name, value) for name, value in env.items() if name.startswith(("TTS_", "PIPER_"))
+        )))
+        with cls._shared_lock:
+            if key not in cls._shared:
+                if not cls._shared:
+                    atexit.register(cls.close_shared)
+                cls._shared[key] = cls.from_env(env, voice, rate, pitch)
+            return cls._shared[key]
+
+    @classmethod
+    def close_shared(cls):
+        with cls._shared_lock:
+            routers, cls._shared = list(cls._shared.values()), {}
+        for router in routers:
+            router.close()
+
+    def _order(self):
+        """Backends to try for this request, best first"""
+        if self.fallback is None:
+            return [self.primary]
+        if self.policy == "fallback":
+            return [self.fallback]
+        if self.policy == "fastest":
+            ranked = sorted(
+                [self.primary, self.fallback],
+                key=lambda b: self.latency.get(b.name, 0.0)  # unmeasured backends get tried first
+            )
+            if self.requests % self.PROBE_EVERY == 0:
+                ranked.reverse()
+            return ranked
+        return [self.primary, self.fallback]
+
+    def _record(self, backend, seconds, chars):
+        per_char = seconds / max(1, chars)
+        previous = self.latency.get(backend.name)
+        if previous is None:
+            self.latency[backend.name] = per_char
+        else:
+            self.latency[backend.name] = (1 - self.SMOOTHING) * previous + self.SMOOTHING * per_char
+
+    async def synthesize(self, text: str):
+        """Returns (mp3 bytes, word timings, duration, backend name)"""
+        self.requests += 1
+        last_error = None
+        for backend in self._order():
+            started = time.perf_counter()
+            try:
+                audio, words, duration = await asyncio.wait_for(backend.synthesize(text), self.timeout)
+                self._record(backend, time.perf_counter() - started, len(text))
+                return audio, words, duration, backend.name
+            except Exception as e:
+                # Penalize the failing backend so "fastest" steers away from it
+                self._record(backend, self.timeout, len(text))
+                last_error = e
+                print(f"[warning] TTS backend '{backend.name}' failed: {e!r}")
+        raise RuntimeError(f"All TTS backends failed: {last_error!r}")
+
+    def close(self):
+        for backend in (self.primary, self.fallback):
+            if backend is not None:
+                backend.close()
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    backend = LocalTTSBackend()
+    audio, words, duration = asyncio.run(backend.synthesize("Testing the offline voice."))
+    print(f"{len(audio)} bytes, {duration:.2f}s, {words}")
+    backend.close()
@@ -1,16 +1,34 @@
 import os
+import re
+import json
 import asyncio
+import sys
+import numpy as np
 from dotenv import dotenv_values
-import edge_tts
 from pathlib import Path
 
+# Allow running this file directly (python tts/tts_engine.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts.tts_backends import TTSRouter
+from tts.speech_rate import SpeechRateModel
+from tts.narration import NarrationBuilder
+from scheduler.tracing import span
+
+# A sentence runs up to ., ! or ? plus any closing quotes/brackets
+SENTENCE = re.compile(r'[^.!?]+(?:[.!?]+["\')\]]*|$)')
+
+# Pieces shorter than this are merged into the previous sentence
+# ("Dr.", "Yes...") so prosody is not broken up
+MIN_SENTENCE_WORDS = 4
+
+
 class AudioGenerator:
-    def __init__(self):
+    def __init__(self, video_number=None):
         # ---------------------------
         # Setup main folder paths
         # ---------------------------
         self.BASE_DIR = Path(__file__).parent.parent
-        self.data_dir = self.BASE_DIR / "Data"
+        self.data_dir = self.BASE_DIR / "data"
 
         # Load .env
         env_path = self.BASE_DIR / ".env"
@@ -24,14 +42,29 @@ class AudioGenerator:
         self.voice = self.env.get("STORY_VOICE", "en-GB-RyanNeural")
 
         # Slightly slower rate, deeper pitch
-        self.rate = "-5%"  
+        self.rate = self.env.get("STORY_RATE", "-5%")
         self.pitch = "-2Hz"
 
-        # Path to VideoCounter.txt
+        # Synthesize long dialogue sentence by sentence, concurrently
+        self.parallel_sentences = str(self.env.get("TTS_PARALLEL_SENTENCES", "false")).lower() in ("1", "true", "yes")
+        self.max_concurrent_sentences = int(self.env.get("TTS_MAX_CONCURRENT_SENTENCES", "4"))
+
+        # edge-tts by default, with an offline engine as fallback (see tts_backends.py);
+        # shared per process so the local engine's warm pool outlives this generator
+        self.router = TTSRouter.shared(self.env, self.voice, self.rate, self.pitch)
+
+        # Measured clip durations recalibrate the script planner's estimate
+        self.speech_rate = SpeechRateModel(self.BASE_DIR)
+
+        # Path to VideoCounter.txt (ignored when a pipeline job passes its own number)
         self.counter_file = self.BASE_DIR / "video_counter.txt"
+        self.video_number = str(video_number) if video_number is not None else None
 
     def _get_video_number(self):
         """Fetch or create video counter number"""
+        if self.video_number is not None:
+            return self.video_number
+
         if not self.counter_file.exists():
             with open(self.counter_file, "w") as f:
                 f.write("1")
@@ -42,11 +75,89 @@ class AudioGenerator:
         # Default to 1 if empty or invalid
         return num if num.isdigit() else "1"
 
-    async def generate_audio(self, text: str, number: int):
-        """Generate audio for given text and save as numbered file"""
+    @staticmethod
+    def split_sentences(text: str):
+        """Split dialogue at sentence boundaries, merging very short pieces"""
+        sentences = []
+        for part in SENTENCE.findall(text.strip()):
+            part = part.strip()
+            if not part:
+                continue
+            if sentences and len(sentences[-1].split()) < MIN_SENTENCE_WORDS:
+                sentences[-1] = f"{sentences[-1]} {part}"
+            else:
+                sentences.append(part)
+        return sentences
+
+    async def _synthesize(self, text: str):
+        """
+        Synthesize one piece of text with the selected backend.
+        Returns (mp3 bytes, word timings relative to its start, duration, backend name).
+        """
+        audio, words, duration, backend = await self.router.synthesize(text)
+        if backend != self.router.primary.name:
+            print(f"[info] Used '{backend}' TTS backend")
+        return audio, words, duration, backend
+
+    async def _synthesize_sentences(self, sentences):
+        """
+        Synthesize sentences concurrently (same voice/rate/pitch for all) and
+        splice them in order. Every sentence goes through the same backend
+        order, so a scene never mixes voices unless one fails.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_sentences))
+
+        async def run(sentence):
+            async with semaphore:
+                return await self._synthesize(sentence)
+
+        results = await asyncio.gather(*(run(sentence) for sentence in sentences))
+        backends = {result[3] for result in results}
+        audio, words, duration = await asyncio.to_thread(self._splice, results)
+        backend = backends.pop() if len(backends) == 1 else None
+        return audio, words, duration, backend
+
+    @staticmethod
+    def _splice(results):
+        """
+        Join per-sentence clips into one MP3. Each clip carries its own encoder
+        padding, silence and headers, so it is decoded to PCM and its edges are
+        trimmed before the samples are joined and encoded once. Word timings
+        are shifted by the decoded length of everything before them.
+        """
+        builder = NarrationBuilder(sample_rate=24000)   # edge-tts' own rate, no resampling
+        pieces = []
+        words = []
+        offset = 0.0
+        for chunk_audio, chunk_words, _, _ in results:
+            samples, trimmed = builder.trim_silence(builder.decode(chunk_audio))
+            length = len(samples) / builder.sample_rate
+            for word in chunk_words:
+                words.append({
+                    "text": word["text"],
+                    "start": round(offset + min(length, max(0.0, word["start"] - trimmed)), 3),
+                    "end": round(offset + min(length, max(0.0, word["end"] - trimmed)), 3)
+                })
+            pieces.append(samples)
+            offset += length
+        track = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+        return builder.encode_mp3(track), words, offset
+
+    async def generate_audio(self, text: str, number: int, keep_file=True):
+        """
+        Generate audio for given text and save as numbered file.
+        Returns the audio path, or None if nothing was saved. With
+        keep_file=False the MP3 is not written; its bytes are returned for
+        the video stage to decode straight from memory.
+
+        Word timings reported by edge-tts while streaming are saved next to
+        the audio as {number}.words.json for captions/captions.py. With
+        TTS_PARALLEL_SENTENCES enabled, multi-sentence text is synthesized
+        one sentence per request, concurrently.
+        """
         if not text.strip():
             print("[warning] Empty text, skipping audio generation.")
-            return
+            return None
 
         video_num = self._get_video_number()
         audio_dir = self.data_dir / video_num / "generated_audio"
@@ -54,19 +165,39 @@ class AudioGenerator:
 
         output_path = audio_dir / f"{number}.mp3"
 
-        print(f"[info] Generating audio: {output_path.name} → {self.voice}")
+        print(f"[info] Generating audio: {output_path.name if keep_file else f'scene {number} (in memory)'} → {self.voice}")
+
+        words_path = audio_dir / f"{number}.words.json"
 
         try:
-            communicate = edge_tts.Communicate(
-                text, 
-                self.voice, 
-                rate=self.rate, 
-                pitch=self.pitch
-            )
-            await communicate.save(str(output_path))
-            print(f"[success] Saved audio at: {output_path}")
+            sentences = self.split_sentences(text) if self.parallel_sentences else [text]
+            with span("tts", scene=number, sentences=len(sentences), chars=len(text)) as trace:
+                if len(sentences) > 1:
+                    print(f"[info] Synthesizing {len(sentences)} sentences in parallel")
+                    audio, words, duration, backend = await self._synthesize_sentences(sentences)
+                else:
+                    audio, words, duration, backend = await self._synthesize(text)
+                trace.set(bytes=len(audio), audio_seconds=round(duration, 3), backend=backend or "mixed")
+
+            if keep_file:
+                with open(output_path, "wb") as audio_file:
+                    audio_file.write(audio)
+
+            with open(words_path, "w", encoding="utf-8") as f:
+                json.dump(words, f, indent=4, ensure_ascii=False)
+
+            # Mixed-backend clips say nothing about a single voice's pace
+            if backend:
+                self.speech_rate.observe(text, duration, backend, self.voice, self.rate)
+
+            if not keep_file:
+                print(f"[success] Audio for scene {number}: {len(audio) / 1024:.0f} KiB in memory ({len(words)} word timings)")
+                return audio
+            print(f"[success] Saved audio at: {output_path} ({len(words)} word timings)")
+            return output_path
         except Exception as e:
             print(f"[error] Failed to generate audio: {e}")
+            return None
 
 # ---------------------------
 # Example Usage
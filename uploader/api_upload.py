@@ -0,0 +1,326 @@
+#uploader/api_upload.py module
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import tempfile
+import requests
+from pathlib import Path
+from dotenv import dotenv_values
+
+# Allow running this file directly (python uploader/api_upload.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from uploader.upload_timing import StepTimer
+from scheduler.tracing import count
+from scheduler.profiling import profiled
+
+
+class ResumableUploader:
+    """
+    YouTube Data API uploader using the resumable upload protocol.
+
+    The file is sent in chunks (multiples of 256 KiB) with Content-Range
+    headers. After a dropped connection or a 5xx the server is asked how many
+    bytes it already has ("bytes */total" status query) and the upload
+    continues from there instead of starting over. The session URI is kept in
+    data/.upload_sessions/, so even a restarted process resumes the same
+    upload.
+
+    Credentials per channel: data/.auth/<channel>.api.json with client_id,
+    client_secret and refresh_token; the default channel falls back to
+    YOUTUBE_CLIENT_ID / YOUTUBE_CLIENT_SECRET / YOUTUBE_REFRESH_TOKEN.
+    YOUTUBE_UPLOAD_URL and YOUTUBE_TOKEN_URL can point at the local
+    FakeUploadServer (uploader/fake_upload_server.py) for testing.
+    """
+
+    CHUNK_ALIGN = 256 * 1024          # the protocol requires multiples of 256 KiB
+    SESSION_TTL = 6 * 24 * 3600       # Google keeps sessions about a week
+    REQUEST_TIMEOUT = 120
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, channel=None, chunk_size=None, upload_url=None, token_url=None,
+                 credentials=None, max_retries=None):
+        self.base_dir = Path(__file__).parent.parent
+        env_path = self.base_dir / ".env"
+        self.env = dotenv_values(env_path) if env_path.exists() else {}
+
+        self.channel = channel or self.env.get("UPLOAD_CHANNEL", "default")
+        self.upload_url = (upload_url or self.env.get("YOUTUBE_UPLOAD_URL", "https://www.googleapis.com")).rstrip("/")
+        self.token_url = token_url or self.env.get("YOUTUBE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+        self.max_retries = max_retries if max_retries is not None else int(self.env.get("UPLOAD_MAX_RETRIES", "8"))
+        self.category_id = self.env.get("YOUTUBE_CATEGORY_ID", "25")   # News & Politics
+        self.privacy = self.env.get("UPLOAD_PRIVACY", "public")
+
+        chunk_size = chunk_size or int(float(self.env.get("UPLOAD_CHUNK_MB", "8")) * 1024 * 1024)
+        self.chunk_size = max(1, round(chunk_size / self.CHUNK_ALIGN)) * self.CHUNK_ALIGN
+
+        self.credentials = credentials or self._load_credentials()
+        self.session_dir = self.base_dir / "data" / ".upload_sessions"
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+
+        self.http = requests.Session()
+        self._token = None
+        self._token_expires = 0.0
+
+    # ---------------------------
+    # Auth
+    # ---------------------------
+    def _load_credentials(self):
+        path = self.base_dir / "data" / ".auth" / f"{self.channel}.api.json"
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "client_id": self.env.get("YOUTUBE_CLIENT_ID"),
+            "client_secret": self.env.get("YOUTUBE_CLIENT_SECRET"),
+            "refresh_token": self.env.get("YOUTUBE_REFRESH_TOKEN"),
+        }
+
+    def _access_token(self):
+        """OAuth access token from the refresh token, cached until shortly before expiry"""
+        if self._token and time.time() < self._token_expires - 60:
+            return self._token
+        if not self.credentials.get("refresh_token"):
+            raise RuntimeError(f"No API credentials for channel '{self.channel}'")
+
+        response = self.http.post(self.token_url, data={
+            "grant_type": "refresh_token",
+            "client_id": self.credentials.get("client_id"),
+            "client_secret": self.credentials.get("client_secret"),
+            "refresh_token": self.credentials["refresh_token"],
+        }, timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        self._token = payload["access_token"]
+        self._token_expires = time.time() + int(payload.get("expires_in", 3600))
+        return self._token
+
+    def _headers(self, **extra):
+        headers = {"Authorization": f"Bearer {self._access_token()}"}
+        headers.update(extra)
+        return headers
+
+    # ---------------------------
+    # Upload sessions
+    # ---------------------------
+    def _session_file(self, video_path: Path) -> Path:
+        stat = video_path.stat()
+        key = hashlib.sha1(
+            f"{self.channel}|{video_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()
+        return self.session_dir / f"{key}.json"
+
+    def _save_session(self, path: Path, session_uri: str):
+        fd, tmp_name = tempfile.mkstemp(dir=self.session_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"session_uri": session_uri, "created": time.time()}, f)
+        os.replace(tmp_name, path)
+
+    def _saved_session(self, path: Path):
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if time.time() - saved.get("created", 0) > self.SESSION_TTL:
+            return None
+        return saved.get("session_uri")
+
+    def _body(self, metadata):
+        # The API rejects angle brackets in titles and titles over 100 characters
+        title = (metadata.get("title") or "Untitled").replace("<", "").replace(">", "")[:100]
+        return {
+            "snippet": {
+                "title": title,
+                "description": metadata.get("description") or "",
+                "tags": metadata.get("tags") or [],
+                "categoryId": self.category_id,
+            },
+            "status": {
+                "privacyStatus": self.privacy,
+                "selfDeclaredMadeForKids": metadata.get("made_for_kids", True),
+            },
+        }
+
+    def start_session(self, total: int, metadata) -> str:
+        """Create a resumable session and return its URI"""
+        response = self.http.post(
+            f"{self.upload_url}/upload/youtube/v3/videos",
+            params={"uploadType": "resumable", "part": "snippet,status"},
+            headers=self._headers(**{
+                "Content-Type": "application/json; charset=UTF-8",
+                "X-Upload-Content-Length": str(total),
+                "X-Upload-Content-Type": "video/mp4",
+            }),
+            data=json.dumps(self._body(metadata)),
+            timeout=self.REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.headers["Location"]
+
+    @staticmethod
+    def _next_offset(response) -> int:
+        """First byte the server still needs, from a 308 Range header"""
+        byte_range = response.headers.get("Range")
+        if not byte_range:
+            return 0
+        return int(byte_range.rsplit("-", 1)[1]) + 1
+
+    def query_offset(self, session_uri: str, total: int):
+        """
+        Ask the server how much it has. Returns (offset, finished response or
+        None); raises LookupError if the session no longer exists.
+        """
+        response = self.http.put(
+            session_uri,
+            headers=self._headers(**{"Content-Length": "0", "Content-Range": f"bytes */{total}"}),
+            timeout=self.REQUEST_TIMEOUT,
+        )
+        if response.status_code in (200, 201):
+            return total, response
+        if response.status_code == 308:
+            return self._next_offset(response), None
+        if response.status_code in (404, 410):
+            raise LookupError("upload session expired")
+        response.raise_for_status()
+        raise RuntimeError(f"Unexpected status {response.status_code} from status query")
+
+    # ---------------------------
+    # Main entry point
+    # ---------------------------
+    @profiled("upload")
+    def upload(self, video_path, metadata):
+        """Upload a file; returns the new video id, or None on failure"""
+        video_path = Path(video_path)
+        if not video_path.exists():
+            print(f"❌ Video not found: {video_path}")
+            return None
+
+        total = video_path.stat().st_size
+        session_file = self._session_file(video_path)
+        timer = StepTimer(f"{video_path.name} (api, {self.channel})")
+        video_id = None
+
+        try:
+            with timer.step("session"):
+                session_uri = self._saved_session(session_file)
+                offset = 0
+                if session_uri:
+                    try:
+                        offset, finished = self.query_offset(session_uri, total)
+                        if finished is not None:
+                            video_id = finished.json().get("id")
+                        print(f"🔁 Resuming upload at {offset / total:.0%}")
+                    except (LookupError, requests.RequestException):
+                        session_uri = None
+                if not session_uri:
+                    session_uri = self.start_session(total, metadata)
+                    self._save_session(session_file, session_uri)
+
+            if video_id is None:
+                with timer.step("transfer"):
+                    video_id = self._send(video_path, session_uri, offset, total)
+            session_file.unlink(missing_ok=True)
+            print(f"🎉 Uploaded {video_path.name} as video id {video_id}")
+            return video_id
+
+        except Exception as e:
+            # The session file is kept, so the next attempt resumes
+            print(f"❌ API upload failed for {video_path.name}: {e}")
+            return None
+
+        finally:
+            print(timer.summary())
+            timer.save(self.base_dir, video_id is not None)
+
+    def _send(self, video_path: Path, session_uri: str, offset: int, total: int):
+        failures = 0
+        last_report = -1
+        with open(video_path, "rb") as f:
+            while True:
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+                headers = {"Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{total}"}
+                if not chunk:
+                    # Nothing left to send but not confirmed yet; ask for the result
+                    headers = {"Content-Range": f"bytes */{total}"}
+
+                try:
+                    response = self.http.put(
+                        session_uri, data=chunk, headers=self._headers(**headers),
+                        timeout=self.REQUEST_TIMEOUT
+                    )
+                except requests.RequestException as e:
+                    response, error = None, e
+                else:
+                    error = None
+
+                if response is not None and response.status_code in (200, 201):
+                    return response.json().get("id")
+
+                if response is not None and response.status_code == 308:
+                    if not chunk:
+                        raise RuntimeError("server has every byte but did not finish the upload")
+                    offset = self._next_offset(response)
+                    failures = 0
+                    percent = int(100 * offset / total)
+                    if percent // 10 != last_report:
+                        last_report = percent // 10
+                        print(f"📦 {percent}% ({offset / 1e6:.1f}/{total / 1e6:.1f} MB)")
+                    continue
+
+                if response is not None and response.status_code in (404, 410):
+                    raise LookupError("upload session expired")
+                if response is not None and response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    raise RuntimeError(f"Unexpected status {response.status_code}")
+
+                # Transient failure: back off, then resume from what the server has.
+                # The link is often still down by then, so a failed status query
+                # counts as another failure and backs off again.
+                while True:
+                    failures += 1
+                    count("retries")
+                    if failures > self.max_retries:
+                        raise RuntimeError(f"Giving up after {self.max_retries} retries: {error or response.status_code}")
+                    delay = min(60, 2 ** (failures - 1)) * (1 + random.random() * 0.5)
+                    print(f"⚠️ Chunk failed ({error or response.status_code}), resuming in {delay:.1f}s...")
+                    time.sleep(delay)
+                    try:
+                        offset, finished = self.query_offset(session_uri, total)
+                        break
+                    except requests.RequestException as e:
+                        status = getattr(e.response, "status_code", None)
+                        if status is not None and status not in self.RETRY_STATUSES:
+                            raise
+                        response, error = None, e
+                if finished is not None:
+                    return finished.json().get("id")
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    # Uploads a generated file to the local fake server, dropping every 3rd chunk
+    from uploader.fake_upload_server import FakeUploadServer
+
+    with FakeUploadServer(fail_every=3) as server:
+        sample = Path(tempfile.gettempdir()) / "autotube_sample.bin"
+        sample.write_bytes(os.urandom(3 * 1024 * 1024 + 123))
+
+        uploader = ResumableUploader(
+            chunk_size=512 * 1024,
+            upload_url=server.url,
+            token_url=f"{server.url}/token",
+            credentials={"refresh_token": "fake"},
+        )
+        video_id = uploader.upload(sample, {"title": "Test upload", "description": "Resumable"})
+        stored = server.videos.get(video_id, {})
+        print(f"Server has {len(stored.get('data', b''))} of {sample.stat().st_size} bytes, "
+              f"checksum match: {stored.get('data') == sample.read_bytes()}")
@@ -0,0 +1,150 @@
+#uploader/fake_upload_server.py module
+
+import json
+import uuid
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FakeUploadServer:
+    """
+    Local stand-in for the YouTube resumable upload endpoint, for exercising
+    ResumableUploader without network access or a real channel.
+
+    Implements the token endpoint, session creation, chunked PUTs with
+    308 + Range responses and "bytes */total" status queries. Faults can be
+    injected: with fail_every=n every n-th chunk stores only half of its bytes
+    and answers 503, so the client has to query the range and resume. With
+    fail_status_queries=n the first n "bytes */total" status queries answer
+    503 as well, as they do while the link is still down.
+
+    Example:
+        with FakeUploadServer(fail_every=3) as server:
+            uploader = ResumableUploader(upload_url=server.url, token_url=f"{server.url}/token",
+                                         credentials={"refresh_token": "x"})
+            video_id = uploader.upload("video.mp4", {"title": "Test"})
+            assert server.videos[video_id]["data"] == Path("video.mp4").read_bytes()
+    """
+
+    TOKEN = "fake-access-token"
+
+    def __init__(self, host="127.0.0.1", port=0, fail_every=0, fail_status_queries=0):
+        self.fail_every = fail_every
+        self.fail_status_queries = fail_status_queries
+        self.failed_status_queries = 0
+        self.sessions = {}    # upload_id -> {"total", "metadata", "data": bytearray}
+        self.videos = {}      # video id -> {"metadata", "data": bytes}
+        self.chunk_requests = 0
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------------------------
+    # Request handling
+    # ---------------------------
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None, headers=None):
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _authorized(self):
+                if self.headers.get("Authorization") != f"Bearer {server.TOKEN}":
+                    self._reply(401, {"error": "invalid token"})
+                    return False
+                return True
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self._read_body()
+                if url.path == "/token":
+                    return self._reply(200, {"access_token": server.TOKEN, "expires_in": 3600})
+
+                if url.path == "/upload/youtube/v3/videos" and self._authorized():
+                    upload_id = uuid.uuid4().hex
+                    with server.lock:
+                        server.sessions[upload_id] = {
+                            "total": int(self.headers.get("X-Upload-Content-Length", 0)),
+                            "metadata": json.loads(body or b"{}"),
+                            "data": bytearray(),
+                        }
+                    location = f"{server.url}/upload/youtube/v3/videos?uploadType=resumable&upload_id={upload_id}"
+                    return self._reply(200, headers={"Location": location})
+
+            def do_PUT(self):
+                if not self._authorized():
+                    return
+                upload_id = parse_qs(urlparse(self.path).query).get("upload_id", [None])[0]
+                session = server.sessions.get(upload_id)
+                body = self._read_body()
+                if session is None:
+                    return self._reply(404, {"error": "no such upload"})
+
+                content_range = self.headers.get("Content-Range", "")
+                with server.lock:
+                    received = len(session["data"])
+                    if content_range.startswith("bytes */"):
+                        if server.failed_status_queries < server.fail_status_queries:
+                            server.failed_status_queries += 1
+                            return self._reply(503, {"error": "injected status query failure"})
+                        return self._status(upload_id, session)
+
+                    start = int(content_range.split()[1].split("-")[0])
+                    if start != received:
+                        # Client is out of sync; tell it what we have
+                        return self._status(upload_id, session)
+
+                    server.chunk_requests += 1
+                    if server.fail_every and server.chunk_requests % server.fail_every == 0:
+                        session["data"].extend(body[:len(body) // 2])
+                        return self._reply(503, {"error": "injected failure"})
+
+                    session["data"].extend(body)
+                    return self._status(upload_id, session)
+
+            def _status(self, upload_id, session):
+                received = len(session["data"])
+                if received >= session["total"]:
+                    video_id = f"fake-{upload_id[:11]}"
+                    server.videos[video_id] = {"metadata": session["metadata"], "data": bytes(session["data"])}
+                    return self._reply(200, {"id": video_id, **session["metadata"]})
+                headers = {"Range": f"bytes=0-{received - 1}"} if received else {}
+                return self._reply(308, headers=headers)
+
+        return Handler
@@ -0,0 +1,278 @@
+#uploader/playwright_upload.py module
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+from dotenv import dotenv_values
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+
+# Allow running this file directly (python uploader/playwright_upload.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from uploader.upload_timing import StepTimer, STEP_TIMEOUTS
+
+
+class PlaywrightUploader:
+    """
+    Async YouTube Studio uploader built on Playwright.
+
+    One Chromium process hosts an isolated browser context per upload, so
+    several finished videos can upload at once without sharing tabs or
+    cookies and without touching any local Chrome profile. Each channel's
+    login is a Playwright storage-state file in data/.auth/<channel>.json:
+    created once with login() in a visible window, then reused headless and
+    refreshed after every successful upload.
+
+    Example:
+        async with PlaywrightUploader() as uploader:
+            results = await uploader.upload_many([
+                {"video_path": "...", "title": "...", "description": "...", "channel": "main"},
+            ])
+    """
+
+    STUDIO_URL = "https://studio.youtube.com"
+
+    # Selectors (YouTube Studio custom elements)
+    CREATE_BUTTON = "#create-icon"
+    UPLOAD_MENU_ITEM = 'tp-yt-paper-item[test-id="upload-beta"]'
+    FILE_INPUT = 'input[type="file"]'
+    TEXTBOX = "div#textbox"
+    MADE_FOR_KIDS = 'tp-yt-paper-radio-button[name="VIDEO_MADE_FOR_KIDS_MFK"]'
+    NOT_MADE_FOR_KIDS = 'tp-yt-paper-radio-button[name="VIDEO_MADE_FOR_KIDS_NOT_MFK"]'
+    NEXT_BUTTON = "#next-button"
+    ENABLED_NEXT_BUTTON = '#next-button:not([aria-disabled="true"]):not([disabled])'
+    STEP_BADGE = 'ytcp-stepper #step-badge-{index}[state="active"]'
+    DONE_BUTTON = "#done-button"
+    UPLOAD_PROGRESS = "ytcp-video-upload-progress"
+    PUBLISHED_DIALOG = "ytcp-video-share-dialog, ytcp-uploads-still-processing-dialog"
+
+    LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled", "--no-sandbox", "--disable-dev-shm-usage"]
+
+    def __init__(self, headless=None, max_concurrent=None):
+        self.base_dir = Path(__file__).parent.parent
+        env_path = self.base_dir / ".env"
+        self.env = dotenv_values(env_path) if env_path.exists() else {}
+
+        # Headless by default on Linux servers, visible elsewhere unless configured
+        if headless is None:
+            configured = self.env.get("UPLOAD_HEADLESS")
+            headless = (
+                str(configured).lower() in ("1", "true", "yes")
+                if configured is not None else sys.platform.startswith("linux")
+            )
+        self.headless = headless
+        self.max_concurrent = max_concurrent or int(self.env.get("UPLOAD_MAX_CONCURRENT", "2"))
+        self.default_channel = self.env.get("UPLOAD_CHANNEL", "default")
+        self.timeout_ms = int(float(self.env.get("UPLOAD_STEP_TIMEOUT", "30")) * 1000)
+
+        self.auth_dir = self.base_dir / "data" / ".auth"
+        self.auth_dir.mkdir(parents=True, exist_ok=True)
+
+        self._playwright = None
+        self._browser = None
+
+    # ---------------------------
+    # Browser lifecycle
+    # ---------------------------
+    async def start(self):
+        """Launch the shared browser process (idempotent)"""
+        if self._browser is None:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless, args=self.LAUNCH_ARGS
+            )
+            print(f"🚀 Playwright Chromium started ({'headless' if self.headless else 'headed'})")
+        return self._browser
+
+    async def close(self):
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ---------------------------
+    # Per-channel auth state
+    # ---------------------------
+    def state_path(self, channel: str) -> Path:
+        return self.auth_dir / f"{channel}.json"
+
+    def _save_state(self, channel: str, state: dict):
+        # Concurrent uploads for one channel may refresh it at once; replace atomically
+        fd, tmp_name = tempfile.mkstemp(dir=self.auth_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_name, self.state_path(channel))
+
+    async def login(self, channel=None, timeout=300):
+        """
+        Open a visible browser, wait for the user to sign in to YouTube Studio
+        and store the session as this channel's auth state.
+        """
+        channel = channel or self.default_channel
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        browser = await self._playwright.chromium.launch(headless=False, args=self.LAUNCH_ARGS)
+        try:
+            context = await browser.new_context()
+            page = await context.new_page()
+            await page.goto(self.STUDIO_URL)
+            print(f"🔐 Sign in to the '{channel}' channel in the opened window...")
+            await page.wait_for_url("**studio.youtube.com/channel/**", timeout=timeout * 1000)
+            self._save_state(channel, await context.storage_state())
+            print(f"✅ Saved auth state: {self.state_path(channel)}")
+            return True
+        except PlaywrightTimeout:
+            print("❌ Timed out waiting for sign-in")
+            return False
+        finally:
+            await browser.close()
+
+    # ---------------------------
+    # Upload
+    # ---------------------------
+    async def upload(self, video_path, title=None, description=None, channel=None,
+                     made_for_kids=True, visibility="PUBLIC"):
+        """Upload one video in its own browser context; returns True on success"""
+        channel = channel or self.default_channel
+        state = self.state_path(channel)
+        if not state.exists():
+            print(f"❌ No auth state for channel '{channel}'. Run login('{channel}') first.")
+            return False
+
+        video_path = str(Path(video_path).resolve())
+        if not Path(video_path).exists():
+            print(f"❌ Video not found: {video_path}")
+            return False
+
+        timer = StepTimer(f"{Path(video_path).name} ({channel})")
+        success = False
+        browser = await self.start()
+        context = await browser.new_context(storage_state=str(state))
+        context.set_default_timeout(self.timeout_ms)
+        try:
+            page = await context.new_page()
+            await self._upload_flow(page, timer, video_path, title, description, made_for_kids, visibility)
+            self._save_state(channel, await context.storage_state())
+            print(f"🎉 Published: {Path(video_path).name} ({channel})")
+            success = True
+            return True
+        except Exception as e:
+            print(f"❌ Upload failed for {Path(video_path).name} ({channel}): {e}")
+            return False
+        finally:
+            await context.close()
+            print(timer.summary())
+            timer.save(self.base_dir, success)
+
+    async def _upload_flow(self, page, timer, video_path, title, description, made_for_kids, visibility):
+        with timer.step("open_studio"):
+            await page.goto(self.STUDIO_URL, wait_until="domcontentloaded")
+            if "accounts.google.com" in page.url:
+                raise RuntimeError("auth state expired, run login() again")
+
+        with timer.step("select_file"):
+            await page.locator(self.CREATE_BUTTON).click()
+            await page.locator(self.UPLOAD_MENU_ITEM).click()
+            await page.locator(self.FILE_INPUT).set_input_files(video_path)
+
+        # The details form appears while the file is still uploading
+        with timer.step("details"):
+            textboxes = page.locator(self.TEXTBOX)
+            await textboxes.first.wait_for(state="visible")
+            if title:
+                await textboxes.nth(0).fill(title)
+            if description:
+                await textboxes.nth(1).fill(description)
+            await page.locator(self.MADE_FOR_KIDS if made_for_kids else self.NOT_MADE_FOR_KIDS).click()
+
+        # Details -> Video elements -> Checks -> Visibility, one page per click:
+        # NEXT stays disabled while a page is busy (Checks), and the stepper
+        # marks the new page active once the dialog has moved on
+        with timer.step("next_steps"):
+            visibility_radio = page.locator(f'tp-yt-paper-radio-button[name="{visibility}"]')
+            for index in range(1, 4):
+                if await visibility_radio.is_visible():
+                    break
+                await page.locator(self.ENABLED_NEXT_BUTTON).click(timeout=STEP_TIMEOUTS["checks"] * 1000)
+                await page.locator(self.STEP_BADGE.format(index=index)).wait_for(
+                    state="attached", timeout=STEP_TIMEOUTS["next"] * 1000
+                )
+            await visibility_radio.click(timeout=STEP_TIMEOUTS["radio"] * 1000)
+
+        # Closing the context mid-transfer would abort it, so wait for the bytes to land
+        with timer.step("upload_transfer"):
+            try:
+                await page.wait_for_function(
+                    """(selector) => {
+                        const el = document.querySelector(selector);
+                        return el && el.textContent.trim() && !/uploading/i.test(el.textContent);
+                    }""",
+                    arg=self.UPLOAD_PROGRESS,
+                    timeout=STEP_TIMEOUTS["upload"] * 1000
+                )
+            except PlaywrightTimeout:
+                raise RuntimeError(f"upload did not finish within {STEP_TIMEOUTS['upload']}s")
+
+        with timer.step("publish"):
+            await page.locator(self.DONE_BUTTON).click()
+            await page.locator(self.PUBLISHED_DIALOG).first.wait_for(state="visible")
+
+    async def upload_many(self, items):
+        """
+        Upload several videos concurrently, at most max_concurrent at a time.
+
+        Args:
+            items: dicts with "video_path" and optional "title", "description",
+                   "channel", "made_for_kids", "visibility"
+
+        Returns:
+            List of booleans in the same order as items.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        await self.start()
+
+        async def run(item):
+            async with semaphore:
+                return await self.upload(**item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    # python uploader/playwright_upload.py login [channel]
+    # python uploader/playwright_upload.py [channel]    -> upload the latest video
+    args = sys.argv[1:]
+    uploader = PlaywrightUploader()
+
+    if args and args[0] == "login":
+        asyncio.run(uploader.login(args[1] if len(args) > 1 else None))
+    else:
+        from uploader.youtube_upload import YoutubeUploader
+
+        video_path = YoutubeUploader.get_latest_video_from_data_folder()
+        if video_path:
+            metadata = YoutubeUploader.get_video_metadata()
+
+            async def upload_latest():
+                async with uploader:
+                    return await uploader.upload(
+                        video_path, metadata["title"], metadata["description"],
+                        channel=args[0] if args else None
+                    )
+
+            print("✅ Done!" if asyncio.run(upload_latest()) else "❌ Upload failed.")
@@ -0,0 +1,267 @@
+#uploader/upload_queue.py module
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+from collections import deque
+from dotenv import dotenv_values
+
+# Allow running this file directly (python uploader/upload_queue.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scheduler.tracing import current_tracer, span
+
+
+def load_video_metadata(video_num):
+    """
+    Title, description and tags saved for data/<video_num>/title_description.
+    Kept here (not on YoutubeUploader) so queueing an upload does not import Selenium.
+    """
+    base_path = Path(__file__).parent.parent
+    video_num = str(video_num)
+    title_desc_folder = base_path / "data" / video_num / "title_description"
+    
+    metadata = {
+        "title": "Latest News Update",
+        "description": "Automated news video generated by Autotube"
+    }
+    
+    # Try to read title
+    title_file = title_desc_folder / "title.txt"
+    if title_file.exists():
+        try:
+            with open(title_file, 'r', encoding='utf-8') as f:
+                metadata["title"] = f.read().strip()
+            print(f"✅ Loaded title: {metadata['title'][:50]}...")
+        except Exception as e:
+            print(f"⚠️ Could not read title: {e}")
+    
+    # Try to read description
+    desc_file = title_desc_folder / "description.txt"
+    if desc_file.exists():
+        try:
+            with open(desc_file, 'r', encoding='utf-8') as f:
+                metadata["description"] = f.read().strip()
+            print(f"✅ Loaded description")
+        except Exception as e:
+            print(f"⚠️ Could not read description: {e}")
+    
+    # Tags (one per line) are only used by the API uploader
+    tags_file = title_desc_folder / "tags.txt"
+    if tags_file.exists():
+        with open(tags_file, 'r', encoding='utf-8') as f:
+            metadata["tags"] = [line.strip() for line in f if line.strip()]
+    
+    return metadata
+
+
+class UploadQueue:
+    """
+    Background upload stage.
+
+    Work items are explicit (video path, metadata) pairs captured when a
+    render finishes, so the pipeline can move on to the next video (and bump
+    video_counter.txt) while the upload is still running. A single worker
+    thread owns an asyncio loop and keeps the upload session warm between
+    items:
+
+        selenium   - YoutubeUploader's shared Chrome driver, one upload at a time
+        playwright - one PlaywrightUploader browser, UPLOAD_MAX_CONCURRENT
+                     uploads in parallel contexts
+        api        - ResumableUploader (YouTube Data API, chunked and
+                     resumable), UPLOAD_MAX_CONCURRENT at a time
+
+    UPLOAD_ENGINE sets the default; UPLOAD_CHANNEL_ENGINES picks one per
+    channel, e.g. "main:api,backup:playwright".
+
+    Example:
+        queue = UploadQueue.shared()
+        future = queue.submit_video("7")   # returns immediately
+        ...render the next video...
+        future.result()                    # True / False
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+    MAX_RESULTS = 50    # finished uploads kept in `results`
+
+    def __init__(self, engine=None):
+        self.base_dir = Path(__file__).parent.parent
+        env_path = self.base_dir / ".env"
+        self.env = dotenv_values(env_path) if env_path.exists() else {}
+        self.engine = engine or self.env.get("UPLOAD_ENGINE", "selenium")
+        self.channel_engines = {}
+        for pair in (self.env.get("UPLOAD_CHANNEL_ENGINES") or "").split(","):
+            if ":" in pair:
+                channel, channel_engine = pair.split(":", 1)
+                self.channel_engines[channel.strip()] = channel_engine.strip()
+        self.max_concurrent = int(self.env.get("UPLOAD_MAX_CONCURRENT", "2"))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="upload-queue", daemon=True)
+        self._thread.start()
+
+        self._uploader = None   # PlaywrightUploader, created on the worker loop
+        self._api_uploaders = {}  # channel -> ResumableUploader (keeps its OAuth token)
+        self._limits = {}       # engine -> asyncio.Semaphore, created on the worker loop
+        self._futures = []      # unfinished ones only, pruned on submit
+        self.results = deque(maxlen=self.MAX_RESULTS)  # latest (video_path, success), in completion order
+        self.failed = 0         # failed uploads since the queue started
+        print(f"📬 Upload queue started ({self.engine})")
+
+    @classmethod
+    def shared(cls, create=True):
+        """Process-wide queue, so the warm session survives Streamlit reruns"""
+        with cls._shared_lock:
+            if cls._shared is None and create:
+                cls._shared = cls()
+            return cls._shared
+
+    # ---------------------------
+    # Submitting work
+    # ---------------------------
+    def submit(self, video_path, metadata, channel=None):
+        """
+        Queue one upload and return a concurrent.futures.Future[bool].
+
+        Args:
+            video_path: finished video file
+            metadata: {"title", "description", ...}; copied, so later edits
+                      to the video folder do not change what is uploaded
+        """
+        item = {
+            "video_path": str(Path(video_path).resolve()),
+            "metadata": dict(metadata or {}),
+            "channel": channel,
+            # The upload is recorded in the submitting job's trace
+            "tracer": current_tracer(),
+        }
+        future = asyncio.run_coroutine_threadsafe(self._run(item), self._loop)
+        self._futures = [f for f in self._futures if not f.done()] + [future]
+        print(f"📥 Queued upload: {Path(video_path).name} ({self.pending} pending)")
+        return future
+
+    def submit_video(self, video_number, channel=None):
+        """Queue data/<video_number>/generated_video/final_video_<n>.mp4 with its saved metadata"""
+        video_number = str(video_number)
+        video_path = (
+            self.base_dir / "data" / video_number / "generated_video" / f"final_video_{video_number}.mp4"
+        )
+        return self.submit(video_path, load_video_metadata(video_number), channel)
+
+    def engine_for(self, channel) -> str:
+        return self.channel_engines.get(channel or self.env.get("UPLOAD_CHANNEL", "default"), self.engine)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for future in self._futures if not future.done())
+
+    # ---------------------------
+    # Worker side (runs on the queue's event loop)
+    # ---------------------------
+    async def _run(self, item):
+        tracer = item["tracer"]
+        if tracer is not None:
+            with tracer.activate():
+                success = await self._traced_run(item)
+            tracer.flush()
+        else:
+            success = await self._traced_run(item)
+
+        self.results.append((item["video_path"], success))
+        self.failed += 0 if success else 1
+        print(f"{'✅' if success else '❌'} Upload {'finished' if success else 'failed'}: "
+              f"{Path(item['video_path']).name} ({self.pending - 1} still pending)")
+        return success
+
+    async def _traced_run(self, item):
+        video_path = Path(item["video_path"])
+        with span("upload", engine=self.engine_for(item["channel"]), channel=item["channel"]) as trace:
+            if not video_path.exists():
+                print(f"❌ Upload skipped, file not found: {item['video_path']}")
+                trace.fail("file not found")
+                return False
+            trace.set(bytes=video_path.stat().st_size)
+            try:
+                success = await self._upload(item)
+            except Exception as e:
+                print(f"❌ Upload crashed for {item['video_path']}: {e}")
+                success = False
+            if not success:
+                trace.fail("upload failed")
+            return success
+
+    def _limit(self, engine):
+        if engine not in self._limits:
+            # Selenium drives one Chrome window; uploads take turns on it
+            self._limits[engine] = asyncio.Semaphore(1 if engine == "selenium" else self.max_concurrent)
+        return self._limits[engine]
+
+    async def _upload(self, item):
+        metadata = item["metadata"]
+        channel = item["channel"]
+        engine = self.engine_for(channel)
+
+        async with self._limit(engine):
+            if engine == "api":
+                from uploader.api_upload import ResumableUploader
+                if channel not in self._api_uploaders:
+                    self._api_uploaders[channel] = ResumableUploader(channel)
+                video_id = await asyncio.to_thread(
+                    self._api_uploaders[channel].upload, item["video_path"], metadata
+                )
+                return video_id is not None
+
+            if engine == "playwright":
+                if self._uploader is None:
+                    from uploader.playwright_upload import PlaywrightUploader
+                    self._uploader = PlaywrightUploader()
+                    await self._uploader.start()
+                return await self._uploader.upload(
+                    item["video_path"], metadata.get("title"), metadata.get("description"),
+                    channel=channel
+                )
+
+            from uploader.youtube_upload import YoutubeUploader
+            return await asyncio.to_thread(YoutubeUploader.upload_video, item["video_path"], metadata)
+
+    # ---------------------------
+    # Shutdown
+    # ---------------------------
+    def join(self, timeout=None):
+        """Wait for every queued upload; returns the latest MAX_RESULTS results"""
+        for future in list(self._futures):
+            future.result(timeout=timeout)
+        return list(self.results)
+
+    def close(self, wait=True):
+        """Finish (or abandon) queued uploads and release the browser session"""
+        if wait:
+            self.join()
+
+        async def shutdown():
+            if self._uploader is not None:
+                await self._uploader.close()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        if "selenium" in self._limits:
+            from uploader.youtube_upload import YoutubeUploader
+            YoutubeUploader.cleanup_driver()
+
+        with UploadQueue._shared_lock:
+            if UploadQueue._shared is self:
+                UploadQueue._shared = None
+
+
+# ---------------------------
+# Example Usage
+# ---------------------------
+if __name__ == "__main__":
+    # python uploader/upload_queue.py 3 4 5   -> upload videos 3, 4 and 5
+    queue = UploadQueue()
+    for number in sys.argv[1:]:
+        queue.submit_video(number)
+    print(queue.join())
+    queue.close()
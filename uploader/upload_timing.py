@@ -0,0 +1,75 @@
+#uploader/upload_timing.py module
+
+import json
+import time
+from pathlib import Path
+from contextlib import contextmanager
+
+# Seconds each upload step may take before it is treated as failed/skipped (both uploaders)
+STEP_TIMEOUTS = {
+    "open_studio": 30,
+    "create": 10,
+    "menu": 10,
+    "file_input": 15,
+    "details_form": 300,
+    "typing": 20,
+    "radio": 10,
+    "next": 15,
+    "checks": 60,
+    "upload": 1800,
+    "publish": 30,
+}
+
+
+class StepTimer:
+    """
+    Records how long each named step of an upload takes.
+
+    Used by both uploaders: wrap each step in `with timer.step("title"):`,
+    then save() appends one JSON line per upload to data/upload_timings.jsonl
+    so slow steps can be compared across runs.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.steps = []          # [{"step", "seconds", "ok"}] in execution order
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.steps.append({
+                "step": name,
+                "seconds": round(time.perf_counter() - started, 3),
+                "ok": ok
+            })
+
+    @property
+    def total(self) -> float:
+        return round(time.perf_counter() - self._started, 3)
+
+    def summary(self) -> str:
+        parts = [f"{s['step']}={s['seconds']:.1f}s{'' if s['ok'] else '!'}" for s in self.steps]
+        return f"⏱️ {self.label}: {self.total:.1f}s total ({', '.join(parts)})"
+
+    def save(self, base_dir: Path, success: bool):
+        path = Path(base_dir) / "data" / "upload_timings.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "label": self.label,
+            "success": success,
+            "total_seconds": self.total,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "steps": self.steps
+        }
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not save upload timings: {e}")
+        return path
@@ -1,7 +1,7 @@
 import os
+import sys
 import time
 import subprocess
-import psutil
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,12 +10,23 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
+
+# Allow running this file directly (python uploader/youtube_upload.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from uploader.upload_timing import StepTimer, STEP_TIMEOUTS
+from uploader.upload_queue import load_video_metadata
+from scheduler.profiling import profiled
 
 class YoutubeUploader:
     """YouTube upload automation module - STABLE VERSION"""
     
     _upload_driver = None
     _profile_path = r"C:\Users\KIIT\AppData\Local\Google\Chrome\User Data\SeleniumProfile"
+
+    # Seconds each upload step may take before it is treated as failed/skipped
+    STEP_TIMEOUTS = STEP_TIMEOUTS
+    last_timings = None  # StepTimer of the most recent upload
     
     @classmethod
     def get_chromedriver_path(cls):
@@ -32,8 +43,10 @@ class YoutubeUploader:
     @classmethod
     def kill_existing_chrome(cls):
         """Kill any existing Chrome processes using our profile"""
+        import psutil
+
         print("🔍 Checking for existing Chrome processes...")
-        killed = False
+        killed = []
         
         for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
             try:
@@ -43,12 +56,12 @@ class YoutubeUploader:
                         if 'SeleniumProfile' in cmdline_str:
                             print(f"   Killing Chrome PID: {proc.info['pid']}")
                             proc.kill()
-                            killed = True
+                            killed.append(proc)
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
         
         if killed:
-            time.sleep(3)
+            psutil.wait_procs(killed, timeout=10)
             print("✅ Killed existing Chrome processes")
         else:
             print("✅ No existing Chrome processes found")
@@ -77,9 +90,7 @@ class YoutubeUploader:
             driver = webdriver.Chrome(service=service, options=options)
             
             # Test the connection
-            time.sleep(2)
             driver.get("about:blank")
-            time.sleep(1)
             
             print("✅ Chrome driver created successfully")
             return driver
@@ -165,42 +176,16 @@ class YoutubeUploader:
         return str(latest_video.absolute())
 
     @staticmethod
-    def get_video_metadata():
+    def get_video_metadata(video_num=None):
         """Get video metadata (title, description) from title_description folder"""
         base_path = Path(__file__).parent.parent
         counter_file = base_path / "video_counter.txt"
         
-        with open(counter_file, 'r') as f:
-            video_num = f.read().strip()
-        
-        title_desc_folder = base_path / "data" / video_num / "title_description"
-        
-        metadata = {
-            "title": "Latest News Update",
-            "description": "Automated news video generated by Autotube"
-        }
-        
-        # Try to read title
-        title_file = title_desc_folder / "title.txt"
-        if title_file.exists():
-            try:
-                with open(title_file, 'r', encoding='utf-8') as f:
-                    metadata["title"] = f.read().strip()
-                print(f"✅ Loaded title: {metadata['title'][:50]}...")
-            except Exception as e:
-                print(f"⚠️ Could not read title: {e}")
-        
-        # Try to read description
-        desc_file = title_desc_folder / "description.txt"
-        if desc_file.exists():
-            try:
-                with open(desc_file, 'r', encoding='utf-8') as f:
-                    metadata["description"] = f.read().strip()
-                print(f"✅ Loaded description")
-            except Exception as e:
-                print(f"⚠️ Could not read description: {e}")
+        if video_num is None:
+            with open(counter_file, 'r') as f:
+                video_num = f.read().strip()
         
-        return metadata
+        return load_video_metadata(video_num)
 
     @staticmethod
     def clean_text_for_upload(text):
@@ -211,49 +196,118 @@ class YoutubeUploader:
             clean = re.sub(r'[^\x00-\x7F\u0080-\uFFFF]+', '', text)
         return clean
 
+    # ---------------------------
+    # Readiness conditions
+    # ---------------------------
+    @staticmethod
+    def _page_loaded(driver):
+        return driver.execute_script("return document.readyState") == "complete"
+
     @staticmethod
+    def _wait_network_idle(driver, timeout=10, quiet=0.5):
+        """
+        Wait until no new network requests have started for `quiet` seconds.
+        A long-running upload request does not count against this.
+        """
+        count_js = "return performance.getEntriesByType('resource').length"
+        state = {"count": driver.execute_script(count_js), "since": time.monotonic()}
+
+        def idle(d):
+            count = d.execute_script(count_js)
+            if count != state["count"]:
+                state["count"], state["since"] = count, time.monotonic()
+                return False
+            return time.monotonic() - state["since"] >= quiet
+
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(idle)
+        except TimeoutException:
+            pass  # a busy page is not an error; the next element wait decides
+
+    @staticmethod
+    def _upload_progress_text(driver):
+        try:
+            return driver.find_element(By.CSS_SELECTOR, "ytcp-video-upload-progress").text.strip()
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _upload_finished(driver):
+        """True once the progress label no longer reports the file as uploading"""
+        text = YoutubeUploader._upload_progress_text(driver)
+        return bool(text) and "uploading" not in text.lower()
+
+    @staticmethod
+    def _click_first(driver, selectors, timeout):
+        """Click the first selector that becomes clickable; returns True if one did"""
+        for by_method, selector in selectors:
+            try:
+                element = WebDriverWait(driver, timeout).until(
+                    EC.element_to_be_clickable((by_method, selector))
+                )
+                driver.execute_script("arguments[0].scrollIntoView(true);", element)
+                driver.execute_script("arguments[0].click();", element)
+                return True
+            except Exception:
+                continue
+        return False
+
+    @staticmethod
+    def _type_into(driver, textbox, text, clear=False):
+        """Type into a contenteditable box and wait until the page shows the text"""
+        driver.execute_script("arguments[0].scrollIntoView(true);", textbox)
+        textbox.click()
+        if clear:
+            textbox.send_keys(Keys.CONTROL + "a")
+            textbox.send_keys(Keys.BACKSPACE)
+        textbox.send_keys(text)
+        expected = text.strip()[:20]
+        WebDriverWait(driver, YoutubeUploader.STEP_TIMEOUTS["typing"]).until(
+            lambda d: expected in textbox.text
+        )
+
+    @staticmethod
+    def _next_step(driver):
+        """Click NEXT and wait for the following page of the dialog to settle"""
+        next_btn = WebDriverWait(driver, YoutubeUploader.STEP_TIMEOUTS["next"]).until(
+            EC.element_to_be_clickable((By.XPATH, '//*[@id="next-button"]'))
+        )
+        next_btn.click()
+        YoutubeUploader._wait_network_idle(driver, timeout=YoutubeUploader.STEP_TIMEOUTS["next"])
+
+    @staticmethod
+    @profiled("upload")
     def upload_video_to_youtube(driver, video_path, title=None, description=None):
         """Upload a single video to YouTube Studio"""
+        timeouts = YoutubeUploader.STEP_TIMEOUTS
+        timer = StepTimer(Path(video_path).name)
+        YoutubeUploader.last_timings = timer
+        success = False
         try:
             # Navigate to YouTube Studio
             print("🌐 Navigating to YouTube Studio...")
-            driver.get("https://studio.youtube.com")
-            time.sleep(8)
+            with timer.step("open_studio"):
+                driver.get("https://studio.youtube.com")
+                WebDriverWait(driver, timeouts["open_studio"]).until(YoutubeUploader._page_loaded)
 
             # Click CREATE button
             print("📤 Looking for CREATE button...")
-            create_clicked = False
-            
             create_selectors = [
                 (By.XPATH, '//button[@aria-label="Create"]'),
                 (By.XPATH, '//ytcp-button[@id="create-icon"]'),
                 (By.ID, "create-icon"),
                 (By.XPATH, '//*[@id="create-icon"]'),
             ]
-            
-            for by_method, selector in create_selectors:
-                try:
-                    create_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by_method, selector))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", create_button)
-                    time.sleep(1)
-                    driver.execute_script("arguments[0].click();", create_button)
-                    create_clicked = True
-                    print("✅ CREATE button clicked!")
-                    break
-                except:
-                    continue
-            
+            with timer.step("create_button"):
+                create_clicked = YoutubeUploader._click_first(driver, create_selectors, timeouts["create"])
+
             if not create_clicked:
                 print("❌ Could not find CREATE button!")
                 return False
-            
-            # Wait for dropdown menu, then click "Upload videos"
+            print("✅ CREATE button clicked!")
+
+            # Click "Upload videos" once the dropdown menu is clickable
             print("📤 Looking for 'Upload videos' option in menu...")
-            time.sleep(2)
-            
-            upload_clicked = False
             upload_menu_selectors = [
                 (By.XPATH, '//tp-yt-paper-item[@test-id="upload-beta"]'),
                 (By.XPATH, '//tp-yt-paper-item[contains(text(), "Upload videos")]'),
@@ -261,26 +315,14 @@ class YoutubeUploader:
                 (By.XPATH, '//ytcp-ve[contains(text(), "Upload videos")]'),
                 (By.XPATH, '//tp-yt-paper-item[@class="style-scope ytcp-text-menu"]'),
             ]
-            
-            for by_method, selector in upload_menu_selectors:
-                try:
-                    upload_option = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by_method, selector))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", upload_option)
-                    time.sleep(1)
-                    driver.execute_script("arguments[0].click();", upload_option)
-                    upload_clicked = True
-                    print("✅ 'Upload videos' option clicked!")
-                    break
-                except:
-                    continue
-            
-            if not upload_clicked:
+            with timer.step("upload_menu"):
+                upload_clicked = YoutubeUploader._click_first(driver, upload_menu_selectors, timeouts["menu"])
+
+            if upload_clicked:
+                print("✅ 'Upload videos' option clicked!")
+            else:
                 print("❌ Could not find 'Upload videos' option in menu!")
                 print("⚠️ Trying to find file input directly...")
-            
-            time.sleep(3)
 
             # Upload file
             print(f"📁 Selecting video file...")
@@ -293,16 +335,16 @@ class YoutubeUploader:
             ]
             
             file_input = None
-            for by_method, selector in file_input_selectors:
-                try:
-                    file_input = WebDriverWait(driver, 15).until(
-                        EC.presence_of_element_located((by_method, selector))
-                    )
-                    if file_input:
+            with timer.step("file_input"):
+                for by_method, selector in file_input_selectors:
+                    try:
+                        file_input = WebDriverWait(driver, timeouts["file_input"]).until(
+                            EC.presence_of_element_located((by_method, selector))
+                        )
                         print("✅ File input found!")
                         break
-                except:
-                    continue
+                    except Exception:
+                        continue
             
             if not file_input:
                 print("❌ Could not find file input element!")
@@ -311,241 +353,136 @@ class YoutubeUploader:
             file_input.send_keys(video_path)
             print("✅ Video file selected")
             
-            # Wait for upload to complete - IMPROVED METHOD
-            print("⏳ Waiting for video to upload (this may take 1-3 minutes)...")
-            
-            max_wait = 300  # 5 minutes
-            start_time = time.time()
-            upload_complete = False
-            
-            while (time.time() - start_time) < max_wait:
+            # The details form becomes editable while the file is still uploading
+            print("⏳ Waiting for the details form...")
+            with timer.step("details_form"):
                 try:
-                    # Check if textboxes are available (means upload is done)
-                    textboxes = driver.find_elements(By.XPATH, '//div[@id="textbox"]')
-                    if len(textboxes) > 0:
-                        # Try to click first textbox to verify it's ready
-                        try:
-                            textboxes[0].click()
-                            upload_complete = True
-                            print("✅ Upload complete - form is ready!")
-                            break
-                        except:
-                            pass
-                except:
-                    pass
-                
-                time.sleep(3)
-                elapsed = int(time.time() - start_time)
-                if elapsed % 20 == 0 and elapsed > 0:
-                    print(f"   Still uploading... ({elapsed}s elapsed)")
-            
-            if not upload_complete:
-                print("⚠️ Upload taking longer than expected, proceeding anyway...")
-            
-            time.sleep(5)
+                    WebDriverWait(driver, timeouts["details_form"], poll_frequency=0.5).until(
+                        EC.element_to_be_clickable((By.XPATH, '//div[@id="textbox"]'))
+                    )
+                    print("✅ Details form is ready!")
+                except TimeoutException:
+                    print("⚠️ Details form taking longer than expected, proceeding anyway...")
 
-            # Set title - IMPROVED METHOD
+            # Set title
             if title:
                 clean_title = YoutubeUploader.clean_text_for_upload(title)
                 print(f"✍️ Setting title...")
                 try:
-                    # Find all textboxes
-                    textboxes = WebDriverWait(driver, 20).until(
-                        EC.presence_of_all_elements_located((By.XPATH, '//div[@id="textbox"]'))
-                    )
-                    
-                    if len(textboxes) > 0:
-                        title_input = textboxes[0]
-                        
-                        # Scroll to it
-                        driver.execute_script("arguments[0].scrollIntoView(true);", title_input)
-                        time.sleep(1)
-                        
-                        # Click to focus
-                        title_input.click()
-                        time.sleep(1)
-                        
-                        # Clear existing text
-                        title_input.send_keys(Keys.CONTROL + "a")
-                        time.sleep(0.5)
-                        title_input.send_keys(Keys.BACKSPACE)
-                        time.sleep(0.5)
-                        
-                        # Type new title
-                        title_input.send_keys(clean_title)
-                        time.sleep(1)
-                        
-                        print(f"✅ Title set: {clean_title[:50]}...")
-                    else:
-                        print("⚠️ Could not find title textbox")
-                        
+                    with timer.step("title"):
+                        textboxes = WebDriverWait(driver, timeouts["typing"]).until(
+                            EC.presence_of_all_elements_located((By.XPATH, '//div[@id="textbox"]'))
+                        )
+                        YoutubeUploader._type_into(driver, textboxes[0], clean_title, clear=True)
+                    print(f"✅ Title set: {clean_title[:50]}...")
                 except Exception as e:
                     print(f"⚠️ Could not set title: {e}")
 
-            # Set description - IMPROVED METHOD
+            # Set description (second textbox)
             if description:
                 clean_desc = YoutubeUploader.clean_text_for_upload(description)
                 print(f"✍️ Setting description...")
                 try:
-                    # Find all textboxes (description is the second one)
-                    textboxes = driver.find_elements(By.XPATH, '//div[@id="textbox"]')
-                    
-                    if len(textboxes) > 1:
-                        desc_input = textboxes[1]
-                        
-                        # Scroll to it
-                        driver.execute_script("arguments[0].scrollIntoView(true);", desc_input)
-                        time.sleep(1)
-                        
-                        # Click to focus
-                        desc_input.click()
-                        time.sleep(1)
-                        
-                        # Type description
-                        desc_input.send_keys(clean_desc)
-                        time.sleep(1)
-                        
-                        print("✅ Description set")
-                    else:
-                        print("⚠️ Could not find description textbox")
-                        
+                    with timer.step("description"):
+                        textboxes = driver.find_elements(By.XPATH, '//div[@id="textbox"]')
+                        if len(textboxes) < 2:
+                            raise RuntimeError("description textbox not found")
+                        YoutubeUploader._type_into(driver, textboxes[1], clean_desc)
+                    print("✅ Description set")
                 except Exception as e:
                     print(f"⚠️ Could not set description: {e}")
 
-            time.sleep(2)
-
             # Set "Made for kids"
             print("👶 Setting 'Made for kids' option...")
-            try:
-                made_for_kids_selectors = [
-                    '//tp-yt-paper-radio-button[@name="VIDEO_MADE_FOR_KIDS_MFK"]',
-                    '//paper-radio-button[@name="VIDEO_MADE_FOR_KIDS_MFK"]',
-                    '//*[contains(text(), "Yes, it\'s made for kids")]/ancestor::tp-yt-paper-radio-button',
-                ]
-                
-                kids_clicked = False
-                for selector in made_for_kids_selectors:
-                    try:
-                        kids_button = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        kids_button.click()
-                        kids_clicked = True
-                        print("✅ Selected 'Yes, it's made for kids'")
-                        break
-                    except:
-                        continue
-                
-                if not kids_clicked:
-                    print("⚠️ Could not find 'Made for kids' button")
-                
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"⚠️ Error setting 'Made for kids': {e}")
-
-            # Click NEXT - Details to Video elements
-            print("➡️ Step 1: Details → Video elements")
-            try:
-                next_btn = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="next-button"]'))
-                )
-                next_btn.click()
-                time.sleep(3)
-                print("✅ Step 1 completed")
-            except Exception as e:
-                print(f"⚠️ Error on step 1: {e}")
+            made_for_kids_selectors = [
+                (By.XPATH, '//tp-yt-paper-radio-button[@name="VIDEO_MADE_FOR_KIDS_MFK"]'),
+                (By.XPATH, '//paper-radio-button[@name="VIDEO_MADE_FOR_KIDS_MFK"]'),
+                (By.XPATH, '//*[contains(text(), "Yes, it\'s made for kids")]/ancestor::tp-yt-paper-radio-button'),
+            ]
+            with timer.step("made_for_kids"):
+                kids_clicked = YoutubeUploader._click_first(driver, made_for_kids_selectors, timeouts["radio"])
+            print("✅ Selected 'Yes, it's made for kids'" if kids_clicked else "⚠️ Could not find 'Made for kids' button")
 
-            # Click NEXT - Video elements to Checks
-            print("➡️ Step 2: Video elements → Checks")
-            try:
-                next_btn = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="next-button"]'))
-                )
-                next_btn.click()
-                time.sleep(5)
-                print("✅ Step 2 completed")
-            except Exception as e:
-                print(f"⚠️ Error on step 2: {e}")
+            # Details -> Video elements -> Checks
+            for number, label in ((1, "Details → Video elements"), (2, "Video elements → Checks")):
+                print(f"➡️ Step {number}: {label}")
+                try:
+                    with timer.step(f"next_{number}"):
+                        YoutubeUploader._next_step(driver)
+                    print(f"✅ Step {number} completed")
+                except Exception as e:
+                    print(f"⚠️ Error on step {number}: {e}")
 
             # Wait for copyright check
             print("⏳ Waiting for copyright check...")
-            time.sleep(5)
-            
             try:
-                copyright_status = WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((By.XPATH, 
-                        '//*[contains(text(), "No issues found") or contains(text(), "Copyright")]'))
-                )
+                with timer.step("copyright_check"):
+                    WebDriverWait(driver, timeouts["checks"]).until(
+                        EC.presence_of_element_located((By.XPATH,
+                            '//*[contains(text(), "No issues found") or contains(text(), "Copyright")]'))
+                    )
                 print("✅ Copyright check completed")
-            except:
+            except Exception:
                 print("⚠️ Copyright check status unclear, continuing...")
-            
-            time.sleep(2)
 
-            # Click NEXT - Checks to Visibility
+            # Checks -> Visibility
             print("➡️ Step 3: Checks → Visibility")
             try:
-                next_btn = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="next-button"]'))
-                )
-                next_btn.click()
-                time.sleep(3)
+                with timer.step("next_3"):
+                    YoutubeUploader._next_step(driver)
                 print("✅ Step 3 completed")
             except Exception as e:
                 print(f"⚠️ Error on step 3: {e}")
 
             # Set to PUBLIC
             print("🌍 Setting visibility to PUBLIC...")
-            try:
-                public_selectors = [
-                    '//tp-yt-paper-radio-button[@name="PUBLIC"]',
-                    '//paper-radio-button[@name="PUBLIC"]',
-                    '//*[contains(text(), "Public")]/ancestor::tp-yt-paper-radio-button',
-                ]
-                
-                public_clicked = False
-                for selector in public_selectors:
-                    try:
-                        public_radio = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        public_radio.click()
-                        public_clicked = True
-                        print("✅ Set to PUBLIC")
-                        break
-                    except:
-                        continue
-                
-                if not public_clicked:
-                    print("⚠️ Could not set PUBLIC visibility")
-                
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"⚠️ Error setting visibility: {e}")
+            public_selectors = [
+                (By.XPATH, '//tp-yt-paper-radio-button[@name="PUBLIC"]'),
+                (By.XPATH, '//paper-radio-button[@name="PUBLIC"]'),
+                (By.XPATH, '//*[contains(text(), "Public")]/ancestor::tp-yt-paper-radio-button'),
+            ]
+            with timer.step("visibility"):
+                public_clicked = YoutubeUploader._click_first(driver, public_selectors, timeouts["radio"])
+            print("✅ Set to PUBLIC" if public_clicked else "⚠️ Could not set PUBLIC visibility")
 
-            # Click PUBLISH
+            # Publishing before the transfer ends can leave a broken draft
+            print("⏳ Waiting for the file upload to finish...")
+            with timer.step("upload_transfer"):
+                try:
+                    WebDriverWait(driver, timeouts["upload"], poll_frequency=1).until(
+                        YoutubeUploader._upload_finished
+                    )
+                    print(f"✅ {YoutubeUploader._upload_progress_text(driver) or 'Upload complete'}")
+                except TimeoutException:
+                    print("⚠️ Upload still in progress after the time limit, publishing anyway...")
+
+            # Click PUBLISH and wait for the confirmation dialog
             print("🚀 Publishing video...")
-            try:
-                publish_btn = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="done-button"]'))
-                )
-                publish_btn.click()
-                time.sleep(5)
-                print("🎉 Video published successfully!")
-                return True
-            except Exception as e:
-                print(f"⚠️ Error clicking publish: {e}")
+            with timer.step("publish"):
                 try:
-                    publish_btn = driver.find_element(By.XPATH, '//ytcp-button[@id="done-button"]')
+                    publish_btn = WebDriverWait(driver, timeouts["next"]).until(
+                        EC.element_to_be_clickable((By.XPATH, '//*[@id="done-button"]'))
+                    )
                     publish_btn.click()
-                    time.sleep(5)
-                    print("🎉 Video published successfully!")
-                    return True
-                except:
-                    print("❌ Could not click publish button")
-                    return False
+                except Exception as e:
+                    print(f"⚠️ Error clicking publish: {e}")
+                    try:
+                        driver.find_element(By.XPATH, '//ytcp-button[@id="done-button"]').click()
+                    except Exception:
+                        print("❌ Could not click publish button")
+                        return False
+
+                try:
+                    WebDriverWait(driver, timeouts["publish"]).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR,
+                            "ytcp-video-share-dialog, ytcp-uploads-still-processing-dialog"))
+                    )
+                except TimeoutException:
+                    print("⚠️ No publish confirmation seen, check YouTube Studio")
+
+            print("🎉 Video published successfully!")
+            success = True
+            return True
 
         except Exception as e:
             print(f"❌ Error uploading video: {e}")
@@ -553,6 +490,25 @@ class YoutubeUploader:
             traceback.print_exc()
             return False
 
+        finally:
+            print(timer.summary())
+            timer.save(Path(__file__).parent.parent, success)
+
+    @staticmethod
+    def upload_video(video_path, metadata):
+        """Upload an explicit file with {"title", "description"} on the warm driver"""
+        driver = YoutubeUploader.get_or_create_driver()
+        if not driver:
+            print("❌ Failed to get Chrome driver!")
+            return False
+
+        return YoutubeUploader.upload_video_to_youtube(
+            driver,
+            str(video_path),
+            title=metadata.get("title"),
+            description=metadata.get("description")
+        )
+
     @staticmethod
     def upload_latest_video():
         """Main method to upload the latest video from data folder"""
@@ -561,13 +517,6 @@ class YoutubeUploader:
             print("🎬 Starting YouTube Upload Process")
             print("="*60 + "\n")
             
-            # Get or create driver
-            driver = YoutubeUploader.get_or_create_driver()
-            
-            if not driver:
-                print("❌ Failed to get Chrome driver!")
-                return False
-
             # Get latest video
             video_path = YoutubeUploader.get_latest_video_from_data_folder()
             
@@ -579,12 +528,7 @@ class YoutubeUploader:
             metadata = YoutubeUploader.get_video_metadata()
             
             # Upload video
-            success = YoutubeUploader.upload_video_to_youtube(
-                driver, 
-                video_path,
-                title=metadata["title"],
-                description=metadata["description"]
-            )
+            success = YoutubeUploader.upload_video(video_path, metadata)
 
             if success:
                 print("\n" + "="*60)
@@ -0,0 +1,194 @@
+#video/encoder_tuning.py module
+
+import os
+import json
+import time
+import uuid
+import psutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+
+class EncoderTuner:
+    """
+    Picks x264 thread count, preset and host-wide render parallelism from the
+    detected core count, the number of renders already running on this host
+    and a target render deadline.
+
+    Kept free of moviepy so schedulers and the CLI can import it cheaply.
+    """
+
+    # x264 presets from best quality to fastest, with encode cost relative to medium
+    PRESETS = [
+        ("slow", 1.8),
+        ("medium", 1.0),
+        ("fast", 0.75),
+        ("faster", 0.6),
+        ("veryfast", 0.4),
+        ("superfast", 0.25),
+        ("ultrafast", 0.15),
+    ]
+
+    MIN_THREADS_PER_RENDER = 2
+    MAX_THREADS_PER_RENDER = 16   # x264 gains little past this
+    THREAD_SCALING = 0.85         # speedup ~ threads ** THREAD_SCALING
+    SECONDS_PER_SCENE = 5         # used when the real duration is not known yet
+    SLOT_POLL_SECONDS = 0.5
+
+    # Threads of one process check for capacity and claim a slot as one step
+    _admission_lock = threading.Lock()
+
+    def __init__(self, base_dir: Path, env=None):
+        env = env or {}
+        self.slots_dir = Path(base_dir) / "data" / ".render_slots"
+        self.slots_dir.mkdir(parents=True, exist_ok=True)
+
+        self.deadline = float(env.get("VIDEO_RENDER_DEADLINE", 180))
+        # Megapixel-frames per second one thread encodes at preset=medium.
+        # Calibrate per fleet; the default matches a mid-range x86 core.
+        self.mpix_per_sec = float(env.get("VIDEO_ENCODE_MPIX_PER_SEC", 12))
+        self.fps = int(env.get("VIDEO_FPS", 30))
+
+        # Manual overrides win over the auto-tuned values
+        self.threads_override = env.get("VIDEO_THREADS")
+        self.preset_override = env.get("VIDEO_PRESET")
+
+        # Slots held by this tuner; the render being tuned counts separately
+        self._own_slots = set()
+
+    # ---------------------------
+    # Host inspection
+    # ---------------------------
+    @staticmethod
+    def detect_cores() -> int:
+        """CPU cores this process may run on (respects affinity/cgroup masks where exposed)"""
+        if hasattr(os, "sched_getaffinity"):
+            return max(1, len(os.sched_getaffinity(0)))
+        return max(1, psutil.cpu_count(logical=True) or 1)
+
+    def active_renders(self) -> int:
+        """
+        Count live render slots on this host other than our own, removing ones
+        left by dead processes
+        """
+        count = 0
+        for slot in self.slots_dir.glob("*.slot"):
+            if slot.name in self._own_slots:
+                continue
+            try:
+                pid = int(slot.read_text().strip())
+            except (OSError, ValueError):
+                continue
+            if psutil.pid_exists(pid):
+                count += 1
+            else:
+                slot.unlink(missing_ok=True)
+        return count
+
+    @contextmanager
+    def render_slot(self, max_parallel=None):
+        """
+        Register a running render for the duration of the block. With
+        max_parallel, first wait until fewer than that many renders are
+        running on this host.
+        """
+        slot = self.slots_dir / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.slot"
+        announced = False
+        while True:
+            with self._admission_lock:
+                active = self.active_renders() if max_parallel else 0
+                if not max_parallel or active < max_parallel:
+                    slot.write_text(str(os.getpid()))
+                    self._own_slots.add(slot.name)
+                    break
+            if not announced:
+                print(f"[info] Waiting for a render slot ({active} running, host fits {max_parallel})")
+                announced = True
+            time.sleep(self.SLOT_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self._own_slots.discard(slot.name)
+            slot.unlink(missing_ok=True)
+
+    # ---------------------------
+    # Cost model
+    # ---------------------------
+    def estimate_seconds(self, frames, megapixels, threads, cost) -> float:
+        """Estimated wall time to encode `frames` frames of `megapixels` each"""
+        speedup = max(1, threads) ** self.THREAD_SCALING
+        return frames * megapixels * cost / (self.mpix_per_sec * speedup)
+
+    def max_parallel_renders(self, duration: float, megapixels: float) -> int:
+        """
+        How many renders this host can run at once while each still meets the
+        deadline at preset=medium
+        """
+        frames = max(1, int(duration * self.fps))
+        needed = self.MAX_THREADS_PER_RENDER
+        for t in range(self.MIN_THREADS_PER_RENDER, self.MAX_THREADS_PER_RENDER + 1):
+            if self.estimate_seconds(frames, megapixels, t, 1.0) <= self.deadline:
+                needed = t
+                break
+        return max(1, self.detect_cores() // needed)
+
+    def decide(self, duration: float, megapixels: float, include_self=True) -> dict:
+        """
+        Return the encoder decision for a render of `duration` seconds whose
+        encoders together process `megapixels` per frame.
+        """
+        cores = self.detect_cores()
+        active = self.active_renders()
+        concurrency = active + (1 if include_self else 0)
+        frames = max(1, int(duration * self.fps))
+
+        # Share the host evenly between renders that are running right now
+        threads = cores // max(1, concurrency)
+        threads = max(1, min(self.MAX_THREADS_PER_RENDER, threads))
+
+        preset, cost = self.PRESETS[-1]
+        for name, preset_cost in self.PRESETS:
+            if self.estimate_seconds(frames, megapixels, threads, preset_cost) <= self.deadline:
+                preset, cost = name, preset_cost
+                break
+
+        source = "auto"
+        if self.threads_override and str(self.threads_override).isdigit():
+            threads = int(self.threads_override)
+            source = "override"
+        if self.preset_override:
+            preset = self.preset_override
+            cost = dict(self.PRESETS).get(preset, cost)
+            source = "override"
+
+        return {
+            "decided_at": datetime.now().isoformat(),
+            "source": source,
+            "cores": cores,
+            "active_renders": active,
+            "concurrency": concurrency,
+            "threads": threads,
+            "preset": preset,
+            "fps": self.fps,
+            "max_parallel_renders": self.max_parallel_renders(duration, megapixels),
+            "duration": round(duration, 2),
+            "megapixels": round(megapixels, 3),
+            "deadline": self.deadline,
+            "estimated_seconds": round(self.estimate_seconds(frames, megapixels, threads, cost), 1),
+        }
+
+    @staticmethod
+    def save_decision(decision: dict, path: Path):
+        """Write a decision next to the render output for later auditing"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(decision, f, indent=4)
+
+
+# ---------------------------
+# Example usage
+# ---------------------------
+if __name__ == "__main__":
+    tuner = EncoderTuner(Path(__file__).parent.parent)
+    print(json.dumps(tuner.decide(duration=30, megapixels=1920 * 1080 / 1e6), indent=4))
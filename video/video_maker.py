@@ -1,18 +1,81 @@
 import os
+import gc
+import sys
 import json
+import subprocess
+import psutil
+import numpy as np
 from pathlib import Path
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
+from contextlib import contextmanager, ExitStack
+from dotenv import dotenv_values
+from moviepy.config import get_setting
+from moviepy.editor import ImageClip, AudioFileClip, CompositeVideoClip, concatenate_videoclips
+from moviepy.audio.AudioClip import AudioArrayClip
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+# Allow running this file directly (python video/video_maker.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from video.encoder_tuning import EncoderTuner
+from tts.narration import NarrationBuilder
+from captions.captions import CaptionGenerator
+from scheduler.tracing import span
+from scheduler.profiling import profiled
 
 class VideoMaker:
     """Video Maker - ONLY compiles images + audio into final video"""
+
+    # Output variants for create_video_variants().
+    # fit="crop" fills the frame and trims the overflow, fit="pad" letterboxes.
+    # "preset" / "threads" may be set per target; otherwise the tuned values are used.
+    RENDER_TARGETS = {
+        "short": {"width": 1080, "height": 1920, "fit": "crop", "crf": 23},
+        "landscape": {"width": 1920, "height": 1080, "fit": "pad", "crf": 23},
+    }
     
-    def __init__(self):
+    def __init__(self, streaming=None, max_memory_mb=None, narration_track=None, burn_captions=None,
+                 video_number=None):
         # Get base directory
         self.BASE_DIR = Path(__file__).resolve().parent.parent
+
+        # Load .env (render settings are optional)
+        env_path = self.BASE_DIR / ".env"
+        self.env = dotenv_values(env_path) if env_path.exists() else {}
+
+        # Streaming mode renders one scene at a time and stitches the segments,
+        # so memory stays flat regardless of the number of scenes
+        if streaming is None:
+            streaming = str(self.env.get("VIDEO_STREAMING", "false")).lower() in ("1", "true", "yes")
+        self.streaming = streaming
+
+        # Abort a streaming render if RSS goes above this many MB (0 = no limit)
+        if max_memory_mb is None:
+            max_memory_mb = self.env.get("VIDEO_MAX_MEMORY_MB", "0")
+        self.max_memory_mb = int(max_memory_mb) if str(max_memory_mb).isdigit() else 0
+
+        # Join all scene audio into one normalized narration track (decoded and
+        # encoded once) instead of attaching each scene's MP3 to its clip
+        if narration_track is None:
+            narration_track = str(self.env.get("VIDEO_NARRATION_TRACK", "true")).lower() in ("1", "true", "yes")
+        self.narration_track = narration_track
+
+        # Burn captions from the TTS word timings into the frames during the
+        # normal encode (no-op for scenes without timings)
+        if burn_captions is None:
+            burn_captions = str(self.env.get("VIDEO_BURN_CAPTIONS", "true")).lower() in ("1", "true", "yes")
+        self.burn_captions = burn_captions
+
+        self._process = psutil.Process(os.getpid())
+        self.peak_rss_mb = 0.0
+
+        # Threads / preset / fps are chosen per render, see tune_encoder()
+        self.tuner = EncoderTuner(self.BASE_DIR, self.env)
+        self.encoder_decision = None
         
-        # Read current video number
+        # Read current video number (or use the one a pipeline job reserved)
         video_counter_path = self.BASE_DIR / "video_counter.txt"
-        if not video_counter_path.exists():
+        if video_number is not None:
+            self.video_number = str(video_number)
+        elif not video_counter_path.exists():
             print("[warning] video_counter.txt not found, creating with value 1")
             with open(video_counter_path, "w") as f:
                 f.write("1")
@@ -34,47 +97,301 @@ class VideoMaker:
 
         # Create output folder
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_path = None  # set by create_video()
+        self._assets = {}        # scene -> (image path, audio path or MP3 bytes) handed over in memory
+
+        self.captions = CaptionGenerator(self.audio_dir, self.data_dir / "captions")
 
         print(f"[info] Video Maker initialized for video #{self.video_number}")
 
-    def create_video(self):
-        """Compile images and audio into final video"""
+    # ---------------------------
+    # Memory tracking
+    # ---------------------------
+    def _sample_rss(self):
+        """Record current RSS (MB) and return it"""
+        rss_mb = self._process.memory_info().rss / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        return rss_mb
+
+    def _check_memory_ceiling(self):
+        """Collect garbage and raise if RSS is still above the configured ceiling"""
+        if not self.max_memory_mb:
+            self._sample_rss()
+            return
+        if self._sample_rss() > self.max_memory_mb:
+            gc.collect()
+            rss_mb = self._sample_rss()
+            if rss_mb > self.max_memory_mb:
+                raise MemoryError(
+                    f"RSS {rss_mb:.0f} MB exceeds VIDEO_MAX_MEMORY_MB={self.max_memory_mb}"
+                )
+
+    @staticmethod
+    def _close_clips(*clips):
+        """Release decoder processes and file handles held by clips"""
+        for clip in clips:
+            if clip is None:
+                continue
+            try:
+                clip.close()
+            except Exception:
+                pass
+
+    # ---------------------------
+    # Scene helpers
+    # ---------------------------
+    def _load_scenes(self):
+        """Load the scene list from the saved script, or None if missing"""
         script_path = self.script_dir / "video_script.json"
-        
+
         if not script_path.exists():
             print(f"[error] Script not found at: {script_path}")
-            return False
+            return None
 
-        # Load script
         with open(script_path, "r", encoding="utf-8") as f:
-            scenes = json.load(f)
+            return json.load(f)
 
-        print(f"\n{'='*60}")
-        print(f"[info] Compiling video from {len(scenes)} scenes...")
-        print(f"{'='*60}\n")
+    def _use_assets(self, image_paths=None, audio=None):
+        """Take over asset paths / MP3 bytes handed in by the pipeline, keyed by scene"""
+        image_paths = image_paths or {}
+        audio = audio or {}
+        self._assets = {
+            i: (Path(image_paths[i]), audio[i] if isinstance(audio[i], bytes) else Path(audio[i]))
+            for i in image_paths if i in audio
+        }
 
-        clips = []
+    @contextmanager
+    def _render_slot(self, max_parallel):
+        """
+        Hold a host render slot for the block. The wait for it is traced as
+        render_queue, so the render span only covers the encode itself.
+        """
+        with ExitStack() as stack:
+            with span("render_queue", max_parallel=max_parallel):
+                stack.enter_context(self.tuner.render_slot(max_parallel))
+            yield
+
+    def _scene_inputs(self, scenes):
+        """
+        Yield (index, image path, audio) for every scene with both assets.
+        Audio is a path, or MP3 bytes when it was handed over in memory.
+        """
         for i, scene in enumerate(scenes, start=1):
-            img_path = self.image_dir / f"{i}.jpg"
-            aud_path = self.audio_dir / f"{i}.mp3"
+            img_path, aud_path = self._assets.get(
+                i, (self.image_dir / f"{i}.jpg", self.audio_dir / f"{i}.mp3")
+            )
 
             if not img_path.exists():
                 print(f"[warning] Skipping scene {i} - image not found: {img_path}")
                 continue
-            
-            if not aud_path.exists():
+
+            if isinstance(aud_path, bytes) and not self.narration_track:
+                # Per-scene clips are opened by moviepy, which needs a file
+                self.audio_dir.mkdir(parents=True, exist_ok=True)
+                spilled = self.audio_dir / f"{i}.mp3"
+                spilled.write_bytes(aud_path)
+                aud_path = spilled
+
+            if not isinstance(aud_path, bytes) and not aud_path.exists():
                 print(f"[warning] Skipping scene {i} - audio not found: {aud_path}")
                 continue
 
+            yield i, img_path, aud_path
+
+    def _build_scene_clip(self, img_path, aud_path, duration=None, scene=None):
+        """
+        Return (scene clip, audio clip) for one image + narration pair.
+        With an explicit duration (narration track mode) the clip is silent
+        and audio clip is None. Passing the scene number burns its captions in.
+        """
+        if duration is not None:
+            image_clip = self._add_caption_overlays(ImageClip(str(img_path)).set_duration(duration), scene)
+            return image_clip.fadein(0.5).fadeout(0.5), None
+
+        audio_clip = AudioFileClip(str(aud_path))
+        image_clip = ImageClip(str(img_path)).set_duration(audio_clip.duration)
+        image_clip = self._add_caption_overlays(image_clip, scene)
+        image_clip = image_clip.fadein(0.5).fadeout(0.5).set_audio(audio_clip)
+        return image_clip, audio_clip
+
+    def _add_caption_overlays(self, clip, scene):
+        """Composite the scene's pre-rasterized caption PNGs over its image"""
+        if not self.burn_captions or scene is None:
+            return clip
+
+        overlays = []
+        for cue in self.captions.scene_cues(scene):
+            start = min(cue["start"], clip.duration)
+            end = min(cue["end"], clip.duration)
+            if end <= start:
+                continue
+            png = self.captions.render_overlay(cue["text"], clip.w, clip.h)
+            overlay = ImageClip(str(png)).set_start(start).set_duration(end - start)
+            overlays.append(overlay.set_position(("center", clip.h - overlay.h - int(clip.h * 0.08))))
+
+        if not overlays:
+            return clip
+        return CompositeVideoClip([clip] + overlays, size=clip.size).set_duration(clip.duration)
+
+    def _write_caption_files(self, scene_durations, name):
+        """Write whole-video SRT/VTT from (scene, duration) pairs in timeline order"""
+        starts = {}
+        cursor = 0.0
+        for scene, duration in scene_durations:
+            starts[scene] = cursor
+            cursor += duration
+        try:
+            self.captions.write_video_captions(starts, name)
+        except Exception as e:
+            print(f"[warning] Could not write captions: {e}")
+
+    def _prepare_narration(self, inputs):
+        """
+        Build the joined narration track for the given scene inputs.
+        Returns (narration, {scene: display duration}), or (None, {}) when
+        narration track mode is off. Narration is the WAV path, or the PCM
+        track itself when the scene audio came in memory, so nothing is
+        written for it.
+        """
+        if not self.narration_track:
+            return None, {}
+        scene_audio = [(i, aud) for i, _, aud in inputs]
+        if any(isinstance(aud, bytes) for _, aud in scene_audio):
+            track, boundaries = NarrationBuilder().mix(scene_audio)
+            return track, NarrationBuilder.display_durations(boundaries)
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        narration_path = self.audio_dir / "narration.wav"
+        boundaries = NarrationBuilder().build(scene_audio, narration_path)
+        return narration_path, NarrationBuilder.display_durations(boundaries)
+
+    @staticmethod
+    def _narration_clip(narration):
+        """Audio clip for a narration WAV path or an in-memory PCM track"""
+        if isinstance(narration, np.ndarray):
+            # moviepy mis-times mono array clips, so hand it two channels
+            return AudioArrayClip(np.repeat(narration.reshape(-1, 1), 2, axis=1), fps=NarrationBuilder.SAMPLE_RATE)
+        return AudioFileClip(str(narration))
+
+    # ---------------------------
+    # Encoder tuning
+    # ---------------------------
+    def tune_encoder(self, duration, megapixels):
+        """
+        Decide threads, preset and fps for the upcoming render and record the
+        decision in self.encoder_decision and generated_video/encoder_decision.json
+        """
+        self.encoder_decision = self.tuner.decide(duration, megapixels)
+        d = self.encoder_decision
+        print(
+            f"[info] Encoder: {d['threads']} threads, preset={d['preset']}, fps={d['fps']} "
+            f"({d['cores']} cores, {d['concurrency']} concurrent renders, "
+            f"~{d['estimated_seconds']}s vs {d['deadline']:.0f}s deadline, "
+            f"host fits {d['max_parallel_renders']} parallel renders)"
+        )
+        try:
+            self.tuner.save_decision(d, self.output_dir / "encoder_decision.json")
+        except OSError as e:
+            print(f"[warning] Could not save encoder decision: {e}")
+        return d
+
+    def _write_clip(self, clip, output_path, logger="bar", audio=True):
+        """Encode a clip with the tuned output settings"""
+        d = self.encoder_decision or self.tune_encoder(clip.duration, clip.w * clip.h / 1e6)
+        clip.write_videofile(
+            str(output_path),
+            fps=d["fps"],
+            codec="libx264",
+            audio=audio,
+            audio_codec="aac",
+            threads=d["threads"],
+            preset=d["preset"],
+            logger=logger
+        )
+
+    def _print_success(self, output_path):
+        print(f"\n{'='*60}")
+        print(f"[🎬] SUCCESS! Final video saved to:")
+        print(f"    {output_path}")
+        print(f"[info] Peak RSS during render: {self.peak_rss_mb:.1f} MB")
+        print(f"{'='*60}\n")
+
+    # ---------------------------
+    # Rendering
+    # ---------------------------
+    @profiled("render")
+    def create_video(self, scenes=None, image_paths=None, audio=None):
+        """
+        Compile images and audio into final video.
+
+        A pipeline that already holds the scene list and assets passes them
+        in (audio as paths or MP3 bytes); otherwise the saved script and
+        default asset paths are used.
+        """
+        scenes = scenes if scenes is not None else self._load_scenes()
+        if scenes is None:
+            return False
+        self._use_assets(image_paths, audio)
+
+        print(f"\n{'='*60}")
+        print(f"[info] Compiling video from {len(scenes)} scenes...")
+        print(f"{'='*60}\n")
+
+        self.peak_rss_mb = 0.0
+        self.encoder_decision = None
+        self._sample_rss()
+        output_path = self.output_dir / f"final_video_{self.video_number}.mp4"
+        self.output_path = output_path
+
+        # Hold the render until the host has room for it; planned scene length
+        # and SDXL frame size, as the streaming path tunes before clips open
+        max_parallel = self.tuner.max_parallel_renders(
+            len(scenes) * self.tuner.SECONDS_PER_SCENE, 1024 * 1024 / 1e6
+        )
+        with self._render_slot(max_parallel), span("render", scenes=len(scenes), streaming=self.streaming,
+                                                   narration_track=self.narration_track) as trace:
+            if self.streaming:
+                created = self._create_video_streaming(scenes, output_path)
+            else:
+                created = self._create_video_in_memory(scenes, output_path)
+
+            if created:
+                d = self.encoder_decision or {}
+                trace.set(bytes=output_path.stat().st_size, preset=d.get("preset"),
+                          threads=d.get("threads"), peak_rss_mb=round(self.peak_rss_mb, 1))
+            else:
+                trace.fail("render failed")
+            return created
+
+    def _create_video_in_memory(self, scenes, output_path):
+        """Build the whole timeline, then encode it in one write"""
+        inputs = list(self._scene_inputs(scenes))
+        if not inputs:
+            print("[error] No valid clips to compile. Video creation failed.")
+            return False
+
+        try:
+            narration, durations = self._prepare_narration(inputs)
+        except Exception as e:
+            print(f"[error] Failed to build narration track: {e}")
+            return False
+
+        clips = []
+        audio_clips = []
+        scene_durations = []
+        for i, img_path, aud_path in inputs:
             print(f"[{i}/{len(scenes)}] Adding scene to video...")
 
             try:
-                audio_clip = AudioFileClip(str(aud_path))
-                image_clip = ImageClip(str(img_path)).set_duration(audio_clip.duration)
-                image_clip = image_clip.fadein(0.5).fadeout(0.5).set_audio(audio_clip)
+                image_clip, audio_clip = self._build_scene_clip(img_path, aud_path, durations.get(i), scene=i)
                 clips.append(image_clip)
+                scene_durations.append((i, image_clip.duration))
+                audio_clips.append(audio_clip)
             except Exception as e:
                 print(f"[error] Failed to process scene {i}: {e}")
+                if narration is not None:
+                    # The narration already contains this scene, timings would drift
+                    self._close_clips(*clips, *audio_clips)
+                    return False
                 continue
 
         if not clips:
@@ -83,26 +400,22 @@ class VideoMaker:
 
         print(f"\n[info] Concatenating {len(clips)} clips...")
         
+        final_video = None
         try:
             final_video = concatenate_videoclips(clips, method="compose")
-            output_path = self.output_dir / f"final_video_{self.video_number}.mp4"
+            if narration is not None:
+                narration_clip = self._narration_clip(narration)
+                audio_clips.append(narration_clip)
+                final_video = final_video.set_audio(narration_clip)
+            self.tune_encoder(final_video.duration, final_video.w * final_video.h / 1e6)
 
             print(f"[info] Rendering final video to: {output_path}")
             print("[info] This may take a few minutes...\n")
 
-            final_video.write_videofile(
-                str(output_path),
-                fps=30,
-                codec="libx264",
-                audio_codec="aac",
-                threads=4,
-                preset='medium'
-            )
-
-            print(f"\n{'='*60}")
-            print(f"[🎬] SUCCESS! Final video saved to:")
-            print(f"    {output_path}")
-            print(f"{'='*60}\n")
+            self._write_clip(final_video, output_path)
+            self._sample_rss()
+            self._write_caption_files(scene_durations, output_path.stem)
+            self._print_success(output_path)
             
             return True
 
@@ -110,6 +423,273 @@ class VideoMaker:
             print(f"[error] Failed to create final video: {e}")
             return False
 
+        finally:
+            self._close_clips(final_video, *clips, *audio_clips)
+
+    def _create_video_streaming(self, scenes, output_path):
+        """
+        Encode each scene to its own segment, releasing its clips before the
+        next one is opened, then join the segments with ffmpeg's concat demuxer
+        (stream copy, no re-encode).
+        """
+        segment_dir = self.output_dir / "segments"
+        segment_dir.mkdir(parents=True, exist_ok=True)
+        segments = []
+        scene_durations = []
+        inputs = list(self._scene_inputs(scenes))
+
+        try:
+            # With a narration track the segments are video-only and the audio
+            # is encoded once while muxing
+            narration, durations = self._prepare_narration(inputs)
+
+            # Clips are opened lazily here, so tune from the narration length
+            # (or the planned scene length) and the SDXL output size
+            duration = sum(durations.values()) or len(scenes) * self.tuner.SECONDS_PER_SCENE
+            self.tune_encoder(duration, 1024 * 1024 / 1e6)
+
+            for i, img_path, aud_path in inputs:
+                print(f"[{i}/{len(scenes)}] Rendering scene segment...")
+
+                image_clip = audio_clip = None
+                segment_path = segment_dir / f"scene_{i}.mp4"
+                try:
+                    image_clip, audio_clip = self._build_scene_clip(img_path, aud_path, durations.get(i), scene=i)
+                    self._write_clip(image_clip, segment_path, logger=None, audio=narration is None)
+                    segments.append(segment_path)
+                    scene_durations.append((i, image_clip.duration))
+                except Exception as e:
+                    print(f"[error] Failed to process scene {i}: {e}")
+                    # Never listed in segments, so the cleanup below would miss it
+                    segment_path.unlink(missing_ok=True)
+                    if narration is not None:
+                        raise
+                finally:
+                    self._close_clips(image_clip, audio_clip)
+                    del image_clip, audio_clip
+
+                self._check_memory_ceiling()
+
+            if not segments:
+                print("[error] No valid clips to compile. Video creation failed.")
+                return False
+
+            print(f"\n[info] Joining {len(segments)} segments into: {output_path}")
+            self._concat_segments(segments, output_path, audio=narration)
+            self._sample_rss()
+            self._write_caption_files(scene_durations, output_path.stem)
+            self._print_success(output_path)
+            return True
+
+        except Exception as e:
+            print(f"[error] Failed to create final video: {e}")
+            print(f"[info] Peak RSS before failure: {self.peak_rss_mb:.1f} MB")
+            return False
+
+        finally:
+            for segment in segments:
+                segment.unlink(missing_ok=True)
+            list_file = segment_dir / "segments.txt"
+            list_file.unlink(missing_ok=True)
+            try:
+                segment_dir.rmdir()
+            except OSError:
+                pass
+
+    def _concat_segments(self, segments, output_path, audio=None):
+        """
+        Join identically-encoded MP4 segments without re-encoding the video.
+        If audio is given (WAV path, or PCM track piped to ffmpeg's stdin) it
+        is encoded to AAC once and muxed in.
+        """
+        list_file = segments[0].parent / "segments.txt"
+        with open(list_file, "w", encoding="utf-8") as f:
+            for segment in segments:
+                f.write(f"file '{segment.resolve().as_posix()}'\n")
+
+        cmd = [
+            get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(list_file),
+        ]
+        pcm = None
+        if isinstance(audio, np.ndarray):
+            pcm = NarrationBuilder.to_pcm16(audio)
+            cmd += ["-f", "s16le", "-ar", str(NarrationBuilder.SAMPLE_RATE), "-ac", "1", "-i", "pipe:0"]
+        elif audio is not None:
+            cmd += ["-i", str(audio)]
+        if audio is not None:
+            cmd += ["-map", "0:v", "-map", "1:a", "-c:v", "copy", "-c:a", "aac", "-b:a", "192k"]
+        else:
+            cmd += ["-c", "copy"]
+        cmd += ["-movflags", "+faststart", str(output_path)]
+        result = subprocess.run(cmd, input=pcm, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.decode(errors='ignore').strip()}")
+
+    # ---------------------------
+    # Multi-target rendering
+    # ---------------------------
+    @staticmethod
+    def _target_filter(target):
+        """ffmpeg -vf chain that maps the source frame onto a target canvas"""
+        w, h = target["width"], target["height"]
+        if target.get("fit", "crop") == "pad":
+            return (
+                f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+            )
+        return f"scale={w}:{h}:force_original_aspect_ratio=increase,crop={w}:{h},setsar=1"
+
+    @profiled("render")
+    def create_video_variants(self, scenes=None, image_paths=None, audio=None, targets=None):
+        """
+        Render several output variants (e.g. 9:16 Short + 16:9 upload) from one
+        timeline. Frames are decoded once and fed to one encoder per target, and
+        the narration is encoded to AAC once and muxed into every output.
+
+        Scenes and assets are handed in like create_video(); otherwise the
+        saved script and default asset paths are used. The first target is
+        written to the usual final_video_<n>.mp4 (and self.output_path), so
+        the UI and upload queue find it; the others get a _<name> suffix.
+
+        Returns a dict of target name -> output path, or None on failure.
+        """
+        targets = targets or self.RENDER_TARGETS
+        scenes = scenes if scenes is not None else self._load_scenes()
+        if scenes is None:
+            return None
+        self._use_assets(image_paths, audio)
+
+        print(f"\n{'='*60}")
+        print(f"[info] Rendering {len(targets)} variants from {len(scenes)} scenes...")
+        print(f"{'='*60}\n")
+
+        self.peak_rss_mb = 0.0
+        self.encoder_decision = None
+        self._sample_rss()
+        max_parallel = self.tuner.max_parallel_renders(
+            len(scenes) * self.tuner.SECONDS_PER_SCENE,
+            sum(t["width"] * t["height"] for t in targets.values()) / 1e6
+        )
+        with self._render_slot(max_parallel), span("render", scenes=len(scenes), variants=",".join(targets)) as trace:
+            outputs = self._render_variants(scenes, targets)
+
+            if outputs:
+                d = self.encoder_decision or {}
+                trace.set(bytes=sum(path.stat().st_size for path in outputs.values()),
+                          preset=d.get("preset"), threads=d.get("threads"),
+                          peak_rss_mb=round(self.peak_rss_mb, 1))
+            else:
+                trace.fail("render failed")
+            return outputs
+
+    def _render_variants(self, scenes, targets):
+        inputs = list(self._scene_inputs(scenes))
+        try:
+            narration, durations = self._prepare_narration(inputs)
+        except Exception as e:
+            print(f"[error] Failed to build narration track: {e}")
+            return None
+
+        clips = []
+        audio_clips = []
+        scene_durations = []
+        for i, img_path, aud_path in inputs:
+            try:
+                image_clip, audio_clip = self._build_scene_clip(img_path, aud_path, durations.get(i), scene=i)
+                clips.append(image_clip)
+                scene_durations.append((i, image_clip.duration))
+                audio_clips.append(audio_clip)
+            except Exception as e:
+                print(f"[error] Failed to process scene {i}: {e}")
+                if narration is not None:
+                    self._close_clips(*clips, *audio_clips)
+                    return None
+
+        if not clips:
+            print("[error] No valid clips to compile. Video creation failed.")
+            return None
+
+        timeline = None
+        writers = {}
+        audio_path = self.output_dir / f"narration_{self.video_number}.m4a"
+        primary = next(iter(targets))
+        outputs = {
+            name: self.output_dir / (
+                f"final_video_{self.video_number}.mp4" if name == primary
+                else f"final_video_{self.video_number}_{name}.mp4"
+            )
+            for name in targets
+        }
+        self.output_path = outputs[primary]
+        try:
+            timeline = concatenate_videoclips(clips, method="compose")
+            if narration is not None:
+                narration_clip = self._narration_clip(narration)
+                audio_clips.append(narration_clip)
+                timeline = timeline.set_audio(narration_clip)
+
+            # Every encoder works on its own target size, so tune on their sum
+            # and split the threads between them
+            total_mpix = sum(t["width"] * t["height"] for t in targets.values()) / 1e6
+            decision = self.tune_encoder(timeline.duration, total_mpix)
+            fps = decision["fps"]
+            threads_per_target = max(1, decision["threads"] // len(targets))
+
+            # One audio encode shared by every target
+            print(f"[info] Encoding narration once: {audio_path.name}")
+            timeline.audio.write_audiofile(str(audio_path), fps=44100, codec="aac", logger=None)
+
+            for name, target in targets.items():
+                writers[name] = FFMPEG_VideoWriter(
+                    str(outputs[name]),
+                    timeline.size,
+                    fps,
+                    codec="libx264",
+                    preset=target.get("preset", decision["preset"]),
+                    audiofile=str(audio_path),
+                    threads=target.get("threads", threads_per_target),
+                    ffmpeg_params=[
+                        "-vf", self._target_filter(target),
+                        "-crf", str(target.get("crf", 23)),
+                        "-pix_fmt", "yuv420p",
+                        "-movflags", "+faststart",
+                    ],
+                )
+
+            # Single decode pass, frames fanned out to all encoders
+            n_frames = int(timeline.duration * fps)
+            for index, frame in enumerate(timeline.iter_frames(fps=fps, dtype="uint8")):
+                for writer in writers.values():
+                    writer.write_frame(frame)
+                if index % (fps * 5) == 0:
+                    self._sample_rss()
+                    print(f"   frame {index}/{n_frames}")
+
+            for writer in writers.values():
+                writer.close()
+            writers.clear()
+
+            self._sample_rss()
+            self._write_caption_files(scene_durations, f"final_video_{self.video_number}")
+            for name, path in outputs.items():
+                print(f"[🎬] {name}: {path}")
+            print(f"[info] Peak RSS during render: {self.peak_rss_mb:.1f} MB")
+            return outputs
+
+        except Exception as e:
+            print(f"[error] Failed to render variants: {e}")
+            return None
+
+        finally:
+            for writer in writers.values():
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            self._close_clips(timeline, *clips, *audio_clips)
+            audio_path.unlink(missing_ok=True)
+
 
 if __name__ == "__main__":
     maker = VideoMaker()